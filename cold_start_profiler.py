@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Profiler for the Malicious URL Detection System microservices
+Leaves each service idle for a configured period, then measures how long it
+takes to come back: time to first byte of /health, time until /health
+reports healthy (with the model loaded) and time until the first successful
+/predict or /detect.  Repeating this for several idle periods gives a
+per-service cold-start distribution for sizing client timeouts and
+keep-warm schedules.  The timeouts it sizes are the Java request timeouts
+in CLIENT_TIMEOUTS, as the render profile configures them;
+ExternalMlDetectionService (HuggingFace Inference API with wait_for_model)
+uses the default RestTemplate bean, which has no connect or read timeout at
+all, and should be given one sized the same way.  With --stand-in the
+services are local stand-ins that simulate spin-down, boot and model
+loading.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from health_monitor import DEFAULT_COLD_START_THRESHOLD
+from latency_histogram import LatencyHistogram
+
+# Python App Microservice scores URLs on /detect, the ML microservices on /predict
+INFERENCE_PATHS = {"Python App Microservice": '/detect'}
+PROBE_URL = "https://www.google.com"
+METRICS = ('ttfb', 'time_to_healthy', 'time_to_first_inference')
+# (Java client, request timeout in seconds under the render profile, caveat) waiting on each Render
+# deployment's first inference
+CLIENT_TIMEOUTS = {
+    "Python ML Microservice": (
+        "TransformerMLDetectionService (ml.microservice.timeout)", 30000,
+        "application-render.yml sets 30000 meaning milliseconds, but the service reads it with "
+        "Duration.ofSeconds, so the client waits over 8 hours; set it to 30 for 30 s"),
+    "Python App Microservice": (
+        "PythonAppDetectionService", 10,
+        "hard-coded; ml.python-app.microservice.timeout in application-render.yml is never read"),
+    "ML Microservice 3": (
+        "MlMicroserviceDetectionService", 10,
+        "hard-coded; ml.ml-microservice.timeout in application-render.yml is never read")
+}
+
+
+def is_healthy(response: requests.Response) -> bool:
+    """200 from /health, and the model is loaded if the service says"""
+    if response.status_code != 200:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    return not isinstance(body, dict) or body.get('model_loaded') is not False
+
+
+class ColdStartProfiler:
+    """Measures recovery after idle periods for each service, services in parallel"""
+
+    def __init__(self, services: Dict[str, str], inference_paths: Optional[Dict[str, str]] = None,
+                 poll_interval: float = 0.5, timeout: float = 300.0,
+                 cold_start_threshold: float = DEFAULT_COLD_START_THRESHOLD):
+        self.services = services
+        self.inference_paths = dict(INFERENCE_PATHS, **(inference_paths or {}))
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.cold_start_threshold = cold_start_threshold
+
+    def _elapsed(self, start: float) -> float:
+        return round(time.perf_counter() - start, 4)
+
+    def _poll(self, start: float, send) -> Optional[float]:
+        """Repeat send() until it succeeds; seconds since start, or None on timeout"""
+        while time.perf_counter() - start < self.timeout:
+            try:
+                if send():
+                    return self._elapsed(start)
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(self.poll_interval)
+        return None
+
+    def measure(self, service: str, idle: float) -> Dict[str, Any]:
+        """One cold-start trial, timed from the first request after the idle period"""
+        base_url = self.services[service].rstrip('/')
+        inference_path = self.inference_paths.get(service, '/predict')
+        trial = {
+            'service': service,
+            'idle': idle,
+            'started': datetime.now().isoformat(),
+            'status_code': None,
+            'ttfb': None,
+            'time_to_healthy': None,
+            'time_to_first_inference': None,
+            'error': None
+        }
+
+        # A fresh connection each time: after a spin-down no pooled connection survives anyway
+        start = time.perf_counter()
+
+        def remaining():
+            return max(0.1, self.timeout - (time.perf_counter() - start))
+
+        try:
+            response = requests.get(f"{base_url}/health", stream=True, timeout=self.timeout)
+            trial['ttfb'] = self._elapsed(start)
+            trial['status_code'] = response.status_code
+            healthy = is_healthy(response)
+            response.close()
+        except requests.exceptions.RequestException as e:
+            trial['error'] = f"/health: {e}"
+            healthy = False
+
+        if healthy:
+            trial['time_to_healthy'] = self._elapsed(start)
+        else:
+            trial['time_to_healthy'] = self._poll(
+                start, lambda: is_healthy(requests.get(f"{base_url}/health", timeout=remaining())))
+        trial['time_to_first_inference'] = self._poll(
+            start, lambda: requests.post(f"{base_url}{inference_path}", json={'url': PROBE_URL},
+                                         timeout=remaining()).status_code == 200)
+
+        if trial['time_to_healthy'] is None:
+            trial['error'] = trial['error'] or f"/health not healthy within {self.timeout:g}s"
+        elif trial['time_to_first_inference'] is None:
+            trial['error'] = f"{inference_path} did not succeed within {self.timeout:g}s"
+        trial['cold'] = trial['ttfb'] is None or trial['ttfb'] >= self.cold_start_threshold or \
+            trial['time_to_first_inference'] is None or trial['time_to_first_inference'] >= self.cold_start_threshold
+        return trial
+
+    def profile_service(self, service: str, idle_periods: List[float], trials: int,
+                        verbose: bool = True) -> List[Dict[str, Any]]:
+        results = []
+        # Start every idle period from a warm service; its state before the profiler ran is unknown
+        base_url = self.services[service].rstrip('/')
+        self._poll(time.perf_counter(), lambda: is_healthy(requests.get(f"{base_url}/health", timeout=self.timeout)))
+        for idle in idle_periods:
+            for _ in range(trials):
+                # No request reaches the service while it idles
+                time.sleep(idle)
+                trial = self.measure(service, idle)
+                results.append(trial)
+                if verbose:
+                    print_trial(trial)
+        return results
+
+    def run(self, idle_periods: List[float], trials: int = 3, verbose: bool = True) -> List[Dict[str, Any]]:
+        """Profile all services at once (each idles on its own schedule)"""
+        with ThreadPoolExecutor(max_workers=len(self.services)) as executor:
+            futures = [executor.submit(self.profile_service, service, idle_periods, trials, verbose)
+                       for service in self.services]
+            return [trial for future in futures for trial in future.result()]
+
+
+def _format(seconds: Optional[float]) -> str:
+    return f"{seconds:.2f}s" if seconds is not None else "timeout"
+
+
+def print_trial(trial: Dict[str, Any]):
+    icon = "❌" if trial['error'] else ("🥶" if trial['cold'] else "🔥")
+    print(f"{icon} {trial['service']} after {trial['idle']:g}s idle: TTFB {_format(trial['ttfb'])}, "
+          f"healthy {_format(trial['time_to_healthy'])}, "
+          f"first inference {_format(trial['time_to_first_inference'])}")
+
+
+def _distribution(values: List[Optional[float]]) -> Dict[str, Any]:
+    histogram = LatencyHistogram()
+    for value in values:
+        if value is not None:
+            histogram.record(value)
+    summary = histogram.summary() if histogram.total_count else {'count': 0}
+    summary['timeouts'] = sum(value is None for value in values)
+    return summary
+
+
+def build_report(trials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-service distributions, overall and per idle period, with timeout and keep-warm hints"""
+    report = {'services': {}}
+    by_service: Dict[str, List[Dict[str, Any]]] = {}
+    for trial in trials:
+        by_service.setdefault(trial['service'], []).append(trial)
+
+    for service, service_trials in by_service.items():
+        by_idle: Dict[float, List[Dict[str, Any]]] = {}
+        for trial in service_trials:
+            by_idle.setdefault(trial['idle'], []).append(trial)
+
+        idle_summaries = {}
+        for idle, idle_trials in sorted(by_idle.items()):
+            idle_summaries[f"{idle:g}"] = dict(
+                {metric: _distribution([trial[metric] for trial in idle_trials]) for metric in METRICS},
+                trials=len(idle_trials),
+                cold=sum(trial['cold'] for trial in idle_trials)
+            )
+
+        cold_idles = [idle for idle, idle_trials in by_idle.items() if any(trial['cold'] for trial in idle_trials)]
+        warm_idles = [idle for idle in by_idle if idle not in cold_idles]
+        inference = _distribution([trial['time_to_first_inference'] for trial in service_trials])
+        report['services'][service] = {
+            'trials': len(service_trials),
+            'cold': sum(trial['cold'] for trial in service_trials),
+            'overall': {metric: _distribution([trial[metric] for trial in service_trials]) for metric in METRICS},
+            'by_idle': idle_summaries,
+            # A client timeout that would have let 99% of these first inferences through
+            'suggested_timeout': math.ceil(inference['p99']) if inference.get('count') else None,
+            'client_timeout': CLIENT_TIMEOUTS.get(service),
+            # Pinging more often than the shortest idle period that went cold keeps the service warm
+            'shortest_cold_idle': min(cold_idles) if cold_idles else None,
+            'longest_warm_idle': max(warm_idles) if warm_idles else None
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 60)
+    print("📊 COLD-START PROFILE")
+    print("=" * 60)
+    for service, summary in report['services'].items():
+        print(f"🔍 {service}: {summary['cold']}/{summary['trials']} trials cold")
+        print(f"   {'Idle':>8} | {'Metric':<24} | {'p50':>8} | {'p90':>8} | {'max':>8} | Timeouts")
+        for idle, idle_summary in summary['by_idle'].items():
+            for metric in METRICS:
+                stats = idle_summary[metric]
+                cells = [f"{stats[key]:>7.2f}s" if key in stats else f"{'-':>8}" for key in ('p50', 'p90', 'max')]
+                print(f"   {idle + 's':>8} | {metric:<24} | " + " | ".join(cells) + f" | {stats['timeouts']}")
+        if summary['suggested_timeout'] is not None:
+            print(f"   ⏱️  Timeout covering p99 of first inferences: {summary['suggested_timeout']}s")
+        if summary['client_timeout'] is not None:
+            client, seconds, caveat = summary['client_timeout']
+            print(f"   🔧 Current client timeout (render profile): {seconds}s in {client}")
+            print(f"   ⚠️  {caveat}")
+        if summary['shortest_cold_idle'] is not None:
+            print(f"   🔥 Keep warm with a ping at least every {summary['shortest_cold_idle']:g}s")
+
+
+def save_report(report: Dict[str, Any], trials: List[Dict[str, Any]], output_dir: str = ".",
+                timestamp: Optional[str] = None):
+    """Save the report (JSON) and the raw trials (CSV)"""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_filename = os.path.join(output_dir, f"cold_start_profile_{timestamp}.json")
+    csv_filename = os.path.join(output_dir, f"cold_start_trials_{timestamp}.csv")
+    with open(json_filename, 'w') as f:
+        json.dump({'report': report, 'trials': trials}, f, indent=2)
+
+    columns = ['service', 'idle', 'started', 'status_code', 'cold'] + list(METRICS) + ['error']
+    with open(csv_filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for trial in trials:
+            writer.writerow([trial[column] if trial[column] is not None else '' for column in columns])
+    return json_filename, csv_filename
+
+
+def main():
+    """Main function"""
+    from test_microservices_status import MICROSERVICES
+
+    parser = argparse.ArgumentParser(description="Profile microservice cold starts after idle periods")
+    parser.add_argument('--service', action='append', default=[], metavar='NAME=URL',
+                        help="service to profile instead of the Render deployments (repeatable)")
+    parser.add_argument('--detect', action='append', default=[], metavar='NAME',
+                        help="score this service's first request on /detect instead of /predict (repeatable)")
+    parser.add_argument('--idle', default=None,
+                        help="comma-separated idle periods in seconds (default: 900,1800,3600; 2,10 with --stand-in)")
+    parser.add_argument('--trials', type=int, default=3, help="trials per idle period")
+    parser.add_argument('--poll-interval', type=float, default=0.5)
+    parser.add_argument('--timeout', type=float, default=300.0, help="give up on a trial after this many seconds")
+    parser.add_argument('--cold-start-threshold', type=float, default=DEFAULT_COLD_START_THRESHOLD)
+    parser.add_argument('--stand-in', action='store_true',
+                        help="profile local stand-ins that spin down and boot instead of real services")
+    parser.add_argument('--boot-time', type=float, default=3.0, help="stand-in boot time in seconds")
+    parser.add_argument('--model-load-time', type=float, default=2.0, help="stand-in model load time in seconds")
+    parser.add_argument('--idle-timeout', type=float, default=5.0,
+                        help="stand-in idle seconds before spin-down")
+    args = parser.parse_args()
+
+    services = dict(MICROSERVICES)
+    if args.service:
+        services = {}
+        for service in args.service:
+            name, _, url = service.partition('=')
+            if not name or not url:
+                parser.error(f"invalid --service '{service}' (expected NAME=URL)")
+            services[name] = url
+    idle = args.idle or ("2,10" if args.stand_in else "900,1800,3600")
+    idle_periods = [float(period) for period in idle.split(',')]
+
+    stand_ins = []
+    if args.stand_in:
+        from stand_in_servers import StandInConfig, StandInServer
+
+        for index, name in enumerate(list(services)):
+            config = StandInConfig(seed=index, boot_time=args.boot_time, model_load_time=args.model_load_time,
+                                   idle_timeout=args.idle_timeout)
+            stand_ins.append(StandInServer(config).start())
+            services[name] = stand_ins[-1].url
+
+    print("🚀 Cold-Start Profiler")
+    print("=" * 60)
+    print(f"Services: {', '.join(services)}")
+    print(f"Idle periods: {', '.join(f'{idle:g}s' for idle in idle_periods)} x {args.trials} trials")
+    print()
+
+    profiler = ColdStartProfiler(services, {name: '/detect' for name in args.detect}, args.poll_interval,
+                                 args.timeout, args.cold_start_threshold)
+    try:
+        trials = profiler.run(idle_periods, args.trials)
+    finally:
+        for server in stand_ins:
+            server.stop()
+
+    report = build_report(trials)
+    print_report(report)
+    json_filename, csv_filename = save_report(report, trials)
+    print(f"\n💾 Results saved to: {json_filename}, {csv_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,36 @@ Tests all URLs in the dataset and generates detailed results
 import requests
 import json
 import time
-import csv
+import os
 from datetime import datetime
 from typing import Dict, List, Any
 import sys
 
+from dataset_cache import load_dataset_for
+from latency_histogram import LatencyReport
+from result_sink import ResultSink, write_csv
+
 class ComprehensiveTester:
+    # Summary CSV columns, built from the streamed results
+    csv_columns = [
+        ('URL', lambda result: result['url']),
+        ('Category', lambda result: result['expected_category']),
+        ('Success', lambda result: result['success']),
+        ('Response Time', lambda result: result['response_time']),
+        ('Status Code', lambda result: result['status_code']),
+        ('Enhanced Content Analysis', lambda result: result['enhanced_content_analysis_found']),
+        ('Detection Methods Count', lambda result: len(result['detection_methods'])),
+        ('Malicious Detections', lambda result: result['malicious_detections']),
+        ('Overall Malicious', lambda result: result['overall_malicious']),
+        ('Error', lambda result: result['error'] or '')
+    ]
+    
     def __init__(self, base_url: str = "http://localhost:8080"):
         self.base_url = base_url
-        self.results = []
+        self.output_dir = "."
+        self.timestamp = None
+        self.sink = None
+        self.latency = LatencyReport(group_label='category')
         self.stats = {
             'total_tests': 0,
             'successful_tests': 0,
@@ -119,45 +140,17 @@ class ComprehensiveTester:
         return result
     
     def load_test_dataset(self, filename: str = "test_dataset.txt") -> List[Dict[str, str]]:
-        """Load test dataset from file"""
-        test_cases = []
-        current_category = "unknown"
-        
+        """Load test dataset from file (via the compiled dataset cache)"""
         try:
-            with open(filename, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('#') or not line:
-                        # Extract category from comment
-                        if 'Safe URLs' in line:
-                            current_category = "safe"
-                        elif 'Suspicious URLs' in line or 'High-risk URLs' in line:
-                            current_category = "suspicious"
-                        elif 'URL shortening services' in line:
-                            current_category = "url_shortener"
-                        elif 'Private IP addresses' in line:
-                            current_category = "private_ip"
-                        elif 'Suspicious file extensions' in line:
-                            current_category = "suspicious_extension"
-                        elif 'Obfuscated URLs' in line:
-                            current_category = "obfuscated"
-                        elif 'Legitimate but potentially suspicious keywords' in line:
-                            current_category = "suspicious_keywords"
-                        elif 'Random-looking domains' in line:
-                            current_category = "random_domain"
-                        continue
-                    
-                    if line.startswith('http'):
-                        test_cases.append({
-                            'url': line,
-                            'category': current_category
-                        })
+            with load_dataset_for(filename) as dataset:
+                return [
+                    {'url': dataset.url(index), 'category': dataset.category(index)}
+                    for index in dataset.rows(filename)
+                ]
         
         except FileNotFoundError:
             print(f"Error: Test dataset file '{filename}' not found!")
             return []
-        
-        return test_cases
     
     def run_comprehensive_test(self, dataset_file: str = "test_dataset.txt"):
         """Run comprehensive test on all URLs in the dataset"""
@@ -173,6 +166,11 @@ class ComprehensiveTester:
         print(f"📊 Loaded {len(test_cases)} test cases from {dataset_file}")
         print()
         
+        # Stream results to disk as they arrive
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_file = os.path.join(self.output_dir, f"test_results_{self.timestamp}.jsonl")
+        self.sink = ResultSink(results_file, group_key='expected_category')
+        
         # Test each URL
         for i, test_case in enumerate(test_cases, 1):
             url = test_case['url']
@@ -181,8 +179,10 @@ class ComprehensiveTester:
             print(f"Testing {i}/{len(test_cases)}: {url}")
             print(f"  Category: {category}")
             
+            request_start = time.perf_counter()
             result = self.test_url(url, category)
-            self.results.append(result)
+            self.latency.record(category, time.perf_counter() - request_start)
+            self.sink.write(result)
             
             # Print result summary
             if result['success']:
@@ -200,6 +200,7 @@ class ComprehensiveTester:
         # Calculate final statistics
         if self.stats['successful_tests'] > 0:
             self.stats['average_response_time'] = self.stats['total_response_time'] / self.stats['successful_tests']
+        self.stats['latency'] = self.latency.summary()
         
         # Print comprehensive results
         self.print_comprehensive_results()
@@ -235,22 +236,16 @@ class ComprehensiveTester:
         print(f"Total Response Time: {self.stats['total_response_time']:.3f}s")
         print()
         
+        # Latency percentiles
+        print("⏱️  LATENCY PERCENTILES")
+        print("-" * 60)
+        self.latency.print_report()
+        print()
+        
         # Category breakdown
         print("📊 RESULTS BY CATEGORY")
         print("-" * 40)
-        categories = {}
-        for result in self.results:
-            if result['success']:
-                category = result['expected_category']
-                if category not in categories:
-                    categories[category] = {'total': 0, 'malicious': 0, 'enhanced': 0}
-                categories[category]['total'] += 1
-                if result['overall_malicious']:
-                    categories[category]['malicious'] += 1
-                if result['enhanced_content_analysis_found']:
-                    categories[category]['enhanced'] += 1
-        
-        for category, stats in categories.items():
+        for category, stats in self.sink.groups.items():
             malicious_rate = (stats['malicious'] / stats['total'] * 100) if stats['total'] > 0 else 0
             enhanced_rate = (stats['enhanced'] / stats['total'] * 100) if stats['total'] > 0 else 0
             print(f"{category:20} | {stats['total']:3} tests | {stats['malicious']:2} malicious ({malicious_rate:5.1f}%) | {stats['enhanced']:2} enhanced ({enhanced_rate:5.1f}%)")
@@ -260,56 +255,38 @@ class ComprehensiveTester:
         # Detection methods analysis
         print("🔍 DETECTION METHODS ANALYSIS")
         print("-" * 40)
-        method_counts = {}
-        for result in self.results:
-            if result['success']:
-                for method in result['detection_methods']:
-                    method_counts[method] = method_counts.get(method, 0) + 1
-        
-        for method, count in sorted(method_counts.items(), key=lambda x: x[1], reverse=True):
+        for method, count in sorted(self.sink.method_counts.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / self.stats['successful_tests'] * 100)
             print(f"{method:30} | {count:3} times ({percentage:5.1f}%)")
     
     def save_results(self):
-        """Save results to CSV and JSON files"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """Save statistics to JSON and the streamed results to CSV"""
+        self.sink.close()
+        timestamp = self.timestamp
         
-        # Save detailed results to JSON
-        json_filename = f"test_results_{timestamp}.json"
+        # Save statistics to JSON; per-URL results are already in the JSONL file
+        json_filename = os.path.join(self.output_dir, f"test_statistics_{timestamp}.json")
         with open(json_filename, 'w') as f:
             json.dump({
                 'timestamp': datetime.now().isoformat(),
                 'statistics': self.stats,
-                'results': self.results
+                'results_file': os.path.basename(self.sink.filename)
             }, f, indent=2)
         
-        # Save summary to CSV
-        csv_filename = f"test_summary_{timestamp}.csv"
-        with open(csv_filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'URL', 'Category', 'Success', 'Response Time', 'Status Code',
-                'Enhanced Content Analysis', 'Detection Methods Count',
-                'Malicious Detections', 'Overall Malicious', 'Error'
-            ])
-            
-            for result in self.results:
-                writer.writerow([
-                    result['url'],
-                    result['expected_category'],
-                    result['success'],
-                    result['response_time'],
-                    result['status_code'],
-                    result['enhanced_content_analysis_found'],
-                    len(result['detection_methods']),
-                    result['malicious_detections'],
-                    result['overall_malicious'],
-                    result['error'] or ''
-                ])
+        # Save summary to CSV, streamed from the results file
+        csv_filename = os.path.join(self.output_dir, f"test_summary_{timestamp}.csv")
+        write_csv(self.sink.filename, csv_filename, self.csv_columns)
+        
+        # Save latency histograms and percentiles
+        latency_json_filename = os.path.join(self.output_dir, f"test_latency_{timestamp}.json")
+        latency_csv_filename = os.path.join(self.output_dir, f"test_latency_{timestamp}.csv")
+        self.latency.save(latency_json_filename, latency_csv_filename)
         
         print(f"💾 Results saved to:")
-        print(f"   JSON: {json_filename}")
+        print(f"   Results: {self.sink.filename}")
+        print(f"   Statistics: {json_filename}")
         print(f"   CSV:  {csv_filename}")
+        print(f"   Latency: {latency_json_filename}, {latency_csv_filename}")
 
 def main():
     """Main function"""
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Binary Dataset Cache for the test corpora
+Compiles malicious_phish.csv, test_dataset.txt and docs/test_cases_expanded.txt
+into a single memory-mappable columnar file (URL offsets + URL blob + label,
+category and source arrays).  The file is keyed by a hash of the source files
+and rebuilt only when one of them changes, so repeated benchmark runs skip
+CSV parsing and URL normalization entirely.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dataset_sampler import normalize_url
+
+DEFAULT_CACHE_DIR = ".dataset_cache"
+PHISH_DATASET = "src/main/resources/malicious_phish.csv"
+TEST_DATASET = "test_dataset.txt"
+EXPANDED_TEST_CASES = "docs/test_cases_expanded.txt"
+DEFAULT_SOURCES = (PHISH_DATASET, TEST_DATASET, EXPANDED_TEST_CASES)
+
+# Label enum stored as one byte per URL
+LABELS = ('unknown', 'benign', 'phishing', 'malware', 'defacement', 'malicious')
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+# Section headers in the comment-tagged URL lists, in match order
+CATEGORY_HEADERS = (
+    ('Safe URLs', 'safe'),
+    ('Suspicious URLs', 'suspicious'),
+    ('High-risk URLs', 'suspicious'),
+    ('Malicious URLs', 'malicious'),
+    ('URL shortening services', 'url_shortener'),
+    ('Private IP addresses', 'private_ip'),
+    ('Suspicious file extensions', 'suspicious_extension'),
+    ('Obfuscated URLs', 'obfuscated'),
+    ('Legitimate but potentially suspicious keywords', 'suspicious_keywords'),
+    ('Random-looking domains', 'random_domain'),
+    ('Adversarial', 'adversarial'),
+)
+
+# Ground-truth label implied by a tagged-list category
+CATEGORY_LABELS = {
+    'safe': 'benign',
+    'unknown': 'unknown',
+    'suspicious_keywords': 'unknown',
+    'adversarial': 'unknown',
+}
+
+MAGIC = b'URLCACHE'
+FORMAT_VERSION = 1
+# magic, version, row count, metadata length, URL blob length
+HEADER = struct.Struct('<8sIQQQ')
+
+
+def parse_tagged_url_list(filename: str) -> List[Dict[str, str]]:
+    """Parse a URL list whose '#' comment headers name the category of the URLs below them"""
+    test_cases = []
+    current_category = "unknown"
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('#') or not line:
+                # Extract category from comment
+                for header, category in CATEGORY_HEADERS:
+                    if header in line:
+                        current_category = category
+                        break
+                continue
+
+            if line.startswith('http'):
+                # Drop trailing annotations such as "(typosquatting)"
+                test_cases.append({
+                    'url': line.split(None, 1)[0],
+                    'category': current_category
+                })
+
+    return test_cases
+
+
+def _iter_source(filename: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield (url, label, category) for every URL in a source file"""
+    if filename.endswith('.csv'):
+        with open(filename, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+            url_column = header.index('url')
+            type_column = header.index('type')
+            width = max(url_column, type_column)
+            for row in reader:
+                if len(row) <= width:
+                    continue
+                url = row[url_column].strip()
+                url_type = row[type_column].strip().lower()
+                if not url or url_type not in LABEL_CODES:
+                    continue
+                yield normalize_url(url), url_type, url_type
+    else:
+        for test_case in parse_tagged_url_list(filename):
+            category = test_case['category']
+            yield test_case['url'], CATEGORY_LABELS.get(category, 'malicious'), category
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def compile_datasets(sources: Sequence[str], output: str, source_hashes: Optional[Dict[str, str]] = None):
+    """Compile source files into one columnar cache file at `output`"""
+    offsets = array('Q', [0])
+    labels = array('B')
+    categories = array('H')
+    source_ids = array('B')
+    category_codes: Dict[str, int] = {}
+    blob = bytearray()
+
+    for source_id, filename in enumerate(sources):
+        for url, label, category in _iter_source(filename):
+            blob += url.encode('utf-8')
+            offsets.append(len(blob))
+            labels.append(LABEL_CODES[label])
+            categories.append(category_codes.setdefault(category, len(category_codes)))
+            source_ids.append(source_id)
+
+    metadata = json.dumps({
+        'sources': [os.path.normpath(filename) for filename in sources],
+        'source_hashes': source_hashes or {},
+        'labels': list(LABELS),
+        'categories': sorted(category_codes, key=category_codes.get)
+    }).encode('utf-8')
+
+    if sys.byteorder != 'little':
+        for column in (offsets, categories):
+            column.byteswap()
+
+    # Sections are 8-byte aligned so they can be cast in place after mmap
+    tmp_output = output + '.tmp'
+    with open(tmp_output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(labels), len(metadata), len(blob)))
+        for section in (metadata, offsets.tobytes(), labels.tobytes(), categories.tobytes(), source_ids.tobytes()):
+            f.write(section)
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+        f.write(blob)
+    os.replace(tmp_output, output)
+
+
+class CompiledDataset:
+    """Read-only, memory-mapped view of a compiled dataset cache file"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, count, metadata_size, blob_size = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{filename} is not a version {FORMAT_VERSION} dataset cache")
+
+        position = HEADER.size
+        metadata = json.loads(bytes(view[position:position + metadata_size]))
+        position = _align(position + metadata_size)
+
+        sections = {}
+        for name, itemsize in (('offsets', 8), ('labels', 1), ('categories', 2), ('sources', 1)):
+            length = (count + 1 if name == 'offsets' else count) * itemsize
+            sections[name] = view[position:position + length]
+            position = _align(position + length)
+
+        if sys.byteorder == 'little':
+            self.offsets = sections['offsets'].cast('Q')
+            self.categories = sections['categories'].cast('H')
+        else:
+            self.offsets = array('Q', sections['offsets'].tobytes())
+            self.categories = array('H', sections['categories'].tobytes())
+            self.offsets.byteswap()
+            self.categories.byteswap()
+        self.labels = sections['labels']
+        self.source_ids = sections['sources']
+        self.blob = view[position:position + blob_size]
+
+        self.sources: List[str] = metadata['sources']
+        self.source_hashes: Dict[str, str] = metadata['source_hashes']
+        self.label_names: List[str] = metadata['labels']
+        self.category_names: List[str] = metadata['categories']
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def url(self, index: int) -> str:
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def label(self, index: int) -> str:
+        return self.label_names[self.labels[index]]
+
+    def category(self, index: int) -> str:
+        return self.category_names[self.categories[index]]
+
+    def source(self, index: int) -> str:
+        return self.sources[self.source_ids[index]]
+
+    def source_id(self, filename: str) -> int:
+        """Index of a source file in this cache (ValueError if not compiled in)"""
+        return self.sources.index(os.path.normpath(filename))
+
+    def rows(self, source: Optional[str] = None) -> Iterator[int]:
+        """Row indices, optionally restricted to one source file"""
+        if source is None:
+            return iter(range(len(self)))
+        # Rows are written source by source, so each source is one contiguous run
+        source_id = self.source_id(source)
+        ids = bytes(self.source_ids)
+        start = ids.find(bytes([source_id]))
+        if start < 0:
+            return iter(())
+        end = ids.rfind(bytes([source_id])) + 1
+        return iter(range(start, end))
+
+    def close(self):
+        for name in ('offsets', 'categories', 'labels', 'source_ids', 'blob'):
+            value = getattr(self, name, None)
+            if isinstance(value, memoryview):
+                value.release()
+        if getattr(self, '_mmap', None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a view; the mapping goes away with it
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _file_hash(filename: str, index: Dict[str, Dict]) -> str:
+    """sha256 of a file, reusing the recorded hash while size and mtime are unchanged"""
+    stat = os.stat(filename)
+    key = os.path.abspath(filename)
+    entry = index.get(key)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    return index[key]['sha256']
+
+
+def _cached_sources(filename: str) -> Optional[List[str]]:
+    """Source paths recorded in a cache file's metadata, or None if it cannot be read"""
+    try:
+        with open(filename, 'rb') as f:
+            magic, version, _, metadata_size, _ = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            return json.loads(f.read(metadata_size))['sources']
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+
+def load_dataset(sources: Sequence[str] = DEFAULT_SOURCES, cache_dir: str = DEFAULT_CACHE_DIR,
+                 verbose: bool = False) -> CompiledDataset:
+    """Return the compiled cache for the given sources, building it if any source changed
+
+    Missing sources are skipped so a checkout without malicious_phish.csv
+    still gets a cache of the text corpora.
+    """
+    sources = [os.path.normpath(filename) for filename in sources if os.path.exists(filename)]
+    if not sources:
+        raise FileNotFoundError("none of the dataset sources exist")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    index_filename = os.path.join(cache_dir, 'index.json')
+    try:
+        with open(index_filename) as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        index = {}
+
+    source_hashes = {filename: _file_hash(filename, index) for filename in sources}
+    key = hashlib.sha256(json.dumps(source_hashes, sort_keys=True).encode('utf-8')).hexdigest()
+    cache_filename = os.path.join(cache_dir, f"urls-{key[:16]}.bin")
+
+    with open(index_filename + '.tmp', 'w') as f:
+        json.dump(index, f)
+    os.replace(index_filename + '.tmp', index_filename)
+
+    if not os.path.exists(cache_filename):
+        if verbose:
+            print(f"🔨 Compiling dataset cache {cache_filename} from {', '.join(sources)}...")
+        compile_datasets(sources, cache_filename, source_hashes)
+        # Older builds of the same source set are never read again; caches of other source sets are kept
+        for name in os.listdir(cache_dir):
+            other = os.path.join(cache_dir, name)
+            if name.startswith('urls-') and name.endswith('.bin') and other != cache_filename and \
+                    _cached_sources(other) == sources:
+                os.remove(other)
+
+    return CompiledDataset(cache_filename)
+
+
+def load_dataset_for(filename: str, cache_dir: str = DEFAULT_CACHE_DIR, verbose: bool = False) -> CompiledDataset:
+    """Open the shared cache if `filename` is one of the default corpora, else a cache of just that file"""
+    if not os.path.exists(filename):
+        raise FileNotFoundError(filename)
+    default_sources = [os.path.normpath(source) for source in DEFAULT_SOURCES]
+    sources = DEFAULT_SOURCES if os.path.normpath(filename) in default_sources else (filename,)
+    return load_dataset(sources, cache_dir, verbose)
+
+
+def main():
+    """Compile the dataset cache and print a summary"""
+    parser = argparse.ArgumentParser(description="Compile test corpora into a memory-mappable cache")
+    parser.add_argument('sources', nargs='*', default=list(DEFAULT_SOURCES))
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    with load_dataset(args.sources, args.cache_dir, verbose=True) as dataset:
+        print(f"✅ {dataset.filename}: {len(dataset)} URLs")
+        for source in dataset.sources:
+            rows = dataset.rows(source)
+            counts: Dict[str, int] = {}
+            for index in rows:
+                label = dataset.label(index)
+                counts[label] = counts.get(label, 0) + 1
+            print(f"   {source}: " + ", ".join(f"{label}={count}" for label, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
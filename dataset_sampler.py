@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Streaming Stratified Reservoir Sampler for malicious_phish.csv
+Draws a uniform random sample per URL type in a single pass over the CSV,
+holding only the sampled rows in memory.
+"""
+
+import csv
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DATASET_TYPES = ('phishing', 'malware', 'defacement', 'benign')
+
+
+def normalize_url(url: str) -> str:
+    """Add http:// to scheme-less dataset URLs"""
+    if not url.startswith(('http://', 'https://')):
+        return 'http://' + url
+    return url
+
+
+class Reservoir:
+    """Fixed-size uniform reservoir using Li's Algorithm L.
+
+    Instead of drawing a random number for every offered item (Algorithm R),
+    it draws the gap to the next accepted item, so the cost per skipped row
+    is a single integer comparison.
+    """
+
+    def __init__(self, capacity: int, rng: random.Random):
+        self.capacity = capacity
+        self.rng = rng
+        self.items: List = []
+        self.seen = 0
+        self._w = 1.0
+        self._next = 0
+
+    def _random(self) -> float:
+        # Algorithm L takes logs of uniforms, so keep them in (0, 1]
+        return 1.0 - self.rng.random()
+
+    def _advance(self):
+        self._w *= math.exp(math.log(self._random()) / self.capacity)
+        if self._w >= 1.0:
+            # Only possible through float underflow; accept the next item
+            self._next = self.seen + 1
+            return
+        self._next = self.seen + int(math.floor(math.log(self._random()) / math.log1p(-self._w))) + 1
+
+    def wants_next(self) -> bool:
+        """Whether the next offered item will be kept (lets callers skip building it)"""
+        return self.capacity > 0 and (len(self.items) < self.capacity or self.seen + 1 == self._next)
+
+    def offer(self, item):
+        """Offer an item, keeping it if the reservoir selects it"""
+        keep = self.wants_next()
+        self.seen += 1
+        if not keep:
+            return
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+            if len(self.items) == self.capacity:
+                self._advance()
+        else:
+            self.items[self.rng.randrange(self.capacity)] = item
+            self._advance()
+
+    def skip(self):
+        """Count an item without keeping it (use when wants_next() is False)"""
+        self.seen += 1
+
+
+class StratifiedReservoirSampler:
+    """Samples up to a quota of rows per type in one streaming pass.
+
+    Three ways to size the strata:
+      * quotas: explicit {type: count}
+      * sample_size (default): sample_size // len(types) of each type
+      * sample_size with proportional=True: each type gets its share of the
+        file, decided after the pass; every type keeps a reservoir of up to
+        sample_size rows, so memory is bounded by sample_size * len(types)
+    """
+
+    def __init__(self, sample_size: int = 1000, quotas: Optional[Dict[str, int]] = None,
+                 proportional: bool = False, seed: Optional[int] = None,
+                 types: Iterable[str] = DATASET_TYPES):
+        self.types = tuple(types)
+        self.sample_size = sample_size
+        self.proportional = proportional and quotas is None
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        if quotas is not None:
+            unknown = set(quotas) - set(self.types)
+            if unknown:
+                raise ValueError(f"unknown dataset types in quotas: {sorted(unknown)}")
+            capacities = {t: quotas.get(t, 0) for t in self.types}
+        elif self.proportional:
+            capacities = {t: sample_size for t in self.types}
+        else:
+            capacities = {t: sample_size // len(self.types) for t in self.types}
+
+        self.reservoirs = {t: Reservoir(capacity, self.rng) for t, capacity in capacities.items()}
+
+    def sample_items(self, rows: Iterable[Tuple[Any, str]]) -> List[Tuple[Any, str]]:
+        """Sample from (item, type) pairs; returns the kept pairs in input order"""
+        reservoirs = self.reservoirs
+        for row_number, (item, url_type) in enumerate(rows):
+            reservoir = reservoirs.get(url_type)
+            if reservoir is None:
+                continue
+            if reservoir.wants_next():
+                reservoir.offer((row_number, item))
+            else:
+                reservoir.skip()
+        return self._collect()
+
+    def sample_rows(self, rows: Iterable[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """Sample from (url, type) pairs; returns [{'url', 'type'}] in input order"""
+        sampled = self.sample_items((url, url_type) for url, url_type in rows if url)
+        return [{'url': normalize_url(url), 'type': url_type} for url, url_type in sampled]
+
+    def sample_csv(self, filename: str) -> List[Dict[str, str]]:
+        """Sample a url,type CSV such as malicious_phish.csv"""
+        with open(filename, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+            try:
+                url_column = header.index('url')
+                type_column = header.index('type')
+            except ValueError:
+                raise ValueError(f"{filename} must have 'url' and 'type' columns")
+            width = max(url_column, type_column)
+
+            def rows():
+                for row in reader:
+                    if len(row) > width:
+                        yield row[url_column].strip(), row[type_column].strip().lower()
+
+            return self.sample_rows(rows())
+
+    def _quotas(self) -> Dict[str, int]:
+        if not self.proportional:
+            return {t: reservoir.capacity for t, reservoir in self.reservoirs.items()}
+
+        # Largest-remainder allocation of sample_size by observed type counts
+        total = sum(reservoir.seen for reservoir in self.reservoirs.values())
+        if not total:
+            return {t: 0 for t in self.reservoirs}
+        shares = {t: self.sample_size * reservoir.seen / total for t, reservoir in self.reservoirs.items()}
+        quotas = {t: int(share) for t, share in shares.items()}
+        leftover = self.sample_size - sum(quotas.values())
+        for t in sorted(shares, key=lambda t: shares[t] - quotas[t], reverse=True)[:leftover]:
+            quotas[t] += 1
+        return quotas
+
+    def _collect(self) -> List[Tuple[Any, str]]:
+        sampled = []
+        for url_type, quota in self._quotas().items():
+            items = self.reservoirs[url_type].items
+            if len(items) > quota:
+                # A uniform subsample of a uniform reservoir is still uniform
+                items = self.rng.sample(items, quota)
+            sampled.extend((row_number, item, url_type) for row_number, item in items)
+        sampled.sort(key=lambda entry: entry[0])
+        return [(item, url_type) for _, item, url_type in sampled]
+
+    def type_counts(self) -> Dict[str, int]:
+        """Rows seen in the file per type (available after sampling)"""
+        return {t: reservoir.seen for t, reservoir in self.reservoirs.items()}
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Continuous Health Monitor for the Malicious URL Detection System microservices
+Probes every service's /health and / endpoints concurrently on a fixed
+interval and appends each probe (round time, service, endpoint, status code,
+latency, cold-start flag) to a compact fixed-size ring buffer on disk, so a
+monitor can run for weeks in constant space and be restarted without losing
+history.  Reports give availability, latency percentiles and cold-start
+events per service, overall and per time window.
+"""
+
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from latency_histogram import LatencyHistogram
+
+ENDPOINTS = ('/health', '/')
+RING_FILE = ".health_monitor.ring"
+DEFAULT_CAPACITY = 100000
+
+# A Render free-plan spin-up takes tens of seconds; a warm probe well under one
+DEFAULT_COLD_START_THRESHOLD = 5.0
+
+Probe = namedtuple('Probe', ['timestamp', 'service', 'endpoint', 'status_code', 'latency', 'cold_start'])
+
+_MAGIC = b'HMRB'
+_VERSION = 1
+# magic, version, record size, capacity, records ever written, length of the name table
+_HEADER = struct.Struct('<4sHHIQI')
+# round timestamp, service id, endpoint id, status code (0: no response), latency in seconds, flags
+_RECORD = struct.Struct('<dHBHfB')
+_NAMES_SIZE = 4096
+_DATA_OFFSET = _HEADER.size + _NAMES_SIZE
+_COLD_START = 1
+
+
+class RingBuffer:
+    """Fixed-capacity on-disk ring of probe records
+
+    The file holds a small header (capacity and total records written), a
+    JSON table mapping service names to ids, and `capacity` 18-byte records.
+    Once full, each new record overwrites the oldest one.
+    """
+
+    def __init__(self, filename: str = RING_FILE, capacity: int = DEFAULT_CAPACITY):
+        self.filename = filename
+        if os.path.exists(filename):
+            self._file = open(filename, 'r+b')
+            magic, version, record_size, self.capacity, self.written, names_length = \
+                _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+                self._file.close()
+                raise ValueError(f"{filename} is not a version {_VERSION} health monitor ring buffer")
+            self.services: List[str] = json.loads(self._file.read(names_length).decode('utf-8'))
+        else:
+            if capacity < 1:
+                raise ValueError("capacity must be at least 1")
+            directory = os.path.dirname(filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(filename, 'w+b')
+            self.capacity = capacity
+            self.written = 0
+            self.services = []
+            self._file.truncate(_DATA_OFFSET + capacity * _RECORD.size)
+            self._write_header()
+
+    def _write_header(self):
+        names = json.dumps(self.services).encode('utf-8')
+        if len(names) > _NAMES_SIZE:
+            raise ValueError("Too many services for the ring buffer name table")
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, self.capacity, self.written, len(names)))
+        self._file.write(names)
+
+    def _service_id(self, service: str) -> int:
+        if service not in self.services:
+            self.services.append(service)
+            self._write_header()
+        return self.services.index(service)
+
+    def append(self, probes: List[Probe]):
+        """Write probes and then the header, so a crash never exposes an unwritten slot"""
+        for probe in probes:
+            flags = _COLD_START if probe.cold_start else 0
+            record = _RECORD.pack(probe.timestamp, self._service_id(probe.service), ENDPOINTS.index(probe.endpoint),
+                                  probe.status_code or 0, probe.latency, flags)
+            self._file.seek(_DATA_OFFSET + (self.written % self.capacity) * _RECORD.size)
+            self._file.write(record)
+            self.written += 1
+        self._write_header()
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def __iter__(self) -> Iterator[Probe]:
+        """Probes from oldest to newest"""
+        count = len(self)
+        start = self.written - count
+        for position in range(start, self.written):
+            self._file.seek(_DATA_OFFSET + (position % self.capacity) * _RECORD.size)
+            timestamp, service_id, endpoint_id, status_code, latency, flags = \
+                _RECORD.unpack(self._file.read(_RECORD.size))
+            yield Probe(timestamp, self.services[service_id], ENDPOINTS[endpoint_id],
+                        status_code or None, latency, bool(flags & _COLD_START))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def is_up(probe: Probe) -> bool:
+    return probe.status_code == 200
+
+
+class HealthMonitor:
+    """Probes every service endpoint concurrently, once per interval
+
+    A successful probe slower than cold_start_threshold is flagged as a
+    cold start (the service was spun down and had to boot to answer).
+    """
+
+    def __init__(self, services: Dict[str, str], ring: RingBuffer, interval: float = 60.0, timeout: float = 90.0,
+                 cold_start_threshold: float = DEFAULT_COLD_START_THRESHOLD):
+        self.services = services
+        self.ring = ring
+        self.interval = interval
+        self.timeout = timeout
+        self.cold_start_threshold = cold_start_threshold
+        self.session = requests.Session()
+
+    def probe(self, timestamp: float, service: str, endpoint: str) -> Probe:
+        url = self.services[service].rstrip('/') + endpoint
+        start_time = time.perf_counter()
+        try:
+            status_code = self.session.get(url, timeout=self.timeout).status_code
+        except requests.exceptions.RequestException:
+            status_code = None
+        latency = time.perf_counter() - start_time
+        cold_start = status_code == 200 and latency >= self.cold_start_threshold
+        return Probe(timestamp, service, endpoint, status_code, latency, cold_start)
+
+    def probe_round(self) -> List[Probe]:
+        """Probe every (service, endpoint) pair at once and record the results"""
+        timestamp = time.time()
+        targets = [(service, endpoint) for service in self.services for endpoint in ENDPOINTS]
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            probes = list(executor.map(lambda target: self.probe(timestamp, *target), targets))
+        self.ring.append(probes)
+        return probes
+
+    def run(self, rounds: Optional[int] = None, duration: Optional[float] = None, verbose: bool = True):
+        """Probe on a fixed schedule until rounds or duration is reached (or Ctrl+C)"""
+        start = time.monotonic()
+        completed = 0
+        try:
+            while (rounds is None or completed < rounds) and (duration is None or time.monotonic() - start < duration):
+                probes = self.probe_round()
+                completed += 1
+                if verbose:
+                    print_round(probes)
+                # Next round is due on the original schedule; a slow round does not shift later ones
+                delay = start + completed * self.interval - time.monotonic()
+                if delay > 0 and (rounds is None or completed < rounds):
+                    time.sleep(delay)
+        except KeyboardInterrupt:
+            print("\n⏹️  Monitor stopped")
+        return completed
+
+    def close(self):
+        self.session.close()
+
+
+def print_round(probes: List[Probe]):
+    stamp = datetime.fromtimestamp(probes[0].timestamp).strftime("%H:%M:%S")
+    cells = []
+    for probe in probes:
+        icon = "🥶" if probe.cold_start else ("✅" if is_up(probe) else "❌")
+        cells.append(f"{icon} {probe.service}{probe.endpoint} {probe.latency:.2f}s")
+    print(f"[{stamp}] " + " | ".join(cells))
+
+
+def _summarize(probes: List[Probe]) -> Dict[str, Any]:
+    """Availability (rounds where /health or / answered 200), percentiles and cold starts"""
+    rounds: Dict[float, bool] = {}
+    cold_rounds = set()
+    endpoints: Dict[str, Tuple[int, int, LatencyHistogram]] = {}
+    for probe in probes:
+        rounds[probe.timestamp] = rounds.get(probe.timestamp, False) or is_up(probe)
+        if probe.cold_start:
+            cold_rounds.add(probe.timestamp)
+        total, up, histogram = endpoints.get(probe.endpoint, (0, 0, LatencyHistogram()))
+        if is_up(probe):
+            histogram.record(probe.latency)
+        endpoints[probe.endpoint] = (total + 1, up + is_up(probe), histogram)
+
+    summary = {
+        'rounds': len(rounds),
+        'availability': round(sum(rounds.values()) / len(rounds), 4) if rounds else None,
+        'cold_starts': len(cold_rounds),
+        'endpoints': {}
+    }
+    for endpoint, (total, up, histogram) in endpoints.items():
+        latency = histogram.summary() if histogram.total_count else None
+        summary['endpoints'][endpoint] = {
+            'probes': total,
+            'availability': round(up / total, 4),
+            'latency': latency
+        }
+    return summary
+
+
+def _cold_start_events(probes: List[Probe]) -> List[Dict[str, Any]]:
+    """One event per round with a cold probe; both endpoints wait on the same spin-up"""
+    events: Dict[float, float] = {}
+    for probe in probes:
+        if probe.cold_start:
+            events[probe.timestamp] = max(events.get(probe.timestamp, 0.0), probe.latency)
+    return [{'time': datetime.fromtimestamp(timestamp).isoformat(), 'latency': round(latency, 3)}
+            for timestamp, latency in sorted(events.items())]
+
+
+def build_report(ring: RingBuffer, window: float = 3600.0, since: Optional[float] = None) -> Dict[str, Any]:
+    """Per-service summary over the whole buffer plus one per time window"""
+    by_service: Dict[str, List[Probe]] = {service: [] for service in ring.services}
+    for probe in ring:
+        if since is None or probe.timestamp >= since:
+            by_service[probe.service].append(probe)
+
+    report = {'window_seconds': window, 'services': {}}
+    for service, probes in by_service.items():
+        if not probes:
+            continue
+        windows: Dict[float, List[Probe]] = {}
+        for probe in probes:
+            windows.setdefault(probe.timestamp - probe.timestamp % window, []).append(probe)
+        report['services'][service] = dict(
+            _summarize(probes),
+            first_probe=datetime.fromtimestamp(probes[0].timestamp).isoformat(),
+            last_probe=datetime.fromtimestamp(probes[-1].timestamp).isoformat(),
+            cold_start_events=_cold_start_events(probes),
+            windows=[
+                dict(_summarize(window_probes), start=datetime.fromtimestamp(start).isoformat())
+                for start, window_probes in sorted(windows.items())
+            ]
+        )
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 50)
+    print("📊 HEALTH MONITOR REPORT")
+    print("=" * 50)
+    for service, summary in report['services'].items():
+        availability = summary['availability'] or 0
+        icon = "✅" if availability == 1 else ("⚠️ " if availability > 0 else "❌")
+        print(f"{icon} {service}: {availability:.1%} available over {summary['rounds']} rounds, "
+              f"{summary['cold_starts']} cold starts")
+        for endpoint, stats in summary['endpoints'].items():
+            latency = stats['latency']
+            percentiles = (f"p50 {latency['p50']:.3f}s p90 {latency['p90']:.3f}s p99 {latency['p99']:.3f}s "
+                           f"max {latency['max']:.3f}s" if latency else "no successful probes")
+            print(f"   {endpoint:<8} {stats['availability']:>7.1%} up | {percentiles}")
+        if len(summary['windows']) > 1:
+            for window in summary['windows']:
+                print(f"   {window['start']}  {window['availability']:.1%} up, {window['cold_starts']} cold starts")
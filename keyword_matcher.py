@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Multi-Pattern Keyword Matcher for the Malicious URL Detection System
+An Aho-Corasick automaton that finds every suspicious keyword, brand name,
+URL shortener and malicious file extension in a URL or page in one linear
+pass, instead of one scan per list entry.  Scan time depends on the text
+length and the number of matches, not on how many patterns are loaded.
+"""
+
+import argparse
+import time
+from collections import deque, namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+Match = namedtuple('Match', ['start', 'end', 'pattern', 'category'])
+
+# SmileMlDetectionService.countSuspiciousKeywords
+ML_KEYWORDS = (
+    "malware", "virus", "trojan", "spyware", "phishing", "scam",
+    "hack", "crack", "keygen", "warez", "download", "free",
+    "login", "bank", "secure", "update", "verify", "account"
+)
+# UrlPatternDetectionService.SUSPICIOUS_KEYWORDS
+URL_KEYWORDS = (
+    "malware", "virus", "trojan", "spyware", "phishing", "scam", "fake", "hack", "crack", "warez",
+    "download", "free", "cracked", "nulled", "premium", "cheat", "bot", "exploit", "vulnerability"
+)
+# EnhancedContentAnalyzerService.SUSPICIOUS_KEYWORDS (content scanning)
+CONTENT_KEYWORDS = URL_KEYWORDS + (
+    "keygen", "backdoor", "rootkit", "keylogger", "ransomware", "adware", "spam", "bypass", "inject",
+    "sql", "xss", "csrf", "ddos", "brute", "force", "overflow", "buffer", "shell", "reverse", "bind",
+    "meterpreter", "payload", "dropper", "loader", "stager", "beacon", "c2", "command", "control"
+)
+# DomainReputationService.isBrandImpersonation
+BRANDS = ("google", "facebook", "amazon", "microsoft", "apple", "paypal", "ebay", "netflix", "twitter", "instagram")
+# UrlPatternDetectionService brand impersonation pattern
+BRAND_IMPERSONATION = (
+    "paypal-secure", "google-secure", "facebook-login", "amazon-verify", "microsoft-update", "apple-verify",
+    "netflix-account", "ebay-secure", "bank-verify", "credit-card", "social-security"
+)
+# UrlPatternDetectionService URL shortener pattern
+URL_SHORTENERS = (
+    "bit.ly", "tinyurl", "goo.gl", "t.co", "is.gd", "v.gd", "cli.gs", "ow.ly", "su.pr", "twurl.nl",
+    "snipurl.com", "short.to", "budurl.com", "ping.fm", "tiny.cc", "short.ly", "url.co"
+)
+# EnhancedContentAnalyzerService.MALICIOUS_EXTENSIONS, in order without its repeats; besides executable and
+# script types it flags shortcuts (.url) and generic data, temp and system-path suffixes (.dat, .tmp, .log, ...)
+MALICIOUS_EXTENSIONS = (
+    ".exe", ".bat", ".cmd", ".com", ".pif", ".scr", ".vbs", ".js", ".jar", ".msi", ".dmg", ".app", ".deb",
+    ".rpm", ".apk", ".ipa", ".pl", ".py", ".sh", ".ps1", ".psm1", ".vbe", ".wsf", ".hta", ".chm", ".reg",
+    ".inf", ".lnk", ".url", ".scf", ".wsh", ".wsc", ".msc", ".gadget", ".application", ".appref-ms", ".appx",
+    ".appxbundle", ".msix", ".msixbundle", ".msu", ".msp", ".mst", ".ocx", ".dll", ".sys", ".drv", ".bin",
+    ".dat", ".tmp", ".temp", ".cache", ".log", ".bak", ".old", ".swp", ".swo", ".lock", ".pid", ".sock",
+    ".fifo", ".pipe", ".socket", ".device", ".proc", ".dev", ".etc", ".var", ".usr", ".home", ".root", ".boot",
+    ".mnt", ".media", ".opt", ".srv", ".sbin", ".lib", ".lib64", ".local", ".share", ".doc", ".man", ".info",
+    ".include", ".src", ".build", ".dist", ".target", ".out", ".obj", ".debug", ".release"
+)
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over (pattern, category) pairs"""
+
+    def __init__(self, case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        # Per state: outgoing transitions, failure link, output link and own pattern ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output_link: List[int] = [-1]
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[str] = []
+        self._categories: List[str] = []
+        self._at_end: List[bool] = []
+        self._ids: Dict[tuple, int] = {}
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, pattern: str, category: str, at_end: bool = False):
+        """Add a pattern; with at_end it only matches as a suffix of the text"""
+        if not pattern:
+            raise ValueError("Empty pattern")
+        if not self.case_sensitive:
+            pattern = pattern.lower()
+        key = (pattern, category, at_end)
+        if key in self._ids:
+            return
+
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output_link.append(-1)
+                self._outputs.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+
+        pattern_id = len(self._patterns)
+        self._ids[key] = pattern_id
+        self._patterns.append(pattern)
+        self._categories.append(category)
+        self._at_end.append(at_end)
+        self._outputs[state].append(pattern_id)
+        self._built = False
+
+    def add_all(self, patterns: Iterable[str], category: str, at_end: bool = False):
+        for pattern in patterns:
+            self.add(pattern, category, at_end)
+        return self
+
+    def build(self):
+        """Compute failure and output links (called automatically before a scan)"""
+        goto, fail, output_link, outputs = self._goto, self._fail, self._output_link, self._outputs
+        queue = deque()
+        for next_state in goto[0].values():
+            fail[next_state] = 0
+            output_link[next_state] = -1
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[next_state] = target if target != next_state else 0
+                # Nearest proper suffix state that ends a pattern
+                target = fail[next_state]
+                output_link[next_state] = target if outputs[target] else output_link[target]
+        self._built = True
+        return self
+
+    def _normalize(self, text: str) -> str:
+        if self.case_sensitive:
+            return text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters (e.g. 'İ') lower to two; keep positions aligned with the input
+            lowered = ''.join(ch.lower()[:1] for ch in text)
+        return lowered
+
+    def finditer(self, text: str, categories: Optional[Iterable[str]] = None) -> Iterator[Match]:
+        """Yield every (possibly overlapping) match, ordered by end position"""
+        if not self._built:
+            self.build()
+        wanted = set(categories) if categories is not None else None
+        goto, fail, output_link, outputs = self._goto, self._fail, self._output_link, self._outputs
+        patterns, pattern_categories, at_end = self._patterns, self._categories, self._at_end
+        length = len(text)
+
+        state = 0
+        for position, ch in enumerate(self._normalize(text)):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            match_state = state if outputs[state] else output_link[state]
+            while match_state > 0:
+                for pattern_id in outputs[match_state]:
+                    if at_end[pattern_id] and position != length - 1:
+                        continue
+                    category = pattern_categories[pattern_id]
+                    if wanted is None or category in wanted:
+                        pattern = patterns[pattern_id]
+                        yield Match(position + 1 - len(pattern), position + 1, pattern, category)
+                match_state = output_link[match_state]
+
+    def scan(self, text: str, categories: Optional[Iterable[str]] = None) -> List[Match]:
+        return list(self.finditer(text, categories))
+
+    def matched_patterns(self, text: str, categories: Optional[Iterable[str]] = None) -> Dict[str, Set[str]]:
+        """Distinct matched patterns per category"""
+        found: Dict[str, Set[str]] = {}
+        for match in self.finditer(text, categories):
+            found.setdefault(match.category, set()).add(match.pattern)
+        return found
+
+
+def default_matcher() -> PatternMatcher:
+    """Matcher loaded with the detection services' keyword, brand, shortener and extension lists"""
+    matcher = PatternMatcher()
+    matcher.add_all(ML_KEYWORDS, 'ml_keyword')
+    matcher.add_all(URL_KEYWORDS, 'url_keyword')
+    matcher.add_all(CONTENT_KEYWORDS, 'content_keyword')
+    matcher.add_all(BRANDS, 'brand')
+    matcher.add_all(BRAND_IMPERSONATION, 'brand_impersonation')
+    matcher.add_all(URL_SHORTENERS, 'url_shortener')
+    matcher.add_all(MALICIOUS_EXTENSIONS, 'malicious_extension', at_end=True)
+    return matcher.build()
+
+
+_default_matcher = None
+
+
+def get_default_matcher() -> PatternMatcher:
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = default_matcher()
+    return _default_matcher
+
+
+def count_suspicious_keywords(url: str) -> int:
+    """Same count as SmileMlDetectionService.countSuspiciousKeywords"""
+    return len(get_default_matcher().matched_patterns(url, ['ml_keyword']).get('ml_keyword', ()))
+
+
+def is_brand_impersonation(domain: str) -> bool:
+    """Same decision as DomainReputationService.isBrandImpersonation"""
+    lower_domain = domain.lower()
+    brands = get_default_matcher().matched_patterns(lower_domain, ['brand']).get('brand', ())
+    return any(lower_domain != brand + ".com" for brand in brands)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Scan URLs or text with the keyword matcher")
+    parser.add_argument('text', nargs='*', help="URLs or text to scan")
+    parser.add_argument('--benchmark', type=int, default=None, metavar='PATTERNS',
+                        help="time scans with this many extra synthetic patterns loaded")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        text = "https://secure-paypal-login.example.tk/account/verify/download/update.exe?id=12345" * 100
+        for size in (0, args.benchmark):
+            matcher = default_matcher()
+            matcher.add_all((f"zq{index:x}kw" for index in range(size)), 'synthetic')
+            matcher.build()
+            start_time = time.perf_counter()
+            for _ in range(20):
+                matcher.scan(text)
+            elapsed = (time.perf_counter() - start_time) / 20
+            print(f"{len(matcher):>8} patterns: {elapsed * 1000:.2f} ms per {len(text)} chars")
+        return
+
+    matcher = get_default_matcher()
+    for text in args.text:
+        print(f"🔍 {text}")
+        for category, patterns in sorted(matcher.matched_patterns(text).items()):
+            print(f"   {category:<20} {', '.join(sorted(patterns))}")
+
+
+if __name__ == "__main__":
+    main()
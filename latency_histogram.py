@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+HDR-style Latency Histogram for the dataset testers
+Records per-request latencies with bounded relative error and reports
+tail percentiles (p50/p90/p99/p99.9/max), overall and per group.
+"""
+
+import csv
+import json
+import math
+from typing import Any, Dict, Optional
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies, in the spirit of HdrHistogram.
+
+    Values are stored as integer microseconds.  Each power-of-two range is
+    split into a fixed number of linear sub-buckets, so any recorded value
+    is reproduced to `significant_digits` decimal digits no matter how large
+    it is, while memory stays proportional to the number of distinct
+    buckets actually hit.
+    """
+
+    def __init__(self, significant_digits: int = 3):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._sub_bucket_half = self._sub_bucket_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self._min = None
+        self._max = 0
+        self._sum = 0
+
+    def _index_for(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return shift * self._sub_bucket_half + (value >> shift)
+
+    def _highest_equivalent_value(self, index: int) -> int:
+        if index < self._sub_bucket_count:
+            return index
+        shift = (index - self._sub_bucket_count) // self._sub_bucket_half + 1
+        sub_bucket = index - shift * self._sub_bucket_half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float, count: int = 1):
+        """Record a latency given in seconds"""
+        value = max(0, int(round(seconds * 1_000_000)))
+        index = self._index_for(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self._sum += value * count
+        if self._min is None or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add all values recorded in another histogram"""
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        if other._min is not None and (self._min is None or other._min < self._min):
+            self._min = other._min
+        self._max = max(self._max, other._max)
+
+    @property
+    def min(self) -> float:
+        return (self._min or 0) / 1_000_000
+
+    @property
+    def max(self) -> float:
+        return self._max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total_count / 1_000_000 if self.total_count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Return the latency (seconds) at or below which `percentile` % of values fall"""
+        if not self.total_count:
+            return 0.0
+        target = max(1, math.ceil(min(percentile, 100.0) / 100.0 * self.total_count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent_value(index), self._max) / 1_000_000
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean and tail percentiles in seconds"""
+        summary = {
+            'count': self.total_count,
+            'min': round(self.min, 6),
+            'mean': round(self.mean, 6)
+        }
+        for percentile in PERCENTILES:
+            summary[percentile_key(percentile)] = round(self.value_at_percentile(percentile), 6)
+        summary['max'] = round(self.max, 6)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the raw histogram so runs can be merged later"""
+        return {
+            'significant_digits': self.significant_digits,
+            'unit': 'microseconds',
+            'min': self._min,
+            'max': self._max,
+            'sum': self._sum,
+            'counts': {str(index): count for index, count in sorted(self.counts.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls(data['significant_digits'])
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.total_count = sum(histogram.counts.values())
+        histogram._min = data['min']
+        histogram._max = data['max']
+        histogram._sum = data['sum']
+        return histogram
+
+
+def percentile_key(percentile: float) -> str:
+    """50.0 -> 'p50', 99.9 -> 'p99_9'"""
+    return 'p' + f"{percentile:g}".replace('.', '_')
+
+
+class LatencyReport:
+    """An overall latency histogram plus one histogram per group
+    (URL category, dataset type, ...)"""
+
+    def __init__(self, group_label: str = 'group', significant_digits: int = 3):
+        self.group_label = group_label
+        self.significant_digits = significant_digits
+        self.overall = LatencyHistogram(significant_digits)
+        self.groups: Dict[str, LatencyHistogram] = {}
+
+    def record(self, group: Optional[str], seconds: float):
+        """Record a latency for the given group (and the overall histogram)"""
+        self.overall.record(seconds)
+        if group is not None:
+            if group not in self.groups:
+                self.groups[group] = LatencyHistogram(self.significant_digits)
+            self.groups[group].record(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'overall': self.overall.summary(),
+            f'by_{self.group_label}': {group: histogram.summary() for group, histogram in self.groups.items()}
+        }
+
+    def print_report(self):
+        """Print a percentile table, overall and per group"""
+        columns = ['count'] + [percentile_key(p) for p in PERCENTILES] + ['max']
+        header = f"{self.group_label.title():<20} | " + " | ".join(f"{column:>8}" for column in columns)
+        print(header)
+        print("-" * len(header))
+        rows = list(self.groups.items()) + [('OVERALL', self.overall)]
+        for group, histogram in rows:
+            summary = histogram.summary()
+            cells = [f"{summary['count']:>8}"] + [f"{summary[column]:>7.3f}s" for column in columns[1:]]
+            print(f"{group:<20} | " + " | ".join(cells))
+
+    def save(self, json_filename: str, csv_filename: str):
+        """Save percentile summaries and raw histograms (JSON) plus a percentile table (CSV)"""
+        with open(json_filename, 'w') as f:
+            json.dump({
+                'summary': self.summary(),
+                'histograms': {
+                    'overall': self.overall.to_dict(),
+                    f'by_{self.group_label}': {group: histogram.to_dict() for group, histogram in self.groups.items()}
+                }
+            }, f, indent=2)
+
+        columns = ['count', 'min', 'mean'] + [percentile_key(p) for p in PERCENTILES] + ['max']
+        with open(csv_filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([self.group_label.title()] + columns)
+            for group, histogram in list(self.groups.items()) + [('OVERALL', self.overall)]:
+                summary = histogram.summary()
+                writer.writerow([group] + [summary[column] for column in columns])
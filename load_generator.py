@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Malicious URL Detection System
+Drives /api/scan (or any per-item worker) from a thread pool, either
+closed-loop (as fast as the workers allow) or open-loop at a fixed
+request rate, over a shared keep-alive connection pool.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# One completed unit of work.  Timestamps are time.perf_counter() values:
+# `scheduled` is when the request was due to be sent (open-loop), `started`
+# when a worker actually picked it up and `finished` when it completed.
+LoadResult = namedtuple('LoadResult', ['index', 'item', 'result', 'scheduled', 'started', 'finished'])
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Create a requests session whose connection pool can serve pool_size threads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class LoadGenerator:
+    """Runs a worker function over a stream of items with bounded concurrency.
+
+    With rps=None the generator is closed-loop: each worker sends its next
+    request as soon as the previous one finished.  With a target rps it is
+    open-loop: request i is due at start + i / rps regardless of how long
+    earlier requests take, so a slow backend shows up as growing latency
+    (measured from the scheduled time) instead of a lower request rate.
+    """
+
+    def __init__(self, concurrency: int = 10, rps: Optional[float] = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if rps is not None and rps <= 0:
+            raise ValueError("rps must be positive")
+        self.concurrency = concurrency
+        self.rps = rps
+        self.session = create_session(concurrency)
+
+    def run(self, items: Iterable[Any], worker: Callable[[Any], Any]) -> Iterator[LoadResult]:
+        """Run worker(item) for every item, yielding LoadResults in completion order
+
+        Closing the iterator early (break, an exception or Ctrl+C in the
+        caller) stops dispatching; requests already in flight finish and
+        their results are dropped.  An exception raised while iterating
+        items is re-raised here once the requests in flight are yielded.
+        """
+        completed: Queue = Queue(maxsize=self.concurrency * 4)
+        stop = threading.Event()
+        done = object()
+        failure = []
+
+        def deliver(entry):
+            # A bounded put would block forever once the caller stopped reading
+            while not stop.is_set():
+                try:
+                    completed.put(entry, timeout=0.1)
+                    return
+                except Full:
+                    continue
+
+        def execute(index, item, scheduled):
+            if stop.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                result = worker(item)
+            except Exception as e:
+                result = e
+            deliver(LoadResult(index, item, result, scheduled, started, time.perf_counter()))
+
+        def dispatch():
+            # Bound the number of queued-but-not-started tasks so huge
+            # datasets are not materialised in the executor's work queue.
+            slots = threading.BoundedSemaphore(self.concurrency * 2)
+
+            def release(_future):
+                slots.release()
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                    start = time.perf_counter()
+                    for index, item in enumerate(items):
+                        if self.rps is not None:
+                            scheduled = start + index / self.rps
+                            delay = scheduled - time.perf_counter()
+                            if delay > 0 and stop.wait(delay):
+                                break
+                        else:
+                            scheduled = None
+                        while not slots.acquire(timeout=0.1):
+                            if stop.is_set():
+                                break
+                        if stop.is_set():
+                            break
+                        if scheduled is None:
+                            scheduled = time.perf_counter()
+                        executor.submit(execute, index, item, scheduled).add_done_callback(release)
+            except Exception as e:
+                # Raised by the items iterable; handed to the consumer instead of killing the thread
+                failure.append(e)
+            finally:
+                deliver(done)
+
+        dispatcher = threading.Thread(target=dispatch, name='load-dispatcher', daemon=True)
+        dispatcher.start()
+
+        try:
+            while True:
+                entry = completed.get()
+                if entry is done:
+                    break
+                yield entry
+            dispatcher.join()
+            if failure:
+                raise failure[0]
+        finally:
+            stop.set()
+
+    def close(self):
+        """Close the shared connection pool"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
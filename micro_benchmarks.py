@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the Malicious URL Detection System hot paths
+Times URL feature extraction, domain parsing (cache hit and miss), keyword
+matching, /predict response serialization, /metrics instrumentation and,
+when python_microservice is importable, tokenization and single vs batched
+inference.  Each case is repeated to get a sample of per-operation times.
+Timings only compare on the same machine, so no baseline is committed:
+record one on the machine that runs the checks with --save NAME (written
+to benchmark_baselines/NAME.json), then check later runs with --compare
+NAME or --compare latest.  The comparison is a Mann-Whitney U test and
+fails when a case is significantly slower by more than --threshold.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BASELINES_DIR = "benchmark_baselines"
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+
+
+class SkipBenchmark(Exception):
+    """Raised by a case's setup when what it measures is not available"""
+
+
+# name -> (setup, operations per call, description); setup returns the callable to time
+BENCHMARKS: Dict[str, Tuple[Callable[[], Callable[[], Any]], int, str]] = {}
+
+
+def benchmark(name: str, ops: int = 1, description: str = ""):
+    """Register a benchmark case; the decorated setup function returns the timed callable"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, ops, description or (setup.__doc__ or "").strip())
+        return setup
+    return register
+
+
+def synthetic_urls(count: int, seed: int = 42, unique_hosts: bool = False, start: int = 0) -> List[str]:
+    """Deterministic mix of benign and malicious-looking URLs, numbered from start"""
+    rng = random.Random(seed)
+    hosts = ["www.google.com", "github.com", "news.bbc.co.uk", "paypal-secure-login.tk", "192.168.10.4",
+             "free-download.example.xyz", "amazon-verify.account-update.ml", "docs.python.org"]
+    paths = ["", "/", "/index.html", "/login/verify?id={n}", "/download/keygen.exe",
+             "/account/update?session={n}&token=abc123", "/wp-content/uploads/{n}/invoice.pdf"]
+    urls = []
+    for n in range(start, start + count):
+        host = f"host{n}.example{n % 97}.com" if unique_hosts else rng.choice(hosts)
+        scheme = rng.choice(("http://", "https://", ""))
+        urls.append(scheme + host + rng.choice(paths).format(n=n))
+    return urls
+
+
+def _require_numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise SkipBenchmark("numpy is not installed")
+
+
+@benchmark('features.extract_batch', ops=1024)
+def _features_batch():
+    """Java ML URL features for a batch of 1024 URLs"""
+    _require_numpy()
+    from url_features import extract_features, risk_scores
+    urls = synthetic_urls(1024)
+    return lambda: risk_scores(extract_features(urls))
+
+
+@benchmark('features.extract_single', ops=1)
+def _features_single():
+    """Java ML URL features for one URL (per-call overhead)"""
+    _require_numpy()
+    from url_features import extract_features, risk_scores
+    urls = synthetic_urls(1)
+    return lambda: risk_scores(extract_features(urls))
+
+
+@benchmark('domain.parse_cache_hit', ops=256)
+def _domain_hit():
+    """Registrable-domain parsing of 256 URLs whose hosts are cached"""
+    from domain_parser import parse_url
+    urls = synthetic_urls(256)
+    for url in urls:
+        parse_url(url)
+
+    def run():
+        for url in urls:
+            parse_url(url)
+    return run
+
+
+@benchmark('domain.parse_cache_miss', ops=256)
+def _domain_miss():
+    """Registrable-domain parsing of 256 URLs with a cold host cache"""
+    from domain_parser import clear_host_cache, get_public_suffix_list, parse_url
+    get_public_suffix_list()
+    urls = synthetic_urls(256, unique_hosts=True)
+
+    def run():
+        clear_host_cache()
+        for url in urls:
+            parse_url(url)
+    return run
+
+
+@benchmark('keywords.match_url', ops=256)
+def _keywords():
+    """Keyword, brand, shortener and extension matching over 256 URLs"""
+    from keyword_matcher import get_default_matcher
+    matcher = get_default_matcher()
+    urls = synthetic_urls(256)
+
+    def run():
+        for url in urls:
+            matcher.matched_patterns(url)
+    return run
+
+
+@benchmark('json.predict_response', ops=256)
+def _json_predict():
+    """JSON serialization of 256 /predict response bodies"""
+    from stand_in_servers import predict_response
+    responses = [predict_response(url) for url in synthetic_urls(256)]
+
+    def run():
+        for response in responses:
+            json.dumps(response).encode('utf-8')
+    return run
+
+
+@benchmark('metrics.counter_inc', ops=1000)
+def _metrics_counter():
+    """1000 labelled /metrics request-counter increments (instrumentation overhead)"""
+    from prometheus_metrics import Counter
+    counter = Counter('bench_requests_total', "Benchmark counter.", ('endpoint', 'status'))
+
+    def run():
+        for _ in range(1000):
+            counter.inc('/predict', '200')
+    return run
+
+
+@benchmark('metrics.histogram_observe', ops=1000)
+def _metrics_histogram():
+    """1000 /metrics latency-histogram observations (instrumentation overhead)"""
+    from prometheus_metrics import Histogram
+    histogram = Histogram('bench_seconds', "Benchmark histogram.", ('endpoint',))
+    latencies = [0.0005 * 1.5 ** (n % 20) for n in range(1000)]
+
+    def run():
+        for latency in latencies:
+            histogram.observe(latency, '/predict')
+    return run
+
+
+_model_manager = None
+
+
+def _require_model():
+    """The python_microservice ModelManager, loaded once for all model cases"""
+    global _model_manager
+    if _model_manager is None:
+        from sharded_inference import load_model_manager
+        try:
+            _model_manager = load_model_manager(os.environ.get('BENCHMARK_MODEL'))
+        except RuntimeError as e:
+            raise SkipBenchmark(str(e))
+    return _model_manager
+
+
+@benchmark('model.tokenize_single', ops=1)
+def _tokenize_single():
+    """Tokenization of one URL"""
+    manager = _require_model()
+    url = synthetic_urls(1)[0]
+    return lambda: manager.tokenizer(url, truncation=True, return_tensors='pt')
+
+
+@benchmark('model.tokenize_batch', ops=32)
+def _tokenize_batch():
+    """Tokenization of 32 URLs in one call"""
+    manager = _require_model()
+    urls = synthetic_urls(32)
+    return lambda: manager.tokenizer(urls, truncation=True, padding=True, return_tensors='pt')
+
+
+@benchmark('model.predict_single', ops=32)
+def _predict_single():
+    """Inference on 32 distinct URLs, one predict() call each (cache misses)"""
+    manager = _require_model()
+    calls = itertools.count()
+
+    def run():
+        # Fresh URLs every call so a prediction cache, if any, never hits
+        offset = next(calls) * 32
+        for url in synthetic_urls(32, seed=offset, unique_hosts=True, start=offset):
+            manager.predict(url)
+    return run
+
+
+@benchmark('model.predict_repeat', ops=32)
+def _predict_repeat():
+    """Inference on the same URL 32 times (cache hits when the service caches)"""
+    manager = _require_model()
+    url = synthetic_urls(1)[0]
+
+    def run():
+        for _ in range(32):
+            manager.predict(url)
+    return run
+
+
+@benchmark('model.predict_batch', ops=32)
+def _predict_batch():
+    """Inference on 32 URLs in one batched call"""
+    manager = _require_model()
+    if not hasattr(manager, 'predict_batch'):
+        raise SkipBenchmark("ModelManager has no predict_batch")
+    urls = synthetic_urls(32)
+    return lambda: manager.predict_batch(urls)
+
+
+def measure(run: Callable[[], Any], ops: int, repeat: int = 20, min_time: float = 0.02) -> Dict[str, Any]:
+    """Per-operation times from `repeat` samples, each looping run() for at least min_time"""
+    # Warm up and calibrate the number of calls per sample
+    number = 1
+    while True:
+        start_time = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - start_time) / (number * ops))
+    return summarize(samples, ops, number)
+
+
+def summarize(samples: List[float], ops: int = 1, number: int = 1) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    quartiles = statistics.quantiles(ordered, n=4) if len(ordered) > 1 else [ordered[0]] * 3
+    return {
+        'ops': ops,
+        'number': number,
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'min': ordered[0],
+        'iqr': quartiles[2] - quartiles[0],
+        'samples': samples
+    }
+
+
+def mann_whitney_u(first: List[float], second: List[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation with tie correction)"""
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        ties = end - index + 1
+        tie_term += ties ** 3 - ties
+        index = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            alpha: float = DEFAULT_ALPHA) -> List[Dict[str, Any]]:
+    """Per-case comparison; a case regresses when its median is more than threshold
+    slower and the difference is significant at alpha"""
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or 'median' not in base or 'median' not in result:
+            continue
+        ratio = result['median'] / base['median'] if base['median'] > 0 else float('inf')
+        p_value = mann_whitney_u(base['samples'], result['samples'])
+        significant = p_value < alpha
+        if significant and ratio > 1 + threshold:
+            verdict = 'regression'
+        elif significant and ratio < 1 / (1 + threshold):
+            verdict = 'improvement'
+        else:
+            verdict = 'unchanged'
+        rows.append({'name': name, 'baseline': base['median'], 'current': result['median'],
+                     'ratio': round(ratio, 4), 'p_value': p_value, 'verdict': verdict})
+    return rows
+
+
+def run_benchmarks(selected: Optional[List[str]] = None, repeat: int = 20, min_time: float = 0.02,
+                   verbose: bool = True) -> Dict[str, Any]:
+    """Run the selected cases (all by default) and return a baseline-shaped document"""
+    results: Dict[str, Any] = {}
+    for name in selected if selected is not None else list(BENCHMARKS):
+        setup, ops, _ = BENCHMARKS[name]
+        try:
+            run = setup()
+        except SkipBenchmark as e:
+            results[name] = {'skipped': str(e)}
+            if verbose:
+                print(f"   ⏭️  {name:<28} skipped: {e}")
+            continue
+        results[name] = measure(run, ops, repeat, min_time)
+        if verbose:
+            result = results[name]
+            print(f"   ⏱️  {name:<28} {format_time(result['median']):>10} per op "
+                  f"(± {format_time(result['iqr'])} IQR, {repeat} x {result['number']} calls)")
+    return {
+        'format_version': FORMAT_VERSION,
+        'created': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'repeat': repeat, 'min_time': min_time},
+        'results': results
+    }
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def baseline_path(name: str, baselines_dir: str = BASELINES_DIR) -> str:
+    return os.path.join(baselines_dir, f"{name}.json")
+
+
+def save_baseline(document: Dict[str, Any], name: str, baselines_dir: str = BASELINES_DIR) -> str:
+    os.makedirs(baselines_dir, exist_ok=True)
+    filename = baseline_path(name, baselines_dir)
+    with open(filename, 'w') as f:
+        json.dump(dict(document, name=name), f, indent=2)
+    return filename
+
+
+def load_baseline(name: str, baselines_dir: str = BASELINES_DIR) -> Dict[str, Any]:
+    """A saved baseline by name, or the most recently saved one for 'latest'"""
+    if name == 'latest':
+        candidates = [os.path.join(baselines_dir, entry) for entry in os.listdir(baselines_dir)
+                      if entry.endswith('.json')] if os.path.isdir(baselines_dir) else []
+        if not candidates:
+            raise FileNotFoundError(f"No baselines in {baselines_dir}; record one with --save NAME")
+        filename = max(candidates, key=os.path.getmtime)
+    else:
+        filename = baseline_path(name, baselines_dir)
+    with open(filename) as f:
+        document = json.load(f)
+    if document.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"{filename} has baseline format {document.get('format_version')}, "
+                         f"expected {FORMAT_VERSION}")
+    return document
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline: Dict[str, Any]):
+    print()
+    print(f"📊 Comparison with baseline '{baseline.get('name')}' ({baseline.get('git_commit') or 'unknown commit'}, "
+          f"{baseline.get('created', '')[:19]})")
+    print("=" * 60)
+    icons = {'regression': "🔴", 'improvement': "🟢", 'unchanged': "⚪"}
+    for row in rows:
+        print(f"{icons[row['verdict']]} {row['name']:<28} {format_time(row['baseline']):>10} → "
+              f"{format_time(row['current']):>10}  x{row['ratio']:.2f}  p={row['p_value']:.3g}  {row['verdict']}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the hot-path microbenchmarks")
+    parser.add_argument('--filter', default=None, help="only run cases whose name contains this text")
+    parser.add_argument('--list', action='store_true', help="list the cases and exit")
+    parser.add_argument('--repeat', type=int, default=20, help="samples per case")
+    parser.add_argument('--min-time', type=float, default=0.02, help="minimum seconds per sample")
+    parser.add_argument('--save', default=None, metavar='NAME', help="save the run as a baseline")
+    parser.add_argument('--compare', default=None, metavar='NAME',
+                        help="compare with a saved baseline ('latest' for the newest)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help="significance level of the comparison (default: 0.01)")
+    parser.add_argument('--baselines-dir', default=BASELINES_DIR)
+    args = parser.parse_args()
+
+    selected = [name for name in BENCHMARKS if args.filter is None or args.filter in name]
+    if args.list:
+        for name in selected:
+            print(f"{name:<28} {BENCHMARKS[name][2]}")
+        return 0
+
+    baseline = load_baseline(args.compare, args.baselines_dir) if args.compare else None
+
+    print("🚀 Microbenchmarks")
+    print("=" * 60)
+    document = run_benchmarks(selected, args.repeat, args.min_time)
+
+    if args.save:
+        print(f"\n💾 Baseline saved to: {save_baseline(document, args.save, args.baselines_dir)}")
+
+    if baseline is not None:
+        rows = compare(baseline, document, args.threshold, args.alpha)
+        print_comparison(rows, baseline)
+        regressions = [row['name'] for row in rows if row['verdict'] == 'regression']
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Offline Evaluation Engine for the Malicious URL Detection System
+Runs the Python-side detectors (vectorized URL feature heuristics and,
+optionally, the ML microservice's ModelManager in-process) directly over a
+dataset, without going through /api/scan.  Produces the same per-URL result
+records, by-type statistics and output files as MaliciousPhishTester, so a
+model or threshold change can be validated on the full CSV in minutes.
+"""
+
+import argparse
+import itertools
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dataset_cache import PHISH_DATASET, load_dataset_for
+from scan_aggregation import aggregate_detections, detection_result
+from sharded_inference import ShardedInference, load_model_manager
+from test_malicious_phish_dataset import MaliciousPhishTester
+from url_features import RISK_THRESHOLD, extract_features, risk_scores
+
+MALICIOUS_TYPES = ('phishing', 'malware', 'defacement', 'malicious')
+DEFAULT_CHUNK_SIZE = 4096
+
+# TransformerMLDetectionService flags at confidence > 0.4 in code (docs/detection_thresholds.yml says 0.7)
+TRANSFORMER_THRESHOLD = 0.4
+
+
+class UrlFeatureDetector:
+    """The Java ML Detection heuristic (SmileMlDetectionService), vectorized"""
+
+    method = "Java ML Detection"
+
+    def __init__(self, threshold: float = RISK_THRESHOLD):
+        self.threshold = threshold
+
+    def detect_batch(self, urls: Sequence[str]) -> List[Dict[str, Any]]:
+        scores = risk_scores(extract_features(urls))
+        return [
+            detection_result(self.method, bool(score > self.threshold), f"ML Analysis: Risk Score: {score:.2f}", float(score))
+            for score in scores
+        ]
+
+
+class TransformerDetector:
+    """The ML microservice's ModelManager, loaded in-process"""
+
+    method = "TransformerML"
+
+    def __init__(self, model_name: Optional[str] = None, threshold: float = TRANSFORMER_THRESHOLD,
+                 workers: int = 1):
+        self.threshold = threshold
+        self.model_name = model_name
+        if workers > 1:
+            self.runner = ShardedInference(model_name, workers)
+            self.runner.start()
+        else:
+            self.runner = None
+            self.model_manager = load_model_manager(model_name)
+            self.model_name = self.model_manager.model_name
+
+    def _predict(self, urls: Sequence[str]) -> List[Any]:
+        if self.runner is not None:
+            return self.runner.predict(urls)
+
+        predict_batch = getattr(self.model_manager, 'predict_batch', None)
+        if predict_batch is not None:
+            return list(predict_batch(list(urls)))
+
+        predictions = []
+        for url in urls:
+            try:
+                predictions.append(self.model_manager.predict(url))
+            except Exception as e:
+                predictions.append(e)
+        return predictions
+
+    def close(self):
+        if self.runner is not None:
+            self.runner.close()
+
+    def detect_batch(self, urls: Sequence[str]) -> List[Dict[str, Any]]:
+        results = []
+        for prediction in self._predict(urls):
+            if isinstance(prediction, Exception):
+                results.append(detection_result(self.method, False, f"Error: {prediction}", 0.0))
+                continue
+            label, confidence = prediction
+            detected = label == 'malicious' and confidence > self.threshold
+            results.append(detection_result(self.method, detected, f"Model {self.model_name}: {label}", float(confidence)))
+        return results
+
+
+class OfflineEvaluator(MaliciousPhishTester):
+    """Scores datasets in-process in chunks and reports like MaliciousPhishTester"""
+
+    output_prefix = "offline_evaluation"
+
+    def __init__(self, detectors: Sequence[Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__(base_url="offline")
+        self.detectors = list(detectors)
+        self.chunk_size = chunk_size
+
+    def evaluate_chunk(self, urls: Sequence[str], types: Sequence[str]) -> List[Dict[str, Any]]:
+        """Run every detector over one chunk and return tester-style result records"""
+        start_time = time.perf_counter()
+        per_detector = [detector.detect_batch(urls) for detector in self.detectors]
+        # Detectors run batched, so each URL is charged an equal share
+        response_time = (time.perf_counter() - start_time) / max(1, len(urls))
+
+        records = []
+        for index, (url, expected_type) in enumerate(zip(urls, types)):
+            detection_results = {results[index]['method']: results[index] for results in per_detector}
+            overall_malicious, overall_status = aggregate_detections(detection_results)
+            expected_malicious = expected_type in MALICIOUS_TYPES
+            record = {
+                'url': url,
+                'expected_type': expected_type,
+                'expected_malicious': expected_malicious,
+                'response_time': round(response_time, 6),
+                'status_code': None,
+                'success': True,
+                'enhanced_content_analysis_found': False,
+                'detection_methods': list(detection_results),
+                'malicious_detections': sum(1 for result in detection_results.values() if result['detected']),
+                'overall_malicious': overall_malicious,
+                'overall_status': overall_status,
+                'detection_correct': overall_malicious == expected_malicious,
+                'detection_results': detection_results,
+                'error': None
+            }
+            self._update_stats(record, response_time)
+            self.latency.record(expected_type, response_time)
+            records.append(record)
+        return records
+
+    def iter_chunks(self, test_cases: Iterator[Tuple[str, str]]) -> Iterator[Tuple[List[str], List[str]]]:
+        """Group (url, type) pairs into chunks of chunk_size"""
+        urls, types = [], []
+        for url, expected_type in test_cases:
+            urls.append(url)
+            types.append(expected_type)
+            if len(urls) >= self.chunk_size:
+                yield urls, types
+                urls, types = [], []
+        if urls:
+            yield urls, types
+
+    def run_offline_evaluation(self, filename: str = PHISH_DATASET, sample_size: Optional[int] = None,
+                               seed: Optional[int] = None, limit: Optional[int] = None):
+        """Evaluate a whole dataset (or a stratified sample of it) and save the results"""
+        print("🚀 Starting Offline Evaluation")
+        print("=" * 60)
+        print(f"🔍 Detectors: {', '.join(detector.method for detector in self.detectors)}")
+        self.open_results()
+
+        if sample_size is not None:
+            test_cases = [(test_case['url'], test_case['type'])
+                          for test_case in self.load_dataset_sample(filename, sample_size, seed=seed)]
+            self.run_chunks(iter(test_cases), len(test_cases))
+        else:
+            with load_dataset_for(filename, verbose=True) as dataset:
+                rows = (index for index in dataset.rows(filename) if dataset.labels[index] != 0)
+                if limit is not None:
+                    rows = itertools.islice(rows, limit)
+                # Rows without a ground-truth label (label code 0, 'unknown') are skipped
+                self.run_chunks((dataset.url(index), dataset.label(index)) for index in rows)
+
+        if self.stats['successful_tests'] > 0:
+            self.stats['average_response_time'] = self.stats['total_response_time'] / self.stats['successful_tests']
+        self.stats['latency'] = self.latency.summary()
+
+        if not self.stats['total_tests']:
+            print("❌ No labelled URLs found. Exiting.")
+            return
+
+        self.print_dataset_results()
+        self.save_results()
+
+    def run_chunks(self, test_cases: Iterator[Tuple[str, str]], total: Optional[int] = None):
+        """Evaluate (url, type) pairs chunk by chunk, printing progress"""
+        wall_start = time.perf_counter()
+        for urls, types in self.iter_chunks(test_cases):
+            for record in self.evaluate_chunk(urls, types):
+                self.record_result(record)
+            elapsed = time.perf_counter() - wall_start
+            done = self.stats['total_tests']
+            progress = f"{done}/{total}" if total else f"{done}"
+            print(f"  Evaluated {progress} URLs ({done / max(elapsed, 1e-9):,.0f} URLs/s)")
+
+        wall_time = time.perf_counter() - wall_start
+        self.stats['offline'] = {
+            'detectors': [detector.method for detector in self.detectors],
+            'chunk_size': self.chunk_size,
+            'wall_time': round(wall_time, 3),
+            'urls_per_second': round(self.stats['total_tests'] / wall_time, 1) if wall_time > 0 else 0
+        }
+        print()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Evaluate the Python-side detectors offline over a dataset")
+    parser.add_argument('dataset', nargs='?', default=PHISH_DATASET)
+    parser.add_argument('--sample-size', type=int, default=None,
+                        help="evaluate a stratified sample instead of the whole dataset")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for --sample-size")
+    parser.add_argument('--limit', type=int, default=None, help="stop after this many URLs")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--model', default=None, metavar='NAME',
+                        help="also run the transformer through python_microservice.ModelManager")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="shard --model inference across this many processes")
+    parser.add_argument('--features-threshold', type=float, default=RISK_THRESHOLD)
+    parser.add_argument('--transformer-threshold', type=float, default=TRANSFORMER_THRESHOLD)
+    args = parser.parse_args()
+
+    detectors = [UrlFeatureDetector(args.features_threshold)]
+    if args.model:
+        try:
+            detectors.append(TransformerDetector(args.model, args.transformer_threshold, args.workers))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+
+    evaluator = OfflineEvaluator(detectors, chunk_size=args.chunk_size)
+    try:
+        evaluator.run_offline_evaluation(args.dataset, sample_size=args.sample_size, seed=args.seed, limit=args.limit)
+    finally:
+        for detector in detectors:
+            if hasattr(detector, 'close'):
+                detector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics for the Malicious URL Detection System services
+Counters, histograms and gauges rendered in the Prometheus text exposition
+format for a /metrics endpoint.  Updates are lock-free on the hot path:
+every thread increments its own shard (plain dict updates under the GIL)
+and a scrape sums the shards.  A lock is only taken the first time a thread
+touches a metric, which is also when shards of finished threads are folded
+into a base total so thread-per-request servers do not grow without bound.
+"""
+
+import math
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond cache hits up to Render cold starts
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Sharded(ABC):
+    """Per-thread shards of {label values: state}, merged on read"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                live = []
+                for thread, old_shard in self._shards:
+                    if thread.is_alive():
+                        live.append((thread, old_shard))
+                    else:
+                        self._fold(self._retired, dict(old_shard))
+                live.append((threading.current_thread(), shard))
+                self._shards = live
+        return shard
+
+    def _labels(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(label) for label in labels)
+
+    def _merged(self) -> dict:
+        with self._lock:
+            merged: dict = {}
+            self._fold(merged, self._retired)
+            for _, shard in self._shards:
+                # dict() copies atomically under the GIL, so concurrent writers are safe
+                self._fold(merged, dict(shard))
+        return merged
+
+    @abstractmethod
+    def _fold(self, target: dict, source: dict):
+        """Add the states in source into target"""
+
+
+class Counter(_Sharded):
+    """Monotonic counter, optionally labelled"""
+
+    type_name = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._labels(labels) if labels or self.labelnames else ()
+        shard = self._shard()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def _fold(self, target: dict, source: dict):
+        for key, value in source.items():
+            target[key] = target.get(key, 0.0) + value
+
+    def value(self, *labels: str) -> float:
+        return self._merged().get(self._labels(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in sorted(self._merged().items())]
+
+
+class Histogram(_Sharded):
+    """Cumulative-bucket histogram, optionally labelled"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        key = self._labels(labels) if labels or self.labelnames else ()
+        shard = self._shard()
+        state = shard.get(key)
+        if state is None:
+            # Per-bucket counts (last is +Inf), then sum and count
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def _fold(self, target: dict, source: dict):
+        for key, state in source.items():
+            current = target.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0, 0])
+            for index, value in enumerate(list(state)):
+                current[index] += value
+
+    def snapshot(self, *labels: str) -> Tuple[List[int], float, int]:
+        """(cumulative bucket counts, sum, count) for one label set"""
+        state = self._merged().get(self._labels(labels))
+        if state is None:
+            return [0] * (len(self.buckets) + 1), 0.0, 0
+        cumulative, running = [], 0
+        for count in state[:-2]:
+            running += count
+            cumulative.append(running)
+        return cumulative, state[-2], state[-1]
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        rows = []
+        for key, state in sorted(self._merged().items()):
+            running = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-2]):
+                running += count
+                rows.append((self.name + '_bucket', _format_labels(self.labelnames + ('le',), key + (_format_value(float(bound)),)), running))
+            labels = _format_labels(self.labelnames, key)
+            rows.append((self.name + '_sum', labels, state[-2]))
+            rows.append((self.name + '_count', labels, state[-1]))
+        return rows
+
+
+class Gauge:
+    """Value read from a callback at scrape time; a None result omits the sample"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], Optional[float]]):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        try:
+            value = self.function()
+        except Exception:
+            value = None
+        return [] if value is None else [(self.name, '', value)]
+
+
+class MetricsRegistry:
+    """The set of metrics one /metrics endpoint exposes"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, function: Callable[[], Optional[float]]) -> Gauge:
+        return self._register(Gauge(name, documentation, function))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            samples = metric.samples()
+            if not samples and isinstance(metric, Gauge):
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def process_rss_bytes() -> Optional[float]:
+    """Current resident set size (Linux /proc), else the peak from getrusage"""
+    try:
+        with open('/proc/self/statm') as f:
+            return float(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return float(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def torch_threads(interop: bool = False) -> Optional[float]:
+    """torch intra-op (or inter-op) thread count, if torch is already loaded in this process"""
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return None
+    return float(torch.get_num_interop_threads() if interop else torch.get_num_threads())
+
+
+def add_process_metrics(registry: MetricsRegistry, prefix: str = "ml"):
+    """Process RSS and torch thread gauges shared by the ML services"""
+    registry.gauge('process_resident_memory_bytes', "Resident memory size in bytes.", process_rss_bytes)
+    registry.gauge(f'{prefix}_torch_threads', "torch intra-op threads.", torch_threads)
+    registry.gauge(f'{prefix}_torch_interop_threads', "torch inter-op threads.", lambda: torch_threads(True))
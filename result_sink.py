@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Streaming Result Sink for the Malicious URL Detection System tests
+Appends each result record to a compact JSONL file as it arrives, flushing
+in batches, and keeps the running counts the testers report (detection
+methods, per-group totals) so memory stays constant however many URLs are
+tested.  The CSV summary is built afterwards by streaming the JSONL back,
+and a crash loses at most the last unflushed batch.
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+CsvColumns = Sequence[Tuple[str, Callable[[Dict[str, Any]], Any]]]
+
+
+def iter_results(filename: str) -> Iterator[Dict[str, Any]]:
+    """Stream records back from a JSONL results file, skipping a torn last line"""
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A crash mid-write can leave a partial final record
+                continue
+
+
+def truncate_partial_record(filename: str):
+    """Cut a torn last line so appending does not glue a new record onto it"""
+    with open(filename, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                if start + newline + 1 != end:
+                    f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+
+def write_csv(results_file: str, csv_file: str, columns: CsvColumns):
+    """Build a CSV from a JSONL results file without loading it into memory"""
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in columns])
+        for result in iter_results(results_file):
+            writer.writerow([value(result) for _, value in columns])
+
+
+class ResultSink:
+    """Append-only JSONL writer with incremental statistics"""
+
+    def __init__(self, filename: str, group_key: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, resume: bool = False):
+        self.filename = filename
+        self.group_key = group_key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.method_counts: Dict[str, int] = {}
+        self.groups: Dict[str, Dict[str, int]] = {}
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(filename):
+            # Continue an earlier file: drop a torn tail and recount what is there
+            truncate_partial_record(filename)
+            for result in iter_results(filename):
+                self._count(result)
+        self._file = open(filename, 'a', encoding='utf-8')
+
+    def _count(self, result: Dict[str, Any]):
+        self.count += 1
+        if result.get('success'):
+            for method in result.get('detection_methods', ()):
+                self.method_counts[method] = self.method_counts.get(method, 0) + 1
+            if self.group_key is not None:
+                group = self.groups.setdefault(result[self.group_key], {'total': 0, 'malicious': 0, 'enhanced': 0})
+                group['total'] += 1
+                group['malicious'] += bool(result.get('overall_malicious'))
+                group['enhanced'] += bool(result.get('enhanced_content_analysis_found'))
+
+    def write(self, result: Dict[str, Any]):
+        """Append one result and fold it into the running counts"""
+        line = json.dumps(result, separators=(',', ':'), default=str)
+        with self._lock:
+            self._buffer.append(line)
+            self._count(result)
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        if self._file.closed:
+            return
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stream the records written so far"""
+        self.flush()
+        return iter_results(self.filename)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Run Checkpoints for the Malicious URL Detection System tests
+Each dataset run gets an ID and a directory under .runs/ holding the run
+parameters, the exact sampled test cases, the streamed results and a
+checkpoint with the cursor (first test case not yet scored).  A run that
+dies partway through can be resumed from that directory: already scored
+URLs are skipped and their results are folded back into the statistics.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from result_sink import truncate_partial_record
+
+RUNS_DIR = ".runs"
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def _write_json(filename: str, data: Dict[str, Any]):
+    """Write JSON atomically so an interrupted write never leaves a broken checkpoint"""
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_filename, filename)
+
+
+class RunCheckpoint:
+    """On-disk state of one dataset run"""
+
+    def __init__(self, run_id: str, runs_dir: str = RUNS_DIR):
+        self.run_id = run_id
+        self.run_dir = os.path.join(runs_dir, run_id)
+        self.manifest_file = os.path.join(self.run_dir, 'manifest.json')
+        self.sample_file = os.path.join(self.run_dir, 'sample.jsonl')
+        self.results_file = os.path.join(self.run_dir, 'results.jsonl')
+        self.checkpoint_file = os.path.join(self.run_dir, 'checkpoint.json')
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_file)
+
+    def create(self, test_cases: List[Dict[str, Any]], params: Dict[str, Any]):
+        """Persist the parameters and sample of a new run (FileExistsError if the ID is taken)"""
+        if self.exists():
+            raise FileExistsError(f"Run {self.run_id} already exists in {self.run_dir}")
+        os.makedirs(self.run_dir, exist_ok=True)
+        with open(self.sample_file, 'w') as f:
+            for test_case in test_cases:
+                f.write(json.dumps(test_case, separators=(',', ':')) + '\n')
+        _write_json(self.manifest_file, {
+            'run_id': self.run_id,
+            'created': datetime.now().isoformat(),
+            'total': len(test_cases),
+            'params': params
+        })
+        self.save(set(), len(test_cases))
+
+    def load_manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_file) as f:
+            return json.load(f)
+
+    def load_sample(self) -> List[Dict[str, Any]]:
+        with open(self.sample_file) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_file):
+            return None
+        with open(self.checkpoint_file) as f:
+            return json.load(f)
+
+    def save(self, completed: Set[int], total: int, status: str = "running"):
+        """Record progress; the cursor is the first sample index not yet scored"""
+        cursor = 0
+        while cursor in completed:
+            cursor += 1
+        _write_json(self.checkpoint_file, {
+            'run_id': self.run_id,
+            'status': status,
+            'completed': len(completed),
+            'total': total,
+            'cursor': cursor,
+            'updated': datetime.now().isoformat()
+        })
+
+    def prune_failed(self) -> int:
+        """Drop failed results from the results file so they are retried; returns how many"""
+        if not os.path.exists(self.results_file):
+            return 0
+        truncate_partial_record(self.results_file)
+        tmp_filename = self.results_file + ".tmp"
+        dropped = 0
+        with open(self.results_file, encoding='utf-8') as source, open(tmp_filename, 'w', encoding='utf-8') as target:
+            for line in source:
+                if json.loads(line).get('success'):
+                    target.write(line)
+                else:
+                    dropped += 1
+        if dropped:
+            os.replace(tmp_filename, self.results_file)
+        else:
+            os.remove(tmp_filename)
+        return dropped
+
+    @staticmethod
+    def remaining(test_cases: Iterable[Dict[str, Any]], completed: Set[int]) -> List[Dict[str, Any]]:
+        return [test_case for test_case in test_cases if test_case['index'] not in completed]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Saturation Sweep for the Malicious URL Detection System
+Finds the highest request rate /api/scan sustains before latency collapses.
+Open-loop load is offered in steps (growing geometrically, optionally
+refined by binary search); each step records p50/p99 latency, achieved
+throughput, error rate, HTTP 429/5xx counts and an /actuator/health probe.
+The knee is the highest offered rate at which no saturation criterion
+tripped, and the full latency-vs-throughput curve is saved alongside it.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from datetime import datetime
+from itertools import cycle, islice
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from latency_histogram import LatencyHistogram
+from load_generator import LoadGenerator
+
+
+def saturation_reasons(step: Dict[str, Any], baseline_p99: Optional[float], max_p99: Optional[float] = None,
+                       latency_factor: float = 3.0, max_error_rate: float = 0.01,
+                       min_throughput_ratio: float = 0.9, min_latency: float = 0.01) -> List[str]:
+    """Criteria a measured step violates (empty when the step is sustainable)
+
+    Without an absolute max_p99 the latency limit is latency_factor times the
+    baseline p99 (the lowest seen so far), floored at min_latency so a sub-
+    millisecond baseline does not turn scheduler jitter into a knee.
+    """
+    reasons = []
+    p99_limit = max_p99
+    if p99_limit is None and baseline_p99 is not None:
+        p99_limit = latency_factor * max(baseline_p99, min_latency)
+    if p99_limit is not None and step['p99'] > p99_limit:
+        reasons.append(f"p99 {step['p99']:.3f}s > {p99_limit:.3f}s")
+    if step['error_rate'] > max_error_rate:
+        reasons.append(f"error rate {step['error_rate']:.1%} > {max_error_rate:.1%}")
+    if step['achieved_rps'] < min_throughput_ratio * step['offered_rps']:
+        reasons.append(f"achieved {step['achieved_rps']:.1f} req/s < "
+                       f"{min_throughput_ratio:.0%} of {step['offered_rps']:g} offered")
+    if not step['healthy']:
+        reasons.append("health check failed")
+    return reasons
+
+
+class SaturationSweep:
+    """Steps open-loop load against /api/scan until a saturation criterion trips
+
+    tester is a MaliciousPhishTester: its thread-safe test_url sends the
+    requests, over the load generator's connection pool for the duration of
+    each step.  Each step offers rps * step_duration requests, cycling
+    through test_cases.
+    """
+
+    def __init__(self, tester, test_cases: List[Dict[str, str]], concurrency: int = 64,
+                 step_duration: float = 10.0, max_p99: Optional[float] = None, latency_factor: float = 3.0,
+                 max_error_rate: float = 0.01, min_throughput_ratio: float = 0.9, cooldown: float = 1.0,
+                 health_path: str = "/actuator/health"):
+        if not test_cases:
+            raise ValueError("No test cases to sweep with")
+        self.tester = tester
+        self.test_cases = test_cases
+        self.concurrency = concurrency
+        self.step_duration = step_duration
+        self.max_p99 = max_p99
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.min_throughput_ratio = min_throughput_ratio
+        self.cooldown = cooldown
+        self.health_path = health_path
+        self.baseline_p99: Optional[float] = None
+        self.steps: List[Dict[str, Any]] = []
+
+    def check_health(self) -> Dict[str, Any]:
+        """Probe the backend health endpoint"""
+        start_time = time.perf_counter()
+        try:
+            response = requests.get(f"{self.tester.base_url}{self.health_path}", timeout=5)
+            healthy = response.status_code == 200 and response.json().get('status') == "UP"
+            status_code = response.status_code
+        except Exception:
+            healthy, status_code = False, None
+        return {'healthy': healthy, 'status_code': status_code,
+                'latency': round(time.perf_counter() - start_time, 6)}
+
+    def measure(self, rps: float) -> Dict[str, Any]:
+        """Offer rps for one step and summarise what came back"""
+        requests_count = max(1, int(math.ceil(rps * self.step_duration)))
+        items = islice(cycle(self.test_cases), requests_count)
+        histogram = LatencyHistogram()
+        status_counts: Dict[str, int] = {}
+        errors = 0
+
+        with LoadGenerator(concurrency=self.concurrency, rps=rps) as generator:
+            def worker(test_case):
+                return self.tester.test_url(test_case['url'], test_case['type'], generator.session)
+
+            first_scheduled = last_finished = None
+            for entry in generator.run(items, worker):
+                result = entry.result
+                if isinstance(result, Exception):
+                    raise result
+                # Latency from the scheduled send time, so client-side queueing counts
+                histogram.record(entry.finished - entry.scheduled)
+                if first_scheduled is None or entry.scheduled < first_scheduled:
+                    first_scheduled = entry.scheduled
+                if last_finished is None or entry.finished > last_finished:
+                    last_finished = entry.finished
+                status = str(result['status_code']) if result['status_code'] is not None else 'no_response'
+                status_counts[status] = status_counts.get(status, 0) + 1
+                if not result['success']:
+                    errors += 1
+        wall_time = max(last_finished - first_scheduled, 1e-9)
+
+        health = self.check_health()
+        summary = histogram.summary()
+        step = {
+            'offered_rps': round(rps, 3),
+            'requests': requests_count,
+            'wall_time': round(wall_time, 3),
+            'achieved_rps': round(requests_count / wall_time, 2),
+            'goodput_rps': round((requests_count - errors) / wall_time, 2),
+            'p50': summary['p50'],
+            'p90': summary['p90'],
+            'p99': summary['p99'],
+            'max': summary['max'],
+            'errors': errors,
+            'error_rate': round(errors / requests_count, 4),
+            'status_429': status_counts.get('429', 0),
+            'status_5xx': sum(count for status, count in status_counts.items() if status.startswith('5')),
+            'no_response': status_counts.get('no_response', 0),
+            'status_counts': status_counts,
+            'healthy': health['healthy'],
+            'health_latency': health['latency']
+        }
+        # The lowest p99 seen so far: the first step also pays for connection setup
+        if self.baseline_p99 is None or step['p99'] < self.baseline_p99:
+            self.baseline_p99 = step['p99']
+        step['reasons'] = saturation_reasons(step, self.baseline_p99, self.max_p99, self.latency_factor,
+                                             self.max_error_rate, self.min_throughput_ratio)
+        step['saturated'] = bool(step['reasons'])
+        self.steps.append(step)
+        self._print_step(step)
+        if self.cooldown > 0:
+            # Let queues drain so one step's backlog does not leak into the next
+            time.sleep(self.cooldown)
+        return step
+
+    def _print_step(self, step: Dict[str, Any]):
+        verdict = "🔴 SATURATED: " + "; ".join(step['reasons']) if step['saturated'] else "🟢 OK"
+        print(f"   {step['offered_rps']:>8g} req/s offered | {step['achieved_rps']:>8.1f} achieved | "
+              f"p50 {step['p50']:.3f}s p99 {step['p99']:.3f}s | errors {step['error_rate']:.1%} "
+              f"(429: {step['status_429']}, 5xx: {step['status_5xx']}) | {verdict}")
+
+    def run(self, start_rps: float = 5.0, max_rps: float = 1000.0, growth: float = 1.5,
+            binary_search: bool = False, tolerance: float = 0.1) -> Dict[str, Any]:
+        """Sweep from start_rps upwards and return the knee and the curve
+
+        The offered rate is multiplied by growth after every sustainable step
+        until a step saturates or max_rps is passed.  With binary_search the
+        interval between the last sustainable and the first saturated rate is
+        then bisected until it is narrower than tolerance (relative).
+        """
+        if start_rps <= 0 or growth <= 1:
+            raise ValueError("start_rps must be positive and growth greater than 1")
+        mode = "step + binary search" if binary_search else "step"
+        print(f"📈 Saturation sweep ({mode}): from {start_rps:g} req/s, x{growth:g} per step, "
+              f"{self.step_duration:g}s per step, {self.concurrency} workers")
+
+        good: Optional[float] = None
+        bad: Optional[float] = None
+        rps = start_rps
+        while rps <= max_rps:
+            if self.measure(rps)['saturated']:
+                bad = rps
+                break
+            good = rps
+            rps *= growth
+
+        if binary_search and good is not None and bad is not None:
+            while (bad - good) / good > tolerance:
+                rps = (good + bad) / 2
+                if self.measure(rps)['saturated']:
+                    bad = rps
+                else:
+                    good = rps
+
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Knee point and the latency-vs-throughput curve (ordered by offered rate)"""
+        curve = sorted(self.steps, key=lambda step: step['offered_rps'])
+        sustainable = [step for step in curve if not step['saturated']]
+        saturated = [step for step in curve if step['saturated']]
+        knee = sustainable[-1] if sustainable else None
+        return {
+            'knee_rps': knee['offered_rps'] if knee else None,
+            'knee': knee,
+            'first_saturated_rps': saturated[0]['offered_rps'] if saturated else None,
+            'baseline_p99': self.baseline_p99,
+            'criteria': {
+                'max_p99': self.max_p99,
+                'latency_factor': self.latency_factor,
+                'max_error_rate': self.max_error_rate,
+                'min_throughput_ratio': self.min_throughput_ratio
+            },
+            'concurrency': self.concurrency,
+            'step_duration': self.step_duration,
+            'curve': curve
+        }
+
+    @staticmethod
+    def print_report(report: Dict[str, Any], start_option: str = '--start-rps',
+                     max_option: Optional[str] = '--max-rps'):
+        """Print the curve; the option names are those of the calling CLI, for the hints"""
+        print()
+        print("📊 SATURATION SWEEP RESULTS")
+        print("=" * 60)
+        print(f"{'Offered':>9} | {'Achieved':>9} | {'p50':>8} | {'p99':>8} | {'Errors':>7} | {'429':>5} | {'5xx':>5} | Health")
+        for step in report['curve']:
+            marker = " ◀ knee" if report['knee'] is step else ""
+            print(f"{step['offered_rps']:>9g} | {step['achieved_rps']:>9.1f} | {step['p50']:>7.3f}s | "
+                  f"{step['p99']:>7.3f}s | {step['error_rate']:>6.1%} | {step['status_429']:>5} | "
+                  f"{step['status_5xx']:>5} | {'UP' if step['healthy'] else 'DOWN'}{marker}")
+        print()
+        if report['knee_rps'] is None:
+            print(f"❌ Saturated at the first step; lower {start_option}")
+        else:
+            print(f"✅ Max sustainable throughput: {report['knee_rps']:g} req/s "
+                  f"(p99 {report['knee']['p99']:.3f}s)")
+            if report['first_saturated_rps'] is None:
+                if max_option is not None:
+                    print(f"   No step saturated; raise {max_option} to find the knee")
+                else:
+                    print(f"   No step saturated up to {report['curve'][-1]['offered_rps']:g} req/s")
+
+    @staticmethod
+    def save(report: Dict[str, Any], output_dir: str = ".", timestamp: Optional[str] = None):
+        """Save the report (JSON) and the curve (CSV)"""
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_filename = os.path.join(output_dir, f"saturation_sweep_{timestamp}.json")
+        csv_filename = os.path.join(output_dir, f"saturation_sweep_{timestamp}.csv")
+        with open(json_filename, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        columns = ['offered_rps', 'achieved_rps', 'goodput_rps', 'p50', 'p90', 'p99', 'max', 'requests',
+                   'errors', 'error_rate', 'status_429', 'status_5xx', 'no_response', 'healthy', 'saturated']
+        with open(csv_filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for step in report['curve']:
+                writer.writerow([step[column] for column in columns])
+        return json_filename, csv_filename
+
+
+def main():
+    """Main function"""
+    from test_malicious_phish_dataset import MaliciousPhishTester
+
+    parser = argparse.ArgumentParser(description="Find the maximum sustainable /api/scan throughput")
+    parser.add_argument('base_url', nargs='?', default="http://localhost:8080")
+    parser.add_argument('--dataset', default="src/main/resources/malicious_phish.csv")
+    parser.add_argument('--sample-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--start-rps', type=float, default=5.0)
+    parser.add_argument('--max-rps', type=float, default=1000.0)
+    parser.add_argument('--growth', type=float, default=1.5, help="rate multiplier between steps")
+    parser.add_argument('--binary-search', action='store_true',
+                        help="bisect between the last good and first saturated rate")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="relative width at which bisection stops")
+    parser.add_argument('--step-duration', type=float, default=10.0, help="seconds of load per step")
+    parser.add_argument('--concurrency', type=int, default=64, help="client workers (keep above the server's)")
+    parser.add_argument('--max-p99', type=float, default=None,
+                        help="absolute p99 limit in seconds (default: --latency-factor x lowest p99 seen)")
+    parser.add_argument('--latency-factor', type=float, default=3.0)
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--cooldown', type=float, default=1.0, help="pause between steps in seconds")
+    args = parser.parse_args()
+
+    tester = MaliciousPhishTester(args.base_url)
+    test_cases = tester.load_dataset_sample(args.dataset, args.sample_size, seed=args.seed)
+    if not test_cases:
+        return
+    print()
+
+    sweep = SaturationSweep(tester, test_cases, concurrency=args.concurrency, step_duration=args.step_duration,
+                            max_p99=args.max_p99, latency_factor=args.latency_factor,
+                            max_error_rate=args.max_error_rate, cooldown=args.cooldown)
+    health = sweep.check_health()
+    if not health['healthy']:
+        print(f"❌ Server health check failed (status {health['status_code']})")
+        print("Make sure the server is running with: ./run.sh start")
+        return
+
+    report = sweep.run(args.start_rps, args.max_rps, args.growth, args.binary_search, args.tolerance)
+    SaturationSweep.print_report(report)
+    json_filename, csv_filename = SaturationSweep.save(report)
+    print(f"💾 Results saved to: {json_filename}, {csv_filename}")
+
+
+if __name__ == "__main__":
+    main()
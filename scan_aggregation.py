@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Scan Aggregation for the Malicious URL Detection System
+Python port of how ComprehensiveMalwareDetectionService.scanUrl turns the
+per-method DetectionResults into the overall verdict, status, confidence
+and recommendation of a UrlScanResult, for tools that evaluate or simulate
+/api/scan without the Java backend.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Recommendation texts of scanUrl by status, for non-whitelisted and whitelisted URLs
+RECOMMENDATIONS = {
+    "MALICIOUS": "HIGH RISK: At least one detection method flagged this URL as malicious with moderate confidence. Avoid visiting this site.",
+    "SUSPICIOUS": "MEDIUM RISK: Multiple suspicious indicators detected. Proceed with caution.",
+    "LOW-MEDIUM RISK": "LOW-MEDIUM RISK: Some minor concerns detected, but overall appears safe.",
+    "CLEAN": "LOW RISK: URL appears safe based on comprehensive analysis."
+}
+WHITELISTED_RECOMMENDATIONS = {
+    "MALICIOUS": "HIGH RISK: Multiple detection methods flagged this whitelisted URL as malicious. Exercise extreme caution.",
+    "SUSPICIOUS": "MEDIUM RISK: Some suspicious indicators detected on whitelisted domain. Proceed with caution.",
+    "CLEAN": "LOW RISK: URL appears safe based on comprehensive analysis."
+}
+# Replaces either text when a single very-high-confidence detection overrides the decision
+OVERRIDE_RECOMMENDATION = "HIGH RISK: Very high confidence malicious detection. Avoid visiting this site."
+
+
+def detection_result(method: str, detected: bool, details: str, confidence: float) -> Dict[str, Any]:
+    """A dict shaped like UrlScanResult.DetectionResult as serialized by /api/scan"""
+    return {
+        'method': method,
+        'detected': detected,
+        'details': details,
+        'confidence': confidence,
+        'status': "MALICIOUS" if detected else "CLEAN"
+    }
+
+
+def aggregate_detections(detection_results: Dict[str, Dict[str, Any]], whitelisted: bool = False) -> Tuple[bool, str]:
+    """Overall (malicious, status) decision of ComprehensiveMalwareDetectionService.scanUrl"""
+    malicious, status, _ = _decide(detection_results, whitelisted)
+    return malicious, status
+
+
+def _decide(detection_results: Dict[str, Dict[str, Any]], whitelisted: bool) -> Tuple[bool, str, str]:
+    """(malicious, status, recommendation), following the branch scanUrl takes"""
+    results = detection_results.values()
+    malicious_count = sum(1 for result in results if result['detected'])
+    moderate_detection = any(result['detected'] and result['confidence'] > 0.3 for result in results)
+    content_issues = any(
+        ('Content' in result['method'] or 'Enhanced' in result['method']) and result['confidence'] > 0.5
+        for result in results
+    )
+    suspicious_indicators = sum(1 for result in results if result['detected'] or result['confidence'] > 0.4)
+
+    if whitelisted:
+        if moderate_detection and malicious_count >= 2:
+            malicious, status = True, "MALICIOUS"
+        elif content_issues or suspicious_indicators >= 3:
+            malicious, status = False, "SUSPICIOUS"
+        else:
+            malicious, status = False, "CLEAN"
+        recommendation = WHITELISTED_RECOMMENDATIONS[status]
+    else:
+        if moderate_detection:
+            malicious, status = True, "MALICIOUS"
+        elif content_issues or suspicious_indicators >= 2:
+            malicious, status = False, "SUSPICIOUS"
+        elif suspicious_indicators >= 1:
+            malicious, status = False, "LOW-MEDIUM RISK"
+        else:
+            malicious, status = False, "CLEAN"
+        recommendation = RECOMMENDATIONS[status]
+
+    # Very high confidence single detections override
+    if not malicious and any(result['detected'] and result['confidence'] > 0.8 for result in results):
+        malicious, status, recommendation = True, "MALICIOUS", OVERRIDE_RECOMMENDATION
+
+    return malicious, status, recommendation
+
+
+def average_confidence(detection_results: Dict[str, Dict[str, Any]]) -> float:
+    """Mean confidence over methods that did not error, as in the Java service"""
+    confidences = [result['confidence'] for result in detection_results.values()
+                   if not result['details'].startswith(("Error:", "API key not configured"))]
+    return sum(confidences) / len(confidences) if confidences else 0.0
+
+
+def scan_result(url: str, detection_results: Dict[str, Dict[str, Any]], whitelisted: bool = False,
+                scanned_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """A dict shaped like UrlScanResult as serialized by /api/scan"""
+    malicious, status, recommendation = _decide(detection_results, whitelisted)
+    return {
+        'url': url,
+        'malicious': malicious,
+        'overallStatus': status,
+        'scannedAt': (scanned_at or datetime.now()).isoformat(),
+        'detectionResults': detection_results,
+        'threats': [result['details'] for result in detection_results.values() if result['detected']],
+        'confidenceScore': average_confidence(detection_results),
+        'recommendation': recommendation
+    }
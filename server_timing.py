@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Server-Timing Support for the Malicious URL Detection System
+Per-stage request timers for the /predict path (JSON parsing, URL
+validation, tokenization, model inference, response building), formatting
+and parsing of the W3C Server-Timing header that carries them, and rolling
+per-stage latency histograms for /info.  The stand-in servers emit these
+headers and the integration testers parse and report them.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from latency_histogram import LatencyHistogram
+
+# Stage names in request order; services emit the subset they have
+STAGES = ('parse', 'validate', 'tokenize', 'inference', 'serialize')
+TOTAL = 'total'
+
+_TOKEN = re.compile(r"^[!#$%&'*+\-.^_`|~0-9A-Za-z]+$")
+
+
+class StageTimer:
+    """Accumulates wall time per named stage of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start_time
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def durations_ms(self, include_total: bool = True) -> Dict[str, float]:
+        """Stage durations in milliseconds, in the order they ran"""
+        durations = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        if include_total:
+            durations[TOTAL] = round(self.total() * 1000, 3)
+        return durations
+
+
+def format_server_timing(durations_ms: Dict[str, float]) -> str:
+    """'parse;dur=0.041, inference;dur=2.5, total;dur=2.9'"""
+    return ", ".join(f"{name};dur={duration:g}" for name, duration in durations_ms.items())
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, Optional[float]]:
+    """Metric name -> duration in ms (None when a metric has no dur) from a Server-Timing header
+
+    Several headers joined with commas are accepted; desc values may be
+    quoted and contain commas or semicolons.  Malformed entries are skipped.
+    """
+    metrics: Dict[str, Optional[float]] = {}
+    for entry in _split_outside_quotes(header or '', ','):
+        parts = _split_outside_quotes(entry, ';')
+        name = parts[0].strip()
+        if not _TOKEN.match(name):
+            continue
+        duration = None
+        for param in parts[1:]:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'dur':
+                try:
+                    duration = float(value.strip().strip('"'))
+                except ValueError:
+                    duration = None
+                break
+        # The spec keeps the first occurrence of a duplicated metric
+        metrics.setdefault(name, duration)
+    return metrics
+
+
+def _split_outside_quotes(text: str, separator: str) -> List[str]:
+    parts, current, quoted, escaped = [], [], False, False
+    for ch in text:
+        if escaped:
+            escaped = False
+        elif ch == '\\' and quoted:
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+        elif ch == separator and not quoted:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append(''.join(current))
+    return [part for part in parts if part.strip()]
+
+
+class StageHistograms:
+    """Rolling per-stage latency histograms
+
+    Time is cut into `buckets` slots of window / buckets seconds; each slot
+    holds one histogram per stage and the oldest slot is dropped as time
+    moves on, so summaries cover roughly the last `window` seconds.
+    """
+
+    def __init__(self, window: float = 300.0, buckets: int = 5):
+        self.window = window
+        self.slot_seconds = window / buckets
+        self.buckets = buckets
+        self._slots: Deque[Tuple[int, Dict[str, LatencyHistogram]]] = deque()
+        self._lock = threading.Lock()
+
+    def _current(self, now: float) -> Dict[str, LatencyHistogram]:
+        slot = int(now // self.slot_seconds)
+        while self._slots and self._slots[0][0] <= slot - self.buckets:
+            self._slots.popleft()
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, {}))
+        return self._slots[-1][1]
+
+    def record(self, durations_ms: Dict[str, float], now: Optional[float] = None):
+        with self._lock:
+            histograms = self._current(time.monotonic() if now is None else now)
+            for stage, duration in durations_ms.items():
+                if stage not in histograms:
+                    histograms[stage] = LatencyHistogram()
+                histograms[stage].record(duration / 1000)
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Per-stage count, mean and percentiles in seconds over the rolling window"""
+        with self._lock:
+            self._current(time.monotonic() if now is None else now)
+            merged: Dict[str, LatencyHistogram] = {}
+            for _, histograms in self._slots:
+                for stage, histogram in histograms.items():
+                    merged.setdefault(stage, LatencyHistogram()).merge(histogram)
+        return {
+            'window_seconds': self.window,
+            'stages': {stage: histogram.summary() for stage, histogram in merged.items()}
+        }
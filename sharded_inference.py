@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Sharded Inference Runner for the Malicious URL Detection System
+Scores large URL corpora with python_microservice's ModelManager across a
+process pool.  The model is loaded once in the parent and shared with the
+workers through fork copy-on-write (or once per worker under spawn), torch
+intra-op threads are split between workers so cores are not oversubscribed,
+URL chunks are handed out dynamically and results come back in input order.
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Per-process model, set in the parent before forking or by _init_worker
+_model = None
+# Why _init_worker could not load the model in this worker, if it failed
+_init_error: Optional[str] = None
+
+
+def load_model_manager(model_name: Optional[str] = None):
+    """Load python_microservice's ModelManager (RuntimeError if unavailable)"""
+    try:
+        from python_microservice.config import Config
+        from python_microservice.model_manager import ModelManager
+    except ImportError as e:
+        raise RuntimeError(f"python_microservice is not importable ({e}); "
+                           "run from a checkout that includes the ML microservice") from e
+
+    model_manager = ModelManager()
+    model_name = model_name or Config.get_model_name()
+    if not model_manager.load_model(model_name):
+        raise RuntimeError(f"Failed to load model {model_name}")
+    return model_manager
+
+
+def set_torch_threads(threads: int):
+    """Limit torch (and BLAS/OpenMP) to the given number of threads in this process"""
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = str(threads)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first parallel op in this process
+        pass
+
+
+def _init_worker(model_factory: Callable, model_name: Optional[str], threads: int):
+    global _model, _init_error
+    set_torch_threads(threads)
+    if _model is None:
+        try:
+            _model = model_factory(model_name)
+        except Exception as e:
+            # Raising here makes the pool respawn the worker forever; fail its first task instead
+            _init_error = f"{type(e).__name__}: {e}"
+
+
+def _predict_chunk(task: Tuple[int, List[str]]) -> Tuple[int, List[Any]]:
+    """Predict one chunk; failures are returned in place as RuntimeError"""
+    chunk_index, urls = task
+    if _init_error is not None:
+        raise WorkerInitError(f"worker {os.getpid()} could not load the model ({_init_error})")
+    predict_batch = getattr(_model, 'predict_batch', None)
+    if predict_batch is not None:
+        try:
+            return chunk_index, list(predict_batch(urls))
+        except Exception as e:
+            return chunk_index, [RuntimeError(str(e))] * len(urls)
+
+    predictions = []
+    for url in urls:
+        try:
+            predictions.append(_model.predict(url))
+        except Exception as e:
+            # Exceptions from the model may not pickle; send the message back
+            predictions.append(RuntimeError(str(e)))
+    return chunk_index, predictions
+
+
+class WorkerInitError(RuntimeError):
+    """A pool worker failed to load the model"""
+
+
+def _chunks(urls: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    chunk = []
+    chunk_index = 0
+    for url in urls:
+        chunk.append(url)
+        if len(chunk) >= chunk_size:
+            yield chunk_index, chunk
+            chunk_index += 1
+            chunk = []
+    if chunk:
+        yield chunk_index, chunk
+
+
+class ShardedInference:
+    """Process pool of model replicas scoring URL chunks"""
+
+    def __init__(self, model_name: Optional[str] = None, workers: Optional[int] = None,
+                 threads_per_worker: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 start_method: Optional[str] = None, model_factory: Callable = load_model_manager):
+        cpu_count = os.cpu_count() or 1
+        self.model_name = model_name
+        self.workers = workers or cpu_count
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.workers)
+        self.chunk_size = chunk_size
+        self.model_factory = model_factory
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self.pool = None
+
+    def start(self):
+        """Load the model and start the worker pool"""
+        global _model
+        if self.pool is not None:
+            return
+        if self.start_method == 'fork':
+            # Loaded once here; workers share the weights copy-on-write
+            _model = self.model_factory(self.model_name)
+        context = multiprocessing.get_context(self.start_method)
+        self.pool = context.Pool(self.workers, initializer=_init_worker,
+                                 initargs=(self.model_factory, self.model_name, self.threads_per_worker))
+
+    def close(self, terminate: bool = False):
+        global _model
+        if self.pool is not None:
+            if terminate:
+                self.pool.terminate()
+            else:
+                self.pool.close()
+            self.pool.join()
+            self.pool = None
+        _model = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def predict_iter(self, urls: Iterable[str]) -> Iterator[Any]:
+        """Yield (label, confidence) or RuntimeError per URL, in input order"""
+        self.start()
+        pending: Dict[int, List[Any]] = {}
+        next_index = 0
+        # Chunks finish out of order; buffer them until the next one in line arrives
+        try:
+            for chunk_index, predictions in self.pool.imap_unordered(_predict_chunk, _chunks(urls, self.chunk_size)):
+                pending[chunk_index] = predictions
+                while next_index in pending:
+                    yield from pending.pop(next_index)
+                    next_index += 1
+        except WorkerInitError:
+            # Every worker would fail the same way; do not leave the rest of the pool running
+            self.close(terminate=True)
+            raise
+
+    def predict(self, urls: Iterable[str]) -> List[Any]:
+        return list(self.predict_iter(urls))
+
+
+def main():
+    """Main function"""
+    from dataset_cache import PHISH_DATASET, load_dataset_for
+
+    parser = argparse.ArgumentParser(description="Score a URL dataset with the transformer across processes")
+    parser.add_argument('dataset', nargs='?', default=PHISH_DATASET)
+    parser.add_argument('--model', default=None, metavar='NAME')
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help="torch threads per worker (default: CPU count / workers)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--limit', type=int, default=None, help="stop after this many URLs")
+    parser.add_argument('--output', default=None, help="CSV of url, type, prediction, confidence")
+    args = parser.parse_args()
+
+    runner = ShardedInference(args.model, args.workers, args.threads_per_worker, args.chunk_size)
+    print("🚀 Starting Sharded Inference")
+    print("=" * 60)
+    print(f"⚙️  Workers: {runner.workers} x {runner.threads_per_worker} threads, chunk size {runner.chunk_size}")
+
+    output_file = args.output or f"sharded_inference_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    with load_dataset_for(args.dataset, verbose=True) as dataset:
+        rows = list(dataset.rows(args.dataset))[:args.limit]
+        try:
+            runner.start()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+
+        start_time = time.perf_counter()
+        errors = 0
+        with runner, open(output_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['url', 'type', 'prediction', 'confidence'])
+            urls = (dataset.url(index) for index in rows)
+            for index, prediction in zip(rows, runner.predict_iter(urls)):
+                if isinstance(prediction, Exception):
+                    errors += 1
+                    writer.writerow([dataset.url(index), dataset.label(index), f"Error: {prediction}", ''])
+                else:
+                    writer.writerow([dataset.url(index), dataset.label(index), prediction[0], prediction[1]])
+        elapsed = time.perf_counter() - start_time
+
+    print(f"✅ Scored {len(rows)} URLs in {elapsed:.1f}s ({len(rows) / max(elapsed, 1e-9):,.0f} URLs/s), {errors} errors")
+    print(f"💾 Predictions saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
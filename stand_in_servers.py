@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In Servers for the Malicious URL Detection System
+Serves the Java backend (/api/scan, /api/scan/health, /api/scan/ml/health,
+/actuator/health) and the Python microservices (/predict, /detect, /health,
+/info) from one lightweight threaded HTTP server, with responses shaped like
+the real schemas.  Verdicts come from deterministic keyword heuristics;
+latency distribution, error rate and response padding are configurable, so
+the load tools and integration tests can run offline and reproducibly.
+A cold-start mode mimics a Render free-plan spin-down: after an idle
+timeout the next request waits for a boot, then the model loads.  /predict
+and /detect report per-stage timings in a Server-Timing header (and in the
+body with ?timing=true), aggregated on /info; /metrics exposes request
+counters, latency and batch-size histograms in the Prometheus text format.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from domain_parser import host_cache_info, parse_url
+from keyword_matcher import count_suspicious_keywords, get_default_matcher, is_brand_impersonation
+from prometheus_metrics import CONTENT_TYPE, MetricsRegistry, add_process_metrics
+from scan_aggregation import detection_result, scan_result
+from server_timing import StageHistograms, StageTimer, format_server_timing
+
+MODEL_NAME = "stand-in-keyword-model"
+SERVICE_NAME = "ML Microservice (stand-in)"
+# Paths labelled individually on /metrics; anything else counts as 'other' to bound label cardinality
+METRIC_ENDPOINTS = ('/', '/health', '/info', '/metrics', '/predict', '/detect', '/actuator/health',
+                    '/api/scan', '/api/scan/health', '/api/scan/ml/health', '/api/scan/ml/info')
+
+
+class LatencyModel:
+    """Service-time distribution parsed from a spec string
+
+    none                      no added latency
+    fixed:SECONDS             constant delay
+    lognormal:MEDIAN,SIGMA    log-normal delay with the given median
+    bimodal:FAST,SLOW,P_SLOW  FAST normally, SLOW with probability P_SLOW (cold starts)
+    """
+
+    def __init__(self, spec: str = "none"):
+        self.spec = spec
+        kind, _, params = spec.partition(':')
+        values = [float(value) for value in params.split(',')] if params else []
+        expected = {'none': 0, 'fixed': 1, 'lognormal': 2, 'bimodal': 3}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            return self.values[0]
+        if self.kind == 'lognormal':
+            median, sigma = self.values
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        if self.kind == 'bimodal':
+            fast, slow, p_slow = self.values
+            return slow if rng.random() < p_slow else fast
+        return 0.0
+
+    def __repr__(self) -> str:
+        return f"LatencyModel({self.spec!r})"
+
+
+class StandInConfig:
+    """Behaviour shared by all endpoints of a stand-in server"""
+
+    def __init__(self, latency: str = "none", error_rate: float = 0.0, error_status: int = 500,
+                 padding_bytes: int = 0, seed: Optional[int] = None, boot_time: float = 0.0,
+                 model_load_time: float = 0.0, idle_timeout: Optional[float] = None):
+        self.latency = LatencyModel(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.padding_bytes = padding_bytes
+        self.seed = seed
+        # Cold starts: requests arriving while asleep wait boot_time, then /predict
+        # and /detect answer 503 for model_load_time; idle_timeout puts the server back to sleep
+        self.boot_time = boot_time
+        self.model_load_time = model_load_time
+        self.idle_timeout = idle_timeout
+
+
+def keyword_verdict(url: str) -> Tuple[bool, float]:
+    """Deterministic (malicious, confidence) from the detection keyword lists"""
+    matches = get_default_matcher().matched_patterns(url, ['ml_keyword', 'url_keyword', 'brand_impersonation'])
+    keywords = set().union(*matches.values()) if matches else set()
+    score = 0.15 + 0.4 * len(keywords)
+    if is_brand_impersonation(parse_url(url).registrable_domain):
+        score += 0.3
+    score = min(0.95, score)
+    return score > 0.5, score
+
+
+def predict_response(url: str) -> Dict[str, Any]:
+    """/predict body of the ML microservice"""
+    malicious, score = keyword_verdict(url)
+    label = 'malicious' if malicious else 'safe'
+    return {
+        'url': url,
+        'prediction': label,
+        'label': label,
+        'confidence': round(score if malicious else 1.0 - score, 4),
+        'model': MODEL_NAME
+    }
+
+
+def detect_response(url: str) -> Dict[str, Any]:
+    """/detect body of the Python app microservice"""
+    malicious, score = keyword_verdict(url)
+    return {
+        'url': url,
+        'is_malicious': malicious,
+        'confidence': round(score, 4),
+        'method': "Keyword Heuristics (stand-in)"
+    }
+
+
+def scan_response(url: str) -> Dict[str, Any]:
+    """/api/scan body of the Java backend"""
+    lower_url = url.lower()
+    if not lower_url.startswith(('http://', 'https://')):
+        url = "http://" + url
+    malicious, score = keyword_verdict(url)
+    keyword_count = count_suspicious_keywords(url)
+    domain = parse_url(url).registrable_domain
+    brand_impersonation = is_brand_impersonation(domain)
+    prediction = predict_response(url)
+    results = [
+        detection_result("ML Microservice", prediction['label'] == 'malicious',
+                         f"ML Model: {MODEL_NAME}, Label: {prediction['label']}, "
+                         f"Confidence: {prediction['confidence']:.3f}", prediction['confidence']),
+        detection_result("Python App Microservice", malicious,
+                         f"Keyword Heuristics (stand-in) - Confidence: {score:.3f}", score),
+        detection_result("URL Pattern Analysis", keyword_count > 0,
+                         f"Suspicious keywords: {keyword_count}", min(1.0, 0.1 * keyword_count)),
+        detection_result("Domain Reputation Analysis", brand_impersonation,
+                         f"Domain: {domain}", 0.6 if brand_impersonation else 0.0),
+    ]
+    return scan_result(url, {result['method']: result for result in results})
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes requests to the stand-in endpoints"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "StandIn/1.0"
+    # Headers and body are written separately; without this each keep-alive response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def _instrumented(self, handler):
+        """Run a method handler and record its endpoint, status and latency"""
+        self._status = None
+        start_time = time.perf_counter()
+        try:
+            handler()
+        finally:
+            path = urlsplit(self.path).path.rstrip('/') or '/'
+            endpoint = path if path in METRIC_ENDPOINTS else 'other'
+            self.server.requests_total.inc(endpoint, str(self._status or 0))
+            self.server.request_seconds.observe(time.perf_counter() - start_time, endpoint)
+
+    def _send_json(self, status: int, body: Any, timer: Optional[StageTimer] = None):
+        config = self.server.config
+        if config.padding_bytes and isinstance(body, dict):
+            body = dict(body, padding='x' * config.padding_bytes)
+        if timer is None:
+            payload = json.dumps(body).encode('utf-8')
+        else:
+            with timer.stage('serialize'):
+                payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if timer is not None:
+            durations = timer.durations_ms()
+            self.send_header('Server-Timing', format_server_timing(durations))
+            self.server.stage_timings.record(durations)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_text(self, status: int, text: str, content_type: str = 'text/plain'):
+        payload = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _simulate(self) -> bool:
+        """Apply latency and injected errors; False if an error was sent"""
+        boot_wait = self.server.wake()
+        if boot_wait > 0:
+            time.sleep(boot_wait)
+        delay, failed = self.server.draw()
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            self._send_json(self.server.config.error_status, {'error': "Injected stand-in error"})
+            return False
+        return True
+
+    def do_GET(self):
+        self._instrumented(self._do_get)
+
+    def do_POST(self):
+        self._instrumented(self._do_post)
+
+    def _do_get(self):
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        self.server.count(path)
+        routes = {
+            '/': lambda: {'status': "UP", 'service': "Malicious URL Detector", 'version': "1.0.0",
+                          'message': "AI-powered URL malware detection system"},
+            '/actuator/health': lambda: {'status': "UP", 'timestamp': int(time.time() * 1000)},
+            '/api/scan/ml/health': lambda: {'healthy': True, 'service': "TransformerML"},
+            '/api/scan/ml/info': lambda: {'model_info': self.server.info()},
+            '/info': self.server.info,
+        }
+        if path == '/metrics':
+            self._send_text(200, self.server.metrics.render(), CONTENT_TYPE)
+        elif path == '/api/scan/health':
+            if self._simulate():
+                self._send_text(200, "Malware Detection Service is running")
+        elif path == '/health':
+            if self._simulate():
+                # Not healthy until the model has loaded, so pollers wait out the cold load
+                loaded = self.server.model_loaded()
+                self._send_json(200 if loaded else 503,
+                                {'status': "healthy" if loaded else "loading", 'service': SERVICE_NAME,
+                                 'model_loaded': loaded, 'model': MODEL_NAME, 'device': "cpu"})
+        elif path in routes:
+            if self._simulate():
+                self._send_json(200, routes[path]())
+        else:
+            self._send_json(404, {'error': f"Not found: {path}"})
+
+    def _do_post(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/')
+        timer = StageTimer()
+        # Always drain the body so the keep-alive connection stays usable
+        with timer.stage('parse'):
+            body = self._read_json()
+        self.server.count(path)
+        if path == '/api/scan':
+            url = parse_qs(parts.query).get('url', [''])[0]
+            if not url:
+                self._send_json(400, {'error': "Required request parameter 'url' is not present"})
+            elif self._simulate():
+                self._send_json(200, scan_response(url))
+        elif path in ('/predict', '/detect'):
+            with timer.stage('validate'):
+                url = body.get('url')
+                valid = isinstance(url, str) and bool(url.strip())
+            if not valid:
+                self._send_json(400, {'error': "No URL provided"}, timer)
+                return
+            # Simulated service time stands in for tokenization and the model forward pass
+            with timer.stage('inference'):
+                simulated = self._simulate()
+                if simulated and self.server.model_loaded():
+                    response = predict_response(url) if path == '/predict' else detect_response(url)
+                    self.server.batch_size.observe(1)
+            if not simulated:
+                return
+            if not self.server.model_loaded():
+                self._send_json(503, {'error': "Model not loaded"}, timer)
+                return
+            if parse_qs(parts.query).get('timing', [''])[0].lower() in ('1', 'true'):
+                response['timing'] = timer.durations_ms()
+            self._send_json(200, response, timer)
+        else:
+            self._send_json(404, {'error': f"Not found: {path}"})
+
+
+def _host_parse_cache_hit_ratio() -> Optional[float]:
+    info = host_cache_info()
+    lookups = info.hits + info.misses
+    return info.hits / lookups if lookups else None
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded stand-in HTTP server; port 0 picks a free port"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, config: Optional[StandInConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), StandInHandler)
+        self.config = config or StandInConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.cold_starts = 0
+        self.stage_timings = StageHistograms()
+        self.metrics = MetricsRegistry()
+        self.requests_total = self.metrics.counter('ml_http_requests_total', "HTTP requests by endpoint and status.",
+                                                   ('endpoint', 'status'))
+        self.request_seconds = self.metrics.histogram('ml_http_request_duration_seconds',
+                                                      "HTTP request latency in seconds.", ('endpoint',))
+        self.batch_size = self.metrics.histogram('ml_inference_batch_size', "URLs per model inference call.",
+                                                 buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+        self.metrics.gauge('ml_host_parse_cache_hit_ratio', "Hit ratio of the domain parser's host cache.",
+                           _host_parse_cache_hit_ratio)
+        self.metrics.gauge('ml_model_load_seconds', "Seconds from the last cold start until the model was ready.",
+                           self.model_load_seconds)
+        self.metrics.gauge('ml_model_loaded', "1 when the model is loaded.", lambda: float(self.model_loaded()))
+        add_process_metrics(self.metrics)
+        self._ready_at: Optional[float] = None
+        self._loaded_at = 0.0
+        # Boot plus model load of the last cold start, recorded by wake() when it is scheduled
+        self._load_seconds: Optional[float] = None
+        self._last_request = 0.0
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self) -> Tuple[float, bool]:
+        """Next (delay, failed) from the seeded generator"""
+        with self._lock:
+            delay = self.config.latency.sample(self._rng)
+            failed = self._rng.random() < self.config.error_rate
+        return delay, failed
+
+    def wake(self) -> float:
+        """Register a request; returns how long it must wait for the server to finish booting"""
+        config = self.config
+        with self._lock:
+            now = time.monotonic()
+            idle = self._ready_at is not None and config.idle_timeout is not None and \
+                now - self._last_request > config.idle_timeout
+            if self._ready_at is None or (idle and now >= self._ready_at):
+                self._ready_at = now + config.boot_time
+                self._loaded_at = self._ready_at + config.model_load_time
+                self._load_seconds = self._loaded_at - now
+                if config.boot_time > 0 or config.model_load_time > 0:
+                    self.cold_starts += 1
+            self._last_request = max(now, self._ready_at)
+            return self._ready_at - now
+
+    def model_loaded(self) -> bool:
+        return time.monotonic() >= self._loaded_at
+
+    def model_load_seconds(self) -> Optional[float]:
+        """Seconds the last cold start took to load the model, once it has loaded"""
+        with self._lock:
+            load_seconds, loaded_at = self._load_seconds, self._loaded_at
+        return load_seconds if time.monotonic() >= loaded_at else None
+
+    def count(self, path: str):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'service': SERVICE_NAME,
+            'model_name': MODEL_NAME,
+            'device': "cpu",
+            'max_length': 512,
+            'model_info': {'model_name': MODEL_NAME, 'device': "cpu", 'max_length': 512, 'loaded': self.model_loaded()},
+            'config': {'latency': self.config.latency.spec, 'error_rate': self.config.error_rate,
+                       'boot_time': self.config.boot_time, 'model_load_time': self.config.model_load_time,
+                       'idle_timeout': self.config.idle_timeout},
+            'stage_timings': self.stage_timings.summary()
+        }
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the Java backend and ML microservices")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--ports', default="8080,5001",
+                        help="comma-separated ports to serve on (default: 8080,5001)")
+    parser.add_argument('--latency', default="none",
+                        help="none | fixed:S | lognormal:MEDIAN,SIGMA | bimodal:FAST,SLOW,P_SLOW")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--padding-bytes', type=int, default=0, help="extra bytes added to each JSON response")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--boot-time', type=float, default=0.0,
+                        help="seconds a sleeping server takes to answer its first request")
+    parser.add_argument('--model-load-time', type=float, default=0.0,
+                        help="seconds after boot during which /predict and /detect return 503")
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help="seconds without requests after which the server sleeps again")
+    args = parser.parse_args()
+
+    servers: List[StandInServer] = []
+    for index, port in enumerate(int(port) for port in args.ports.split(',')):
+        seed = args.seed + index if args.seed is not None else None
+        config = StandInConfig(args.latency, args.error_rate, args.error_status, args.padding_bytes, seed,
+                               args.boot_time, args.model_load_time, args.idle_timeout)
+        servers.append(StandInServer(config, args.host, port).start())
+        print(f"✅ Stand-in serving on {servers[-1].url} (latency {args.latency}, error rate {args.error_rate})")
+
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,52 @@ Tests a representative sample from the malicious_phish.csv dataset
 import requests
 import json
 import time
-import csv
+import os
 import random
+import argparse
+import threading
 from datetime import datetime
-from typing import Dict, List, Any
-import sys
+from typing import Dict, List, Any, Optional
+
+from dataset_cache import load_dataset_for
+from dataset_sampler import DATASET_TYPES, StratifiedReservoirSampler
+from latency_histogram import LatencyReport
+from load_generator import LoadGenerator
+from result_sink import ResultSink, iter_results, write_csv
+from run_checkpoint import RUNS_DIR, RunCheckpoint, new_run_id
+from saturation_sweep import SaturationSweep
 
 class MaliciousPhishTester:
+    # File name prefix for saved results
+    output_prefix = "malicious_phish_test"
+    # Summary CSV columns, built from the streamed results
+    csv_columns = [
+        ('URL', lambda result: result['url']),
+        ('Expected Type', lambda result: result['expected_type']),
+        ('Expected Malicious', lambda result: result['expected_malicious']),
+        ('Success', lambda result: result['success']),
+        ('Response Time', lambda result: result['response_time']),
+        ('Status Code', lambda result: result['status_code']),
+        ('Enhanced Content Analysis', lambda result: result['enhanced_content_analysis_found']),
+        ('Detection Methods Count', lambda result: len(result['detection_methods'])),
+        ('Malicious Detections', lambda result: result['malicious_detections']),
+        ('Overall Malicious', lambda result: result['overall_malicious']),
+        ('Detection Correct', lambda result: result['detection_correct']),
+        ('Error', lambda result: result['error'] or '')
+    ]
+    
     def __init__(self, base_url: str = "http://localhost:8080"):
         self.base_url = base_url
-        self.results = []
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self.output_dir = "."
+        self.timestamp = None
+        self.sink = None
+        self.checkpoint = None
+        self.checkpoint_interval = 50
+        self.completed = set()
+        self.run_total = 0
+        self.latency = LatencyReport(group_label='type')
         self.stats = {
             'total_tests': 0,
             'successful_tests': 0,
@@ -34,41 +70,33 @@ class MaliciousPhishTester:
             }
         }
     
-    def load_dataset_sample(self, filename: str = "src/main/resources/malicious_phish.csv", sample_size: int = 1000):
-        """Load a representative sample from the dataset"""
+    def load_dataset_sample(self, filename: str = "src/main/resources/malicious_phish.csv", sample_size: int = 1000,
+                            seed: Optional[int] = None, quotas: Optional[Dict[str, int]] = None,
+                            proportional: bool = False, use_cache: bool = True):
+        """Load a representative sample from the dataset
+        
+        Rows are drawn uniformly from the whole file with a stratified
+        reservoir sampler (one pass, bounded memory).  By default each type
+        gets sample_size // 4 rows; quotas sets explicit per-type counts and
+        proportional follows the type mix of the file.  Pass a seed to draw
+        the same sample again.  With use_cache the sample is drawn from the
+        compiled dataset cache (see dataset_cache.py) instead of the CSV.
+        """
         print(f"📊 Loading sample of {sample_size} URLs from {filename}...")
         
-        test_cases = []
-        type_counts = {'phishing': 0, 'malware': 0, 'defacement': 0, 'benign': 0}
-        target_per_type = sample_size // 4  # Equal distribution
+        if seed is None:
+            seed = random.randrange(2 ** 32)
         
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for row in reader:
-                    url = row.get('url', '').strip()
-                    url_type = row.get('type', '').strip().lower()
-                    
-                    # Skip invalid entries
-                    if not url or not url_type or url_type not in type_counts:
-                        continue
-                    
-                    # Add http:// if missing
-                    if not url.startswith(('http://', 'https://')):
-                        url = 'http://' + url
-                    
-                    # Sample based on type quotas
-                    if type_counts[url_type] < target_per_type:
-                        test_cases.append({
-                            'url': url,
-                            'type': url_type
-                        })
-                        type_counts[url_type] += 1
-                    
-                    # Stop if we have enough samples
-                    if len(test_cases) >= sample_size:
-                        break
+            sampler = StratifiedReservoirSampler(sample_size=sample_size, quotas=quotas,
+                                                 proportional=proportional, seed=seed)
+            if use_cache:
+                with load_dataset_for(filename, verbose=True) as dataset:
+                    labels, label_names = dataset.labels, dataset.label_names
+                    sampled = sampler.sample_items((index, label_names[labels[index]]) for index in dataset.rows(filename))
+                    test_cases = [{'url': dataset.url(index), 'type': url_type} for index, url_type in sampled]
+            else:
+                test_cases = sampler.sample_csv(filename)
         
         except FileNotFoundError:
             print(f"❌ Dataset file '{filename}' not found!")
@@ -77,19 +105,31 @@ class MaliciousPhishTester:
             print(f"❌ Error reading dataset: {e}")
             return []
         
-        print(f"✅ Loaded {len(test_cases)} test cases:")
+        type_counts = {url_type: 0 for url_type in DATASET_TYPES}
+        for test_case in test_cases:
+            type_counts[test_case['type']] += 1
+        
+        self.stats['sample'] = {
+            'filename': filename,
+            'seed': seed,
+            'proportional': proportional,
+            'quotas': quotas,
+            'rows_by_type': sampler.type_counts()
+        }
+        
+        print(f"✅ Loaded {len(test_cases)} test cases (seed {seed}):")
         for url_type, count in type_counts.items():
             print(f"   {url_type}: {count}")
         
         return test_cases
     
-    def test_url(self, url: str, expected_type: str) -> Dict[str, Any]:
-        """Test a single URL and return detailed results"""
+    def test_url(self, url: str, expected_type: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+        """Test a single URL and return detailed results (over `session`, default the tester's own)"""
         start_time = time.time()
         
         try:
             # Make the API call
-            response = requests.post(
+            response = (session or self.session).post(
                 f"{self.base_url}/api/scan",
                 params={'url': url},
                 headers={'Content-Type': 'application/json'},
@@ -134,27 +174,6 @@ class MaliciousPhishTester:
                     'error': None
                 }
                 
-                # Update statistics
-                self.stats['successful_tests'] += 1
-                self.stats['total_response_time'] += response_time
-                if enhanced_content_found:
-                    self.stats['enhanced_content_analysis_found'] += 1
-                if overall_malicious:
-                    self.stats['malicious_detected'] += 1
-                else:
-                    self.stats['safe_detected'] += 1
-                
-                # Update type-specific statistics
-                if expected_type in self.stats['by_type']:
-                    self.stats['by_type'][expected_type]['total'] += 1
-                    if detection_correct:
-                        if expected_malicious:
-                            self.stats['by_type'][expected_type]['detected'] += 1
-                        else:
-                            self.stats['by_type'][expected_type]['detected'] += 1
-                    else:
-                        self.stats['by_type'][expected_type]['missed'] += 1
-                
             else:
                 result = {
                     'url': url,
@@ -171,7 +190,6 @@ class MaliciousPhishTester:
                     'detection_results': {},
                     'error': f"HTTP {response.status_code}: {response.text}"
                 }
-                self.stats['failed_tests'] += 1
                 
         except Exception as e:
             response_time = time.time() - start_time
@@ -190,26 +208,169 @@ class MaliciousPhishTester:
                 'detection_results': {},
                 'error': str(e)
             }
-            self.stats['failed_tests'] += 1
         
-        self.stats['total_tests'] += 1
+        self._update_stats(result, response_time)
         return result
     
-    def run_dataset_test(self, sample_size: int = 1000):
-        """Run test on the malicious phish dataset"""
+    def _update_stats(self, result: Dict[str, Any], response_time: float):
+        """Fold a single result into the running statistics (thread-safe)"""
+        with self._lock:
+            if result['success']:
+                self.stats['successful_tests'] += 1
+                self.stats['total_response_time'] += response_time
+                if result['enhanced_content_analysis_found']:
+                    self.stats['enhanced_content_analysis_found'] += 1
+                if result['overall_malicious']:
+                    self.stats['malicious_detected'] += 1
+                else:
+                    self.stats['safe_detected'] += 1
+                
+                # Update type-specific statistics
+                expected_type = result['expected_type']
+                if expected_type in self.stats['by_type']:
+                    self.stats['by_type'][expected_type]['total'] += 1
+                    if result['detection_correct']:
+                        self.stats['by_type'][expected_type]['detected'] += 1
+                    else:
+                        self.stats['by_type'][expected_type]['missed'] += 1
+            else:
+                self.stats['failed_tests'] += 1
+            
+            self.stats['total_tests'] += 1
+    
+    def run_dataset_test(self, sample_size: int = 1000, concurrency: int = 1, rps: Optional[float] = None,
+                         seed: Optional[int] = None, quotas: Optional[Dict[str, int]] = None,
+                         proportional: bool = False, use_cache: bool = True, run_id: Optional[str] = None,
+                         resume: bool = False):
+        """Run test on the malicious phish dataset
+        
+        With the defaults URLs are sent one at a time with a short pause in
+        between.  Setting concurrency above 1 or a target rps switches to the
+        load-generation mode (see run_load_test).  Every run is checkpointed
+        under .runs/<run_id>/; with resume the named run continues where it
+        stopped, skipping URLs already scored (sampling arguments,
+        concurrency and rps are then taken from the saved run).
+        """
         print("🚀 Starting Malicious Phish Dataset Test")
         print("=" * 60)
         
-        # Load test dataset
-        test_cases = self.load_dataset_sample(sample_size=sample_size)
-        if not test_cases:
-            print("❌ No test cases found. Exiting.")
-            return
+        if resume:
+            test_cases = self.resume_run(run_id)
+            if self.checkpoint is None:
+                return
+            params = self.checkpoint.load_manifest()['params']
+            concurrency, rps = params.get('concurrency', concurrency), params.get('rps', rps)
+        else:
+            # Load test dataset
+            test_cases = self.load_dataset_sample(sample_size=sample_size, seed=seed, quotas=quotas,
+                                                  proportional=proportional, use_cache=use_cache)
+            if not test_cases:
+                print("❌ No test cases found. Exiting.")
+                return
+            
+            params = {'base_url': self.base_url, 'sample_size': sample_size, 'seed': seed, 'quotas': quotas,
+                      'proportional': proportional, 'concurrency': concurrency, 'rps': rps,
+                      'sample': self.stats['sample']}
+            try:
+                self.start_run(test_cases, params, run_id)
+            except FileExistsError as e:
+                print(f"❌ {e}. Use --resume to continue it.")
+                return
         
         print(f"📊 Testing {len(test_cases)} URLs from malicious_phish.csv")
         print()
         
-        # Test each URL
+        try:
+            if concurrency > 1 or rps is not None:
+                self.run_load_test(test_cases, concurrency, rps)
+            else:
+                self.run_sequential_test(test_cases)
+        except BaseException:
+            self.save_checkpoint("interrupted")
+            print(f"⏸️  Run interrupted; resume with --resume {self.checkpoint.run_id}")
+            raise
+        self.save_checkpoint("complete")
+        
+        # Calculate final statistics
+        if self.stats['successful_tests'] > 0:
+            self.stats['average_response_time'] = self.stats['total_response_time'] / self.stats['successful_tests']
+        self.stats['latency'] = self.latency.summary()
+        
+        # Print comprehensive results
+        self.print_dataset_results()
+        
+        # Save results to files
+        self.save_results()
+    
+    def open_results(self):
+        """Start streaming results to the run's results file (or a timestamped JSONL file)"""
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.checkpoint is not None:
+            results_file = self.checkpoint.results_file
+        else:
+            results_file = os.path.join(self.output_dir, f"{self.output_prefix}_results_{self.timestamp}.jsonl")
+        self.sink = ResultSink(results_file, group_key='expected_type', resume=self.checkpoint is not None)
+    
+    def record_result(self, result: Dict[str, Any], test_case: Optional[Dict[str, Any]] = None):
+        """Append a finished result to the results file, checkpointing every checkpoint_interval results"""
+        if test_case is not None and 'index' in test_case:
+            result['sample_index'] = test_case['index']
+        if self.sink is None:
+            self.open_results()
+        self.sink.write(result)
+        
+        if self.checkpoint is not None and 'sample_index' in result:
+            self.completed.add(result['sample_index'])
+            if len(self.completed) % self.checkpoint_interval == 0:
+                self.save_checkpoint()
+    
+    def save_checkpoint(self, status: str = "running"):
+        if self.checkpoint is not None:
+            # Results must be on disk before the checkpoint claims them
+            self.sink.flush()
+            self.checkpoint.save(self.completed, self.run_total, status)
+    
+    def start_run(self, test_cases: List[Dict[str, Any]], params: Dict[str, Any], run_id: Optional[str] = None):
+        """Create a checkpointed run for a freshly drawn sample"""
+        for index, test_case in enumerate(test_cases):
+            test_case['index'] = index
+        self.checkpoint = RunCheckpoint(run_id or new_run_id(), os.path.join(self.output_dir, RUNS_DIR))
+        self.checkpoint.create(test_cases, params)
+        self.run_total = len(test_cases)
+        self.open_results()
+        print(f"🔖 Run ID: {self.checkpoint.run_id} (resume with --resume {self.checkpoint.run_id})")
+    
+    def resume_run(self, run_id: str) -> List[Dict[str, Any]]:
+        """Reload a run, fold its scored results into the statistics and return what is left
+        
+        Failed results (connection errors, 5xx during a cold start) are
+        dropped and retried.
+        """
+        checkpoint = RunCheckpoint(run_id, os.path.join(self.output_dir, RUNS_DIR))
+        if not checkpoint.exists():
+            print(f"❌ No run {run_id} found in {checkpoint.run_dir}")
+            return []
+        checkpoint.prune_failed()
+        
+        self.checkpoint = checkpoint
+        test_cases = checkpoint.load_sample()
+        sample = checkpoint.load_manifest()['params'].get('sample')
+        if sample is not None:
+            self.stats['sample'] = sample
+        self.run_total = len(test_cases)
+        self.open_results()
+        for result in iter_results(checkpoint.results_file):
+            self.completed.add(result['sample_index'])
+            self._update_stats(result, result['response_time'])
+            self.latency.record(result['expected_type'], result.get('latency', result['response_time']))
+        
+        remaining = checkpoint.remaining(test_cases, self.completed)
+        print(f"♻️  Resuming run {run_id}: {len(self.completed)}/{len(test_cases)} URLs already scored, "
+              f"{len(remaining)} remaining")
+        return remaining
+    
+    def run_sequential_test(self, test_cases: List[Dict[str, str]]):
+        """Test each URL in turn, pausing between requests"""
         for i, test_case in enumerate(test_cases, 1):
             url = test_case['url']
             url_type = test_case['type']
@@ -217,8 +378,11 @@ class MaliciousPhishTester:
             print(f"Testing {i}/{len(test_cases)}: {url[:60]}...")
             print(f"  Type: {url_type}")
             
+            request_start = time.perf_counter()
             result = self.test_url(url, url_type)
-            self.results.append(result)
+            result['latency'] = round(time.perf_counter() - request_start, 6)
+            self.latency.record(url_type, result['latency'])
+            self.record_result(result, test_case)
             
             # Print result summary
             if result['success']:
@@ -233,16 +397,54 @@ class MaliciousPhishTester:
             
             # Small delay to avoid overwhelming the server
             time.sleep(0.1)
+    
+    def run_load_test(self, test_cases: List[Dict[str, str]], concurrency: int = 10, rps: Optional[float] = None):
+        """Test URLs concurrently over a shared keep-alive connection pool
         
-        # Calculate final statistics
-        if self.stats['successful_tests'] > 0:
-            self.stats['average_response_time'] = self.stats['total_response_time'] / self.stats['successful_tests']
+        rps=None keeps `concurrency` requests in flight at all times
+        (closed-loop).  A target rps sends requests on a fixed schedule
+        (open-loop); the time a request waited past its scheduled send time
+        is recorded as queue_time so client-side backlog is not hidden.
+        """
+        mode = f"open-loop at {rps:g} req/s" if rps is not None else "closed-loop"
+        print(f"⚡ Load mode: {concurrency} workers, {mode}")
+        print()
         
-        # Print comprehensive results
-        self.print_dataset_results()
+        with LoadGenerator(concurrency=concurrency, rps=rps) as generator:
+            def worker(test_case):
+                return self.test_url(test_case['url'], test_case['type'], generator.session)
+            
+            wall_start = time.perf_counter()
+            
+            for completed, entry in enumerate(generator.run(test_cases, worker), 1):
+                result = entry.result
+                if isinstance(result, Exception):
+                    # test_url handles request errors itself; anything here is a bug
+                    raise result
+                result['queue_time'] = round(entry.started - entry.scheduled, 3)
+                # End-to-end latency counts from the scheduled send time
+                result['latency'] = round(entry.finished - entry.scheduled, 6)
+                self.latency.record(entry.item['type'], result['latency'])
+                self.record_result(result, entry.item)
+                
+                if result['success']:
+                    malicious = "🔴 MALICIOUS" if result['overall_malicious'] else "🟢 SAFE"
+                    correct = "✅ CORRECT" if result['detection_correct'] else "❌ WRONG"
+                    print(f"[{completed}/{len(test_cases)}] {malicious} | {correct} | {result['response_time']}s | {entry.item['url'][:60]}")
+                else:
+                    print(f"[{completed}/{len(test_cases)}] ❌ FAILED: {result['error']} | {entry.item['url'][:60]}")
+            
+            wall_time = time.perf_counter() - wall_start
         
-        # Save results to files
-        self.save_results()
+        self.stats['load'] = {
+            'concurrency': concurrency,
+            'target_rps': rps,
+            'wall_time': round(wall_time, 3),
+            'achieved_rps': round(len(test_cases) / wall_time, 2) if wall_time > 0 else 0
+        }
+        print()
+        print(f"⏱️  {len(test_cases)} requests in {wall_time:.2f}s ({self.stats['load']['achieved_rps']} req/s achieved)")
+        print()
     
     def print_dataset_results(self):
         """Print comprehensive test results"""
@@ -272,6 +474,12 @@ class MaliciousPhishTester:
         print(f"Total Response Time: {self.stats['total_response_time']:.3f}s")
         print()
         
+        # Latency percentiles
+        print("⏱️  LATENCY PERCENTILES")
+        print("-" * 60)
+        self.latency.print_report()
+        print()
+        
         # Results by type
         print("📊 RESULTS BY TYPE")
         print("-" * 60)
@@ -298,70 +506,79 @@ class MaliciousPhishTester:
         # Detection methods analysis
         print("🔍 DETECTION METHODS ANALYSIS")
         print("-" * 40)
-        method_counts = {}
-        for result in self.results:
-            if result['success']:
-                for method in result['detection_methods']:
-                    method_counts[method] = method_counts.get(method, 0) + 1
-        
+        method_counts = self.sink.method_counts if self.sink is not None else {}
         for method, count in sorted(method_counts.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / self.stats['successful_tests'] * 100)
             print(f"{method:30} | {count:3} times ({percentage:5.1f}%)")
     
     def save_results(self):
-        """Save results to CSV and JSON files"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """Save statistics to JSON and the streamed results to CSV"""
+        if self.sink is None:
+            self.open_results()
+        self.sink.close()
+        timestamp = self.timestamp
         
-        # Save detailed results to JSON
-        json_filename = f"malicious_phish_test_results_{timestamp}.json"
+        # Save statistics to JSON; per-URL results are already in the JSONL file
+        json_filename = os.path.join(self.output_dir, f"{self.output_prefix}_statistics_{timestamp}.json")
         with open(json_filename, 'w') as f:
             json.dump({
                 'timestamp': datetime.now().isoformat(),
                 'statistics': self.stats,
-                'results': self.results
+                'results_file': os.path.basename(self.sink.filename)
             }, f, indent=2)
         
-        # Save summary to CSV
-        csv_filename = f"malicious_phish_test_summary_{timestamp}.csv"
-        with open(csv_filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'URL', 'Expected Type', 'Expected Malicious', 'Success', 'Response Time', 'Status Code',
-                'Enhanced Content Analysis', 'Detection Methods Count', 'Malicious Detections',
-                'Overall Malicious', 'Detection Correct', 'Error'
-            ])
-            
-            for result in self.results:
-                writer.writerow([
-                    result['url'],
-                    result['expected_type'],
-                    result['expected_malicious'],
-                    result['success'],
-                    result['response_time'],
-                    result['status_code'],
-                    result['enhanced_content_analysis_found'],
-                    len(result['detection_methods']),
-                    result['malicious_detections'],
-                    result['overall_malicious'],
-                    result['detection_correct'],
-                    result['error'] or ''
-                ])
+        # Save summary to CSV, streamed from the results file
+        csv_filename = os.path.join(self.output_dir, f"{self.output_prefix}_summary_{timestamp}.csv")
+        write_csv(self.sink.filename, csv_filename, self.csv_columns)
+        
+        # Save latency histograms and percentiles
+        latency_json_filename = os.path.join(self.output_dir, f"{self.output_prefix}_latency_{timestamp}.json")
+        latency_csv_filename = os.path.join(self.output_dir, f"{self.output_prefix}_latency_{timestamp}.csv")
+        self.latency.save(latency_json_filename, latency_csv_filename)
         
         print(f"💾 Results saved to:")
-        print(f"   JSON: {json_filename}")
+        print(f"   Results: {self.sink.filename}")
+        print(f"   Statistics: {json_filename}")
         print(f"   CSV:  {csv_filename}")
+        print(f"   Latency: {latency_json_filename}, {latency_csv_filename}")
 
 def main():
     """Main function"""
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
-    else:
-        base_url = "http://localhost:8080"
+    parser = argparse.ArgumentParser(description="Test a sample of malicious_phish.csv against /api/scan")
+    parser.add_argument('base_url', nargs='?', default="http://localhost:8080")
+    parser.add_argument('sample_size', nargs='?', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="number of concurrent requests (default: 1, sequential)")
+    parser.add_argument('--rps', type=float, default=None,
+                        help="target request rate for open-loop load (default: unthrottled)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="random seed for a reproducible sample")
+    parser.add_argument('--proportional', action='store_true',
+                        help="sample types in proportion to the dataset instead of equally")
+    parser.add_argument('--quota', action='append', default=[], metavar='TYPE=COUNT',
+                        help="explicit per-type sample size, e.g. --quota phishing=500 (repeatable)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the CSV directly instead of using the compiled dataset cache")
+    parser.add_argument('--run-id', default=None,
+                        help="name for this run's checkpoint directory (default: a timestamp)")
+    parser.add_argument('--resume', default=None, metavar='RUN_ID',
+                        help="continue an interrupted run, skipping URLs already scored")
+    parser.add_argument('--sweep', action='store_true',
+                        help="find the maximum sustainable request rate instead of scoring the sample "
+                             "(starts at --rps, default 5; see saturation_sweep.py for all options)")
+    args = parser.parse_args()
+    
+    quotas = None
+    if args.quota:
+        quotas = {}
+        for quota in args.quota:
+            url_type, _, count = quota.partition('=')
+            if url_type not in DATASET_TYPES or not count.isdigit():
+                parser.error(f"invalid --quota '{quota}' (expected one of {', '.join(DATASET_TYPES)}=COUNT)")
+            quotas[url_type] = int(count)
     
-    if len(sys.argv) > 2:
-        sample_size = int(sys.argv[2])
-    else:
-        sample_size = 1000  # Default sample size
+    base_url = args.base_url
+    sample_size = args.sample_size
     
     print(f"🎯 Testing against: {base_url}")
     print(f"📊 Sample size: {sample_size} URLs")
@@ -378,9 +595,25 @@ def main():
         print("Make sure the server is running with: ./run.sh start")
         return
     
-    # Run dataset test
     tester = MaliciousPhishTester(base_url)
-    tester.run_dataset_test(sample_size)
+    if args.sweep:
+        test_cases = tester.load_dataset_sample(sample_size=sample_size, seed=args.seed, quotas=quotas,
+                                                proportional=args.proportional, use_cache=not args.no_cache)
+        if not test_cases:
+            return
+        print()
+        sweep = SaturationSweep(tester, test_cases, concurrency=max(args.concurrency, 64))
+        report = sweep.run(start_rps=args.rps or 5.0)
+        SaturationSweep.print_report(report, start_option='--rps', max_option=None)
+        json_filename, csv_filename = SaturationSweep.save(report)
+        print(f"💾 Results saved to: {json_filename}, {csv_filename}")
+        return
+    
+    # Run dataset test
+    tester.run_dataset_test(sample_size, concurrency=args.concurrency, rps=args.rps,
+                            seed=args.seed, quotas=quotas, proportional=args.proportional,
+                            use_cache=not args.no_cache, run_id=args.resume or args.run_id,
+                            resume=args.resume is not None)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,10 +4,14 @@ Test script to check the status of all microservices
 """
 
 import requests
+import argparse
 import json
 import time
 from datetime import datetime
 
+from health_monitor import (DEFAULT_CAPACITY, DEFAULT_COLD_START_THRESHOLD, RING_FILE, HealthMonitor, RingBuffer,
+                            build_report, print_report)
+
 # Microservice URLs
 MICROSERVICES = {
     "Python ML Microservice": "https://python-ml-microservice.onrender.com",
@@ -100,14 +104,69 @@ def test_microservice(name, base_url):
     
     return results
 
+def monitor_microservices(services, args):
+    """Probe all services concurrently on an interval, then report from the ring buffer"""
+    with RingBuffer(args.ring_file, args.capacity) as ring:
+        if not args.report:
+            print("🚀 Microservices Health Monitor")
+            print("=" * 50)
+            print(f"Probing {len(services)} services every {args.interval:g}s, recording to {ring.filename} "
+                  f"({len(ring)}/{ring.capacity} probes stored)")
+            monitor = HealthMonitor(services, ring, interval=args.interval, timeout=args.timeout,
+                                    cold_start_threshold=args.cold_start_threshold)
+            try:
+                monitor.run(rounds=args.rounds, duration=args.duration)
+            finally:
+                monitor.close()
+        
+        report = build_report(ring, window=args.window)
+    
+    print_report(report)
+    report_filename = f"health_monitor_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_filename, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to: {report_filename}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Check the status of all microservices")
+    parser.add_argument('--service', action='append', default=[], metavar='NAME=URL',
+                        help="service to check instead of the Render deployments (repeatable)")
+    parser.add_argument('--monitor', action='store_true',
+                        help="probe continuously and record latency history")
+    parser.add_argument('--report', action='store_true',
+                        help="only report from the recorded history")
+    parser.add_argument('--interval', type=float, default=60.0, help="seconds between monitor rounds")
+    parser.add_argument('--rounds', type=int, default=None, help="stop after this many rounds")
+    parser.add_argument('--duration', type=float, default=None, help="stop after this many seconds")
+    parser.add_argument('--timeout', type=float, default=90.0, help="per-probe timeout in seconds")
+    parser.add_argument('--cold-start-threshold', type=float, default=DEFAULT_COLD_START_THRESHOLD,
+                        help="successful probes slower than this count as cold starts")
+    parser.add_argument('--ring-file', default=RING_FILE)
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                        help="probes kept in a new ring file before the oldest are overwritten")
+    parser.add_argument('--window', type=float, default=3600.0, help="report window in seconds")
+    args = parser.parse_args()
+    
+    services = MICROSERVICES
+    if args.service:
+        services = {}
+        for service in args.service:
+            name, _, url = service.partition('=')
+            if not name or not url:
+                parser.error(f"invalid --service '{service}' (expected NAME=URL)")
+            services[name] = url
+    
+    if args.monitor or args.report:
+        monitor_microservices(services, args)
+        return
+    
     print("🚀 Microservices Status Check")
     print("=" * 50)
     print(f"Timestamp: {datetime.now().isoformat()}")
     
     all_results = {}
     
-    for name, url in MICROSERVICES.items():
+    for name, url in services.items():
         results = test_microservice(name, url)
         all_results[name] = results
         
@@ -136,9 +195,9 @@ def main():
         else:
             print(f"❌ {name}: DOWN")
     
-    print(f"\nOverall Status: {up_count}/{len(MICROSERVICES)} UP")
+    print(f"\nOverall Status: {up_count}/{len(services)} UP")
     
-    if up_count == len(MICROSERVICES):
+    if up_count == len(services):
         print("🎉 All microservices are running!")
     elif up_count > 0:
         print("⚠️  Some microservices are down")
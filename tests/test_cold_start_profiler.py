@@ -0,0 +1,83 @@
+"""
+Unit tests for the cold-start profiler
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cold_start_profiler import CLIENT_TIMEOUTS, ColdStartProfiler, build_report, save_report
+from stand_in_servers import StandInConfig, StandInServer, predict_response
+
+class TestColdStartProfiler(unittest.TestCase):
+    """Test cases for cold-start trials against spinning-down stand-ins"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Load the keyword and suffix lists so the first /predict is not slowed by it
+        predict_response("https://www.google.com")
+
+    def setUp(self):
+        config = StandInConfig(boot_time=0.3, model_load_time=0.2, idle_timeout=0.4)
+        self.server = StandInServer(config).start()
+        self.addCleanup(self.server.stop)
+        self.profiler = ColdStartProfiler({"App": self.server.url}, {"App": '/detect'}, poll_interval=0.05,
+                                          timeout=5, cold_start_threshold=0.25)
+
+    def test_cold_trial(self):
+        """Test TTFB covers the boot and first inference waits for the model"""
+        trial = self.profiler.measure("App", 0)
+
+        self.assertTrue(trial['cold'])
+        self.assertIsNone(trial['error'])
+        self.assertGreaterEqual(trial['ttfb'], 0.3)
+        self.assertGreaterEqual(trial['time_to_healthy'], 0.5)
+        self.assertGreaterEqual(trial['time_to_first_inference'], trial['time_to_healthy'])
+        self.assertLess(trial['time_to_first_inference'], 1.5)
+        self.assertGreater(self.server.request_counts['/detect'], 0)
+        self.assertNotIn('/predict', self.server.request_counts)
+
+    def test_idle_periods_and_report(self):
+        """Test short idles stay warm, long ones go cold, and the report says so"""
+        trials = self.profiler.profile_service("App", [0.1, 0.8], trials=2, verbose=False)
+        report = build_report(trials)['services']["App"]
+
+        self.assertEqual([trial['cold'] for trial in trials], [False, False, True, True])
+        self.assertEqual(report['by_idle']['0.1']['cold'], 0)
+        self.assertEqual(report['by_idle']['0.8']['cold'], 2)
+        self.assertEqual(report['shortest_cold_idle'], 0.8)
+        self.assertEqual(report['longest_warm_idle'], 0.1)
+        self.assertGreaterEqual(report['suggested_timeout'], 1)
+        self.assertIsNone(report['client_timeout'])
+        self.assertEqual(report['overall']['ttfb']['count'], 4)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_filename, csv_filename = save_report(build_report(trials), trials, tmp, "test")
+            with open(csv_filename) as f:
+                self.assertEqual(len(f.readlines()), 5)
+            self.assertTrue(os.path.exists(json_filename))
+
+    def test_unreachable_service(self):
+        """Test a service that never answers times out with an error"""
+        profiler = ColdStartProfiler({"Dead": "http://127.0.0.1:1"}, poll_interval=0.05, timeout=0.3)
+        trial = profiler.measure("Dead", 0)
+
+        self.assertTrue(trial['cold'])
+        self.assertIsNone(trial['ttfb'])
+        self.assertIsNone(trial['time_to_healthy'])
+        self.assertIn("/health", trial['error'])
+        self.assertEqual(build_report([trial])['services']["Dead"]['overall']['ttfb']['timeouts'], 1)
+
+    def test_client_timeout(self):
+        """Test Render deployments are reported with the Java timeout that waits on them"""
+        trial = ColdStartProfiler({"Dead": "http://127.0.0.1:1"}, poll_interval=0.05, timeout=0.1).measure("Dead", 0)
+        trial['service'] = "Python ML Microservice"
+        report = build_report([trial])['services']["Python ML Microservice"]
+
+        self.assertEqual(report['client_timeout'], CLIENT_TIMEOUTS["Python ML Microservice"])
+        self.assertIsNone(report['suggested_timeout'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Unit tests for the compiled dataset cache
+"""
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_cache import load_dataset, parse_tagged_url_list
+
+class TestDatasetCache(unittest.TestCase):
+    """Test cases for compiling and loading the dataset cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.csv_file = os.path.join(self.tmp.name, 'phish.csv')
+        self.txt_file = os.path.join(self.tmp.name, 'urls.txt')
+
+        with open(self.csv_file, 'w') as f:
+            f.write("url,type\n")
+            f.write("br-icloud.com.br,phishing\n")
+            f.write("https://mp3raid.com/music/krizz_kaliko.html,benign\n")
+            f.write("http://www.garage-pirenne.be/index.php,defacement\n")
+            f.write("unknown-type.com,spam\n")
+
+        with open(self.txt_file, 'w') as f:
+            f.write("# Safe URLs (should be classified as safe)\n")
+            f.write("https://google.com\n\n")
+            f.write("# URL shortening services (should be flagged)\n")
+            f.write("https://bit.ly/test\n")
+            f.write("## Adversarial/Edge Cases\n")
+            f.write("http://www.goog1e.com (typosquatting)\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test URLs, labels and categories survive compilation"""
+        with load_dataset([self.csv_file, self.txt_file], self.cache_dir) as dataset:
+            self.assertEqual(len(dataset), 6)
+
+            csv_rows = [(dataset.url(i), dataset.label(i)) for i in dataset.rows(self.csv_file)]
+            self.assertEqual(csv_rows, [
+                ('http://br-icloud.com.br', 'phishing'),
+                ('https://mp3raid.com/music/krizz_kaliko.html', 'benign'),
+                ('http://www.garage-pirenne.be/index.php', 'defacement'),
+            ])
+
+            txt_rows = [(dataset.url(i), dataset.category(i), dataset.label(i)) for i in dataset.rows(self.txt_file)]
+            self.assertEqual(txt_rows, [
+                ('https://google.com', 'safe', 'benign'),
+                ('https://bit.ly/test', 'url_shortener', 'malicious'),
+                ('http://www.goog1e.com', 'adversarial', 'unknown'),
+            ])
+
+    def test_rebuilt_only_when_source_changes(self):
+        """Test the cache file is reused until a source file changes"""
+        with load_dataset([self.txt_file], self.cache_dir) as dataset:
+            first = dataset.filename
+        with load_dataset([self.txt_file], self.cache_dir) as dataset:
+            self.assertEqual(dataset.filename, first)
+
+        time.sleep(0.01)
+        with open(self.txt_file, 'a') as f:
+            f.write("https://example.org\n")
+
+        with load_dataset([self.txt_file], self.cache_dir) as dataset:
+            self.assertNotEqual(dataset.filename, first)
+            self.assertEqual(dataset.url(len(dataset) - 1), 'https://example.org')
+        self.assertFalse(os.path.exists(first))
+
+    def test_other_source_sets_kept(self):
+        """Test a rebuild only prunes caches of the same source set"""
+        with load_dataset([self.csv_file], self.cache_dir) as dataset:
+            csv_cache = dataset.filename
+        with load_dataset([self.txt_file], self.cache_dir) as dataset:
+            txt_cache = dataset.filename
+
+        time.sleep(0.01)
+        with open(self.txt_file, 'a') as f:
+            f.write("https://example.org\n")
+        with load_dataset([self.txt_file], self.cache_dir):
+            pass
+        self.assertTrue(os.path.exists(csv_cache))
+        self.assertFalse(os.path.exists(txt_cache))
+
+    def test_parse_tagged_url_list(self):
+        """Test comment headers set the category of following URLs"""
+        test_cases = parse_tagged_url_list(self.txt_file)
+
+        self.assertEqual([test_case['category'] for test_case in test_cases], ['safe', 'url_shortener', 'adversarial'])
+
+if __name__ == '__main__':
+    unittest.main()
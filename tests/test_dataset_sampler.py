@@ -0,0 +1,97 @@
+"""
+Unit tests for the stratified reservoir sampler
+"""
+import unittest
+import csv
+import os
+import sys
+import random
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_sampler import StratifiedReservoirSampler, Reservoir
+
+class TestStratifiedReservoirSampler(unittest.TestCase):
+    """Test cases for StratifiedReservoirSampler"""
+
+    def setUp(self):
+        # 90% benign, 10% phishing, interleaved through the "file"
+        self.rows = [(f"site{i}.com/page", 'phishing' if i % 10 == 0 else 'benign') for i in range(20000)]
+
+    def test_equal_quotas_by_default(self):
+        """Test each type gets sample_size // 4 rows"""
+        sample = StratifiedReservoirSampler(sample_size=400, seed=1).sample_rows(self.rows)
+        counts = Counter(test_case['type'] for test_case in sample)
+
+        self.assertEqual(counts['benign'], 100)
+        self.assertEqual(counts['phishing'], 100)
+        self.assertTrue(all(test_case['url'].startswith('http://') for test_case in sample))
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed draws the same sample and a new seed a different one"""
+        first = StratifiedReservoirSampler(sample_size=200, seed=42).sample_rows(self.rows)
+        second = StratifiedReservoirSampler(sample_size=200, seed=42).sample_rows(self.rows)
+        third = StratifiedReservoirSampler(sample_size=200, seed=43).sample_rows(self.rows)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+
+    def test_sample_is_not_biased_to_file_start(self):
+        """Test samples come from the whole file, not just the first rows"""
+        sample = StratifiedReservoirSampler(quotas={'benign': 500}, seed=7).sample_rows(self.rows)
+        positions = [int(test_case['url'][len('http://site'):].split('.')[0]) for test_case in sample]
+
+        self.assertEqual(len(sample), 500)
+        self.assertGreater(max(positions), 15000)
+        self.assertLess(min(positions), 5000)
+
+    def test_proportional_sampling(self):
+        """Test proportional sampling follows the type mix"""
+        sampler = StratifiedReservoirSampler(sample_size=100, proportional=True, seed=3)
+        counts = Counter(test_case['type'] for test_case in sampler.sample_rows(self.rows))
+
+        self.assertEqual(counts, Counter({'benign': 90, 'phishing': 10}))
+        self.assertEqual(sampler.type_counts()['benign'], 18000)
+
+    def test_unknown_quota_type(self):
+        """Test quotas for unknown types are rejected"""
+        with self.assertRaises(ValueError):
+            StratifiedReservoirSampler(quotas={'spam': 10})
+
+    def test_sample_csv(self):
+        """Test sampling a url,type CSV file"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as f:
+            writer = csv.writer(f)
+            writer.writerow(['url', 'type'])
+            writer.writerows(self.rows)
+            writer.writerow(['https://unknown-type.com', 'spam'])
+        try:
+            sample = StratifiedReservoirSampler(sample_size=40, seed=5).sample_csv(f.name)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(len(sample), 20)
+        self.assertEqual({test_case['type'] for test_case in sample}, {'benign', 'phishing'})
+
+class TestReservoir(unittest.TestCase):
+    """Test cases for Reservoir"""
+
+    def test_selection_is_uniform(self):
+        """Test every position is selected with roughly equal probability"""
+        counts = Counter()
+        rng = random.Random(0)
+        for _ in range(2000):
+            reservoir = Reservoir(5, rng)
+            for item in range(50):
+                reservoir.offer(item)
+            counts.update(reservoir.items)
+
+        # 2000 draws * 5 slots / 50 items = 200 expected per item
+        self.assertEqual(len(counts), 50)
+        self.assertGreater(min(counts.values()), 140)
+        self.assertLess(max(counts.values()), 260)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the public-suffix domain parser
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from domain_parser import (PublicSuffixList, clear_host_cache, host_cache_info, parse_url, registrable_domain,
+                           split_url)
+
+class TestPublicSuffixRules(unittest.TestCase):
+    """Test cases from the Public Suffix List's checkPublicSuffix vectors"""
+
+    CASES = [
+        ('com', ''), ('example.com', 'example.com'), ('www.example.com', 'example.com'),
+        ('uk.com', ''), ('example.uk.com', 'example.uk.com'), ('b.example.uk.com', 'example.uk.com'),
+        ('c.kobe.jp', ''), ('b.c.kobe.jp', 'b.c.kobe.jp'), ('a.b.c.kobe.jp', 'b.c.kobe.jp'),
+        ('city.kobe.jp', 'city.kobe.jp'), ('www.city.kobe.jp', 'city.kobe.jp'),
+        ('ck', ''), ('test.ck', ''), ('b.test.ck', 'b.test.ck'), ('www.ck', 'www.ck'), ('www.www.ck', 'www.ck'),
+        ('us', ''), ('test.ak.us', 'test.ak.us'), ('www.test.ak.us', 'test.ak.us'),
+        ('example', ''), ('example.example', 'example.example'), ('b.example.example', 'example.example'),
+        ('xn--85x722f.com.cn', 'xn--85x722f.com.cn'), ('www.xn--85x722f.xn--55qx5d.cn', 'xn--85x722f.xn--55qx5d.cn'),
+    ]
+
+    def test_check_public_suffix(self):
+        """Test registrable domains for the official test vectors"""
+        for host, expected in self.CASES:
+            self.assertEqual(parse_url(f"http://{host}/").registrable_domain, expected, host)
+
+    def test_private_section_optional(self):
+        """Test private suffixes such as github.io can be excluded"""
+        icann_only = PublicSuffixList(include_private=False)
+
+        self.assertEqual(parse_url("https://evil.github.io/").registrable_domain, 'evil.github.io')
+        self.assertEqual(parse_url("https://evil.github.io/", icann_only).registrable_domain, 'github.io')
+
+    def test_custom_list(self):
+        """Test a list file with wildcard and exception rules"""
+        with tempfile.NamedTemporaryFile('w', suffix='.dat', delete=False) as f:
+            f.write("// test list\nuk\nco.uk\n*.sch.uk\n!special.sch.uk\n")
+        self.addCleanup(os.unlink, f.name)
+        suffix_list = PublicSuffixList(f.name)
+
+        self.assertEqual(suffix_list.split("www.bbc.co.uk"), ('bbc.co.uk', 'co.uk', 'www', 1))
+        self.assertEqual(suffix_list.split("a.school.sch.uk"), ('a.school.sch.uk', 'school.sch.uk', '', 0))
+        self.assertEqual(suffix_list.split("x.special.sch.uk"), ('special.sch.uk', 'sch.uk', 'x', 1))
+
+class TestParseUrl(unittest.TestCase):
+    """Test cases for URL splitting"""
+
+    def test_fields(self):
+        """Test every field for a co.uk URL with userinfo and port"""
+        parsed = parse_url("HTTPS://user:pw@Mail.WWW.BBC.co.uk:8443/path?q=1#f")
+
+        self.assertEqual(parsed.scheme, 'https')
+        self.assertEqual(parsed.host, 'mail.www.bbc.co.uk')
+        self.assertEqual(parsed.registrable_domain, 'bbc.co.uk')
+        self.assertEqual(parsed.suffix, 'co.uk')
+        self.assertEqual(parsed.subdomain, 'mail.www')
+        self.assertEqual(parsed.subdomain_depth, 2)
+
+    def test_www_shares_key(self):
+        """Test www and bare hosts map to the same registrable domain"""
+        self.assertEqual(registrable_domain("https://www.google.com"), registrable_domain("google.com"))
+
+    def test_scheme_less_and_ip(self):
+        """Test dataset-style URLs without a scheme and IP hosts"""
+        self.assertEqual(split_url("br-icloud.com.br:8080/login"), ('', 'br-icloud.com.br'))
+        self.assertEqual(registrable_domain("http://192.168.1.1/admin"), '192.168.1.1')
+        self.assertEqual(parse_url("http://[::1]:8080/").host, '[::1]')
+
+    def test_host_cache(self):
+        """Test repeated hosts hit the cache and clearing it starts cold"""
+        clear_host_cache()
+        self.assertEqual(host_cache_info().currsize, 0)
+        parse_url("https://www.example.org/a")
+        parse_url("https://www.example.org/b")
+        info = host_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+        clear_host_cache()
+        self.assertEqual(host_cache_info().hits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
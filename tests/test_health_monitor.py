@@ -0,0 +1,116 @@
+"""
+Unit tests for the continuous health monitor
+"""
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from health_monitor import HealthMonitor, Probe, RingBuffer, build_report
+from stand_in_servers import StandInConfig, StandInServer
+
+def make_probe(timestamp, service="ML", endpoint='/health', status_code=200, latency=0.1, cold_start=False):
+    return Probe(float(timestamp), service, endpoint, status_code, latency, cold_start)
+
+class TestRingBuffer(unittest.TestCase):
+    """Test cases for the on-disk probe ring buffer"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, 'monitor.ring')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test probes read back with every field intact"""
+        probes = [make_probe(1, cold_start=True), make_probe(1, service="App", endpoint='/', status_code=None)]
+        with RingBuffer(self.filename, capacity=10) as ring:
+            ring.append(probes)
+            read = list(ring)
+        self.assertEqual([probe.service for probe in read], ["ML", "App"])
+        self.assertEqual(read[0].endpoint, '/health')
+        self.assertTrue(read[0].cold_start)
+        self.assertIsNone(read[1].status_code)
+        self.assertAlmostEqual(read[0].latency, 0.1, places=6)
+
+    def test_wraps_and_persists(self):
+        """Test the oldest probes are overwritten and history survives a reopen"""
+        with RingBuffer(self.filename, capacity=4) as ring:
+            ring.append([make_probe(timestamp) for timestamp in range(3)])
+        size = os.path.getsize(self.filename)
+        with RingBuffer(self.filename, capacity=1000) as ring:
+            self.assertEqual(ring.capacity, 4)
+            ring.append([make_probe(timestamp) for timestamp in range(3, 6)])
+            self.assertEqual(len(ring), 4)
+            self.assertEqual([probe.timestamp for probe in ring], [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(os.path.getsize(self.filename), size)
+
+    def test_rejects_other_files(self):
+        """Test a file that is not a ring buffer raises ValueError"""
+        with open(self.filename, 'wb') as f:
+            f.write(b'x' * 64)
+        with self.assertRaises(ValueError):
+            RingBuffer(self.filename)
+
+class TestReport(unittest.TestCase):
+    """Test cases for availability, percentiles and cold-start reporting"""
+
+    def test_report(self):
+        """Test a service counts as up in a round if either endpoint answered"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with RingBuffer(os.path.join(tmp, 'monitor.ring'), capacity=100) as ring:
+                ring.append([make_probe(0, latency=30.0, cold_start=True),
+                             make_probe(0, endpoint='/', latency=29.0, cold_start=True)])
+                ring.append([make_probe(60, status_code=503), make_probe(60, endpoint='/')])
+                ring.append([make_probe(3600, status_code=None), make_probe(3600, endpoint='/', status_code=502)])
+                report = build_report(ring, window=3600)
+
+        summary = report['services']["ML"]
+        self.assertEqual(summary['rounds'], 3)
+        self.assertAlmostEqual(summary['availability'], 2 / 3, places=4)
+        self.assertEqual(summary['cold_starts'], 1)
+        self.assertEqual(len(summary['cold_start_events']), 1)
+        self.assertAlmostEqual(summary['cold_start_events'][0]['latency'], 30.0, places=3)
+        self.assertEqual(summary['endpoints']['/health']['probes'], 3)
+        self.assertAlmostEqual(summary['endpoints']['/health']['availability'], 1 / 3, places=4)
+        self.assertAlmostEqual(summary['endpoints']['/']['latency']['max'], 29.0, places=2)
+        self.assertEqual([window['availability'] for window in summary['windows']], [1.0, 0.0])
+
+class TestHealthMonitor(unittest.TestCase):
+    """Test cases for concurrent probing against stand-in services"""
+
+    def test_probe_rounds(self):
+        """Test slow services are flagged as cold and dead ones as down, probed concurrently"""
+        slow = StandInServer(StandInConfig(latency="fixed:0.3")).start()
+        fast = StandInServer(StandInConfig()).start()
+        self.addCleanup(slow.stop)
+        self.addCleanup(fast.stop)
+        services = {"Slow": slow.url, "Fast": fast.url, "Dead": "http://127.0.0.1:1"}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with RingBuffer(os.path.join(tmp, 'monitor.ring'), capacity=100) as ring:
+                monitor = HealthMonitor(services, ring, interval=0.01, timeout=5, cold_start_threshold=0.2)
+                self.addCleanup(monitor.close)
+                start_time = time.perf_counter()
+                probes = monitor.probe_round()
+                elapsed = time.perf_counter() - start_time
+                self.assertEqual(monitor.run(rounds=1, verbose=False), 1)
+                report = build_report(ring)
+
+        # Both 0.3 s endpoints of the slow service were probed in parallel
+        self.assertLess(elapsed, 0.55)
+        slow_probes = [probe for probe in probes if probe.service == "Slow"]
+        self.assertTrue(all(probe.cold_start for probe in slow_probes))
+        self.assertEqual(slow.request_counts, {'/health': 2, '/': 2})
+
+        self.assertEqual(report['services']["Slow"]['cold_starts'], 2)
+        self.assertEqual(report['services']["Fast"]['availability'], 1.0)
+        self.assertEqual(report['services']["Fast"]['cold_starts'], 0)
+        self.assertEqual(report['services']["Dead"]['availability'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
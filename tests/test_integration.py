@@ -10,8 +10,8 @@ import sys
 import os
 
 # Configuration
-ML_SERVICE_URL = "http://localhost:5001"
-JAVA_SERVICE_URL = "http://localhost:8080"
+ML_SERVICE_URL = os.environ.get('ML_SERVICE_URL', "http://localhost:5001")
+JAVA_SERVICE_URL = os.environ.get('JAVA_SERVICE_URL', "http://localhost:8080")
 
 class TestMLMicroserviceIntegration(unittest.TestCase):
     """Integration tests for ML microservice"""
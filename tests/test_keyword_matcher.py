@@ -0,0 +1,94 @@
+"""
+Unit tests for the Aho-Corasick keyword matcher
+"""
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dataset_cache import parse_tagged_url_list
+from keyword_matcher import (BRANDS, MALICIOUS_EXTENSIONS, ML_KEYWORDS, PatternMatcher, count_suspicious_keywords,
+                             get_default_matcher, is_brand_impersonation)
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def naive_matches(text, patterns):
+    """Every (start, end, pattern) found by scanning once per pattern"""
+    found = set()
+    for pattern in patterns:
+        start = text.find(pattern)
+        while start >= 0:
+            found.add((start, start + len(pattern), pattern))
+            start = text.find(pattern, start + 1)
+    return found
+
+class TestPatternMatcher(unittest.TestCase):
+    """Test cases for the automaton"""
+
+    def test_matches_naive_scan(self):
+        """Test overlapping and nested patterns against a per-pattern scan"""
+        rng = random.Random(7)
+        patterns = {''.join(rng.choice('abc') for _ in range(rng.randint(1, 5))) for _ in range(60)}
+        matcher = PatternMatcher().add_all(patterns, 'random')
+
+        for _ in range(50):
+            text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 80)))
+            found = {(match.start, match.end, match.pattern) for match in matcher.finditer(text)}
+            self.assertEqual(found, naive_matches(text, patterns))
+
+    def test_case_insensitive_positions(self):
+        """Test matches are case-insensitive and positions refer to the input"""
+        matcher = PatternMatcher().add_all(["login"], 'keyword')
+        text = "http://İİ.example.com/LOGIN"
+
+        match, = matcher.scan(text)
+        self.assertEqual(text[match.start:match.end], "LOGIN")
+
+    def test_categories_and_at_end(self):
+        """Test category filtering and suffix-only patterns"""
+        matcher = PatternMatcher()
+        matcher.add_all(["paypal"], 'brand')
+        matcher.add_all([".exe"], 'extension', at_end=True)
+
+        self.assertEqual(matcher.matched_patterns("http://paypal.exe.example.com/"), {'brand': {'paypal'}})
+        self.assertEqual(matcher.matched_patterns("http://x.com/paypal.exe", ['extension']),
+                         {'extension': {'.exe'}})
+
+    def test_empty_pattern_rejected(self):
+        """Test an empty pattern raises ValueError"""
+        with self.assertRaises(ValueError):
+            PatternMatcher().add("", 'keyword')
+
+class TestJavaHeuristics(unittest.TestCase):
+    """Test the helpers agree with the Java list checks"""
+
+    def setUp(self):
+        self.urls = [test_case['url'] for test_case in
+                     parse_tagged_url_list(os.path.join(REPO_ROOT, 'test_dataset.txt'))]
+
+    def test_count_suspicious_keywords(self):
+        """Test countSuspiciousKeywords over test_dataset.txt"""
+        for url in self.urls:
+            expected = sum(1 for keyword in ML_KEYWORDS if keyword in url.lower())
+            self.assertEqual(count_suspicious_keywords(url), expected, url)
+
+    def test_is_brand_impersonation(self):
+        """Test isBrandImpersonation, including the exact brand.com exemption"""
+        for url in self.urls + ["paypal.com", "PayPal.com", "paypal.com.evil.tk", "google.com-login.xyz"]:
+            domain = url.lower()
+            expected = any(brand in domain and domain != brand + ".com" for brand in BRANDS)
+            self.assertEqual(is_brand_impersonation(url), expected, url)
+
+    def test_malicious_extensions(self):
+        """Test the extension list flags what the Java MALICIOUS_EXTENSIONS regex flags"""
+        self.assertEqual(len(MALICIOUS_EXTENSIONS), len(set(MALICIOUS_EXTENSIONS)))
+        matcher = get_default_matcher()
+        for url in ["http://x.com/a.URL", "http://x.com/payload.bin", "http://x.com/d.dat", "http://x.com/t.exe"]:
+            self.assertTrue(matcher.scan(url, ['malicious_extension']), url)
+        for url in ["http://x.com/page.html", "http://x.com/a.bin/"]:
+            self.assertFalse(matcher.scan(url, ['malicious_extension']), url)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the latency histogram used by the dataset testers
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from latency_histogram import LatencyHistogram, LatencyReport
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for LatencyHistogram"""
+
+    def test_percentiles_within_precision(self):
+        """Test percentiles are accurate to the configured significant digits"""
+        histogram = LatencyHistogram(significant_digits=3)
+        for ms in range(1, 10001):
+            histogram.record(ms / 1000)
+
+        self.assertEqual(histogram.total_count, 10000)
+        self.assertAlmostEqual(histogram.value_at_percentile(50), 5.0, delta=5.0 * 0.001)
+        self.assertAlmostEqual(histogram.value_at_percentile(99), 9.9, delta=9.9 * 0.001)
+        self.assertAlmostEqual(histogram.value_at_percentile(99.9), 9.99, delta=9.99 * 0.001)
+        self.assertEqual(histogram.value_at_percentile(100), 10.0)
+        self.assertEqual(histogram.max, 10.0)
+        self.assertEqual(histogram.min, 0.001)
+
+    def test_tail_is_not_hidden_by_mean(self):
+        """Test a single slow request shows up in the tail percentiles"""
+        histogram = LatencyHistogram()
+        for _ in range(999):
+            histogram.record(0.1)
+        histogram.record(30.0)
+
+        self.assertLess(histogram.value_at_percentile(99), 0.11)
+        self.assertAlmostEqual(histogram.value_at_percentile(99.99), 30.0, delta=0.03)
+        self.assertEqual(histogram.summary()['max'], 30.0)
+
+    def test_empty_histogram(self):
+        """Test an empty histogram reports zeros"""
+        summary = LatencyHistogram().summary()
+
+        self.assertEqual(summary['count'], 0)
+        self.assertEqual(summary['p99'], 0.0)
+        self.assertEqual(summary['max'], 0.0)
+
+    def test_merge_and_round_trip(self):
+        """Test merging and serializing histograms preserves percentiles"""
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        for i in range(500):
+            first.record(0.01 * (i + 1))
+            second.record(5 + 0.01 * i)
+
+        first.merge(second)
+        restored = LatencyHistogram.from_dict(first.to_dict())
+
+        self.assertEqual(restored.total_count, 1000)
+        self.assertEqual(restored.summary(), first.summary())
+
+class TestLatencyReport(unittest.TestCase):
+    """Test cases for LatencyReport"""
+
+    def test_breakdown_by_group(self):
+        """Test per-group histograms and the overall histogram"""
+        report = LatencyReport(group_label='type')
+        report.record('phishing', 0.2)
+        report.record('benign', 1.5)
+        report.record('benign', 2.5)
+
+        summary = report.summary()
+
+        self.assertEqual(summary['overall']['count'], 3)
+        self.assertEqual(summary['by_type']['benign']['count'], 2)
+        self.assertIn('p99_9', summary['by_type']['phishing'])
+
+if __name__ == '__main__':
+    unittest.main()
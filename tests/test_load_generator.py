@@ -0,0 +1,121 @@
+"""
+Unit tests for the concurrent load generator
+"""
+import unittest
+import os
+import subprocess
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from load_generator import LoadGenerator
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+class TestLoadGenerator(unittest.TestCase):
+    """Test cases for LoadGenerator.run"""
+
+    def test_every_item_and_exceptions(self):
+        """Test every item is run once and worker exceptions come back as results"""
+        def worker(item):
+            if item == 3:
+                raise ValueError("boom")
+            return item * 2
+
+        with LoadGenerator(concurrency=4) as generator:
+            entries = list(generator.run(range(20), worker))
+        self.assertEqual(sorted(entry.index for entry in entries), list(range(20)))
+        by_item = {entry.item: entry.result for entry in entries}
+        self.assertIsInstance(by_item[3], ValueError)
+        self.assertEqual(by_item[5], 10)
+        for entry in entries:
+            self.assertLessEqual(entry.scheduled, entry.started)
+            self.assertLessEqual(entry.started, entry.finished)
+
+    def test_concurrency_bound(self):
+        """Test no more than `concurrency` workers run at once, and that many do"""
+        concurrency = 3
+        lock = threading.Lock()
+        full = threading.Event()
+        active = [0, 0]
+
+        def worker(item):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+                if active[0] == concurrency:
+                    full.set()
+            # Hold every worker until all slots are busy at the same moment
+            full.wait(timeout=10)
+            with lock:
+                active[0] -= 1
+            return item
+
+        with LoadGenerator(concurrency=concurrency) as generator:
+            entries = list(generator.run(range(12), worker))
+        self.assertEqual(len(entries), 12)
+        self.assertTrue(full.is_set())
+        self.assertEqual(active[1], concurrency)
+
+    def test_completion_order(self):
+        """Test results are yielded as they complete, not in submission order"""
+        second_done = threading.Event()
+
+        def worker(item):
+            if item == 0:
+                second_done.wait(timeout=10)
+            else:
+                second_done.set()
+            return item
+
+        with LoadGenerator(concurrency=2) as generator:
+            order = [entry.item for entry in generator.run([0, 1], worker)]
+        self.assertEqual(order, [1, 0])
+
+    def test_open_loop_schedule(self):
+        """Test request i is scheduled at start + i / rps"""
+        with LoadGenerator(concurrency=2, rps=200) as generator:
+            entries = sorted(generator.run(range(5), lambda item: item), key=lambda entry: entry.index)
+        start = entries[0].scheduled
+        for entry in entries:
+            self.assertAlmostEqual(entry.scheduled - start, entry.index / 200, places=9)
+            self.assertGreaterEqual(entry.started, entry.scheduled)
+
+    def test_closing_early_lets_the_process_exit(self):
+        """Test abandoning the iterator does not leave worker threads blocked forever"""
+        script = ("from load_generator import LoadGenerator\n"
+                  "it = LoadGenerator(2).run(range(1000), lambda x: x)\n"
+                  "next(it)\n"
+                  "it.close()\n"
+                  "print('closed')\n")
+        completed = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True,
+                                   text=True, timeout=60)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertIn('closed', completed.stdout)
+
+    def test_caller_exception_stops_dispatch(self):
+        """Test an exception in the consuming loop stops submitting new work"""
+        calls = []
+        generator = LoadGenerator(concurrency=2)
+        with self.assertRaises(RuntimeError):
+            for entry in generator.run(range(10000), calls.append):
+                raise RuntimeError("caller failed")
+        generator.close()
+        self.assertLess(len(calls), 10000)
+
+    def test_items_exception_reaches_consumer(self):
+        """Test an exception from the items iterable is re-raised instead of hanging the consumer"""
+        def items():
+            yield from range(5)
+            raise ValueError("bad row")
+
+        seen = []
+        with LoadGenerator(concurrency=2) as generator:
+            with self.assertRaisesRegex(ValueError, "bad row"):
+                for entry in generator.run(items(), lambda item: item):
+                    seen.append(entry.item)
+        self.assertEqual(sorted(seen), list(range(5)))
+
+if __name__ == '__main__':
+    unittest.main()
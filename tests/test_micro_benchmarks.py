@@ -0,0 +1,96 @@
+"""
+Unit tests for the microbenchmark runner and baseline comparison
+"""
+import unittest
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from micro_benchmarks import (BENCHMARKS, compare, load_baseline, mann_whitney_u, run_benchmarks, save_baseline,
+                              summarize, synthetic_urls)
+
+def make_document(samples_by_case):
+    return {'format_version': 1, 'results': {name: summarize(samples) for name, samples in samples_by_case.items()}}
+
+class TestMannWhitneyU(unittest.TestCase):
+    """Test cases for the rank-sum significance test"""
+
+    def test_separated_samples(self):
+        """Test fully separated samples are significant"""
+        self.assertLess(mann_whitney_u([1.0 + i * 0.01 for i in range(20)], [2.0 + i * 0.01 for i in range(20)]), 1e-6)
+
+    def test_same_distribution(self):
+        """Test draws from one distribution are not significant"""
+        rng = random.Random(5)
+        first = [rng.gauss(1.0, 0.1) for _ in range(30)]
+        second = [rng.gauss(1.0, 0.1) for _ in range(30)]
+        self.assertGreater(mann_whitney_u(first, second), 0.05)
+
+    def test_ties(self):
+        """Test identical samples give p = 1"""
+        self.assertEqual(mann_whitney_u([1.0] * 10, [1.0] * 10), 1.0)
+
+class TestCompare(unittest.TestCase):
+    """Test cases for regression verdicts"""
+
+    def test_verdicts(self):
+        """Test slowdowns beyond the threshold regress and small or noisy ones do not"""
+        rng = random.Random(7)
+        base = [rng.gauss(1.0, 0.02) for _ in range(20)]
+        baseline = make_document({'slower': base, 'slightly': base, 'faster': base, 'noisy': base[:3]})
+        current = make_document({
+            'slower': [value * 1.3 for value in base],
+            'slightly': [value * 1.05 for value in base],
+            'faster': [value * 0.5 for value in base],
+            'noisy': [value * 1.3 for value in base[3:6]],
+            'new_case': base
+        })
+        verdicts = {row['name']: row['verdict'] for row in compare(baseline, current, threshold=0.1, alpha=0.01)}
+
+        self.assertEqual(verdicts, {'slower': 'regression', 'slightly': 'unchanged', 'faster': 'improvement',
+                                    'noisy': 'unchanged'})
+
+class TestRunBenchmarks(unittest.TestCase):
+    """Test cases for running cases and storing baselines"""
+
+    def test_run_and_baseline_round_trip(self):
+        """Test cases are timed, unavailable model cases are skipped and baselines reload"""
+        document = run_benchmarks(['domain.parse_cache_hit', 'json.predict_response', 'model.predict_batch'],
+                                  repeat=3, min_time=0.001, verbose=False)
+        results = document['results']
+        self.assertEqual(len(results['domain.parse_cache_hit']['samples']), 3)
+        self.assertGreater(results['json.predict_response']['median'], 0)
+        try:
+            import python_microservice  # noqa: F401
+        except ImportError:
+            self.assertIn('skipped', results['model.predict_batch'])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            save_baseline(document, 'v1', tmp)
+            loaded = load_baseline('latest', tmp)
+            self.assertEqual(loaded['name'], 'v1')
+            self.assertEqual(compare(loaded, document)[0]['ratio'], 1.0)
+
+            with open(os.path.join(tmp, 'old.json'), 'w') as f:
+                json.dump({'format_version': 0, 'results': {}}, f)
+            with self.assertRaises(ValueError):
+                load_baseline('old', tmp)
+
+    def test_registry(self):
+        """Test every requested hot path has a case"""
+        for prefix in ('features.', 'domain.parse_cache_hit', 'domain.parse_cache_miss', 'json.',
+                       'model.tokenize', 'model.predict_single', 'model.predict_batch'):
+            self.assertTrue(any(name.startswith(prefix) for name in BENCHMARKS), prefix)
+
+    def test_cache_miss_urls_distinct(self):
+        """Test the per-call URLs of the cache-miss cases never repeat across calls"""
+        urls = [url for offset in range(0, 50 * 32, 32)
+                for url in synthetic_urls(32, seed=offset, unique_hosts=True, start=offset)]
+        self.assertEqual(len(set(urls)), len(urls))
+
+if __name__ == '__main__':
+    unittest.main()
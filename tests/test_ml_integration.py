@@ -6,14 +6,19 @@ Tests the Python Flask microservice and Java backend integration
 
 import requests
 import json
+import os
 import time
 import subprocess
 import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from server_timing import parse_server_timing
+
 # Configuration
-ML_SERVICE_URL = "http://localhost:5001"
-JAVA_SERVICE_URL = "http://localhost:8080"
+ML_SERVICE_URL = os.environ.get('ML_SERVICE_URL', "http://localhost:5001")
+JAVA_SERVICE_URL = os.environ.get('JAVA_SERVICE_URL', "http://localhost:8080")
 
 def test_ml_microservice():
     """Test the Python ML microservice directly"""
@@ -38,14 +43,19 @@ def test_ml_microservice():
             
             if response.status_code == 200:
                 result = response.json()
+                server_timing = parse_server_timing(response.headers.get("Server-Timing"))
                 results.append({
                     "url": url,
                     "label": result.get("label", "unknown"),
                     "confidence": result.get("confidence", 0.0),
                     "model": result.get("model", "unknown"),
-                    "status": "success"
+                    "status": "success",
+                    "server_timing": server_timing
                 })
-                print(f"✅ {url}: {result.get('label')} (confidence: {result.get('confidence', 0.0):.3f})")
+                stages = ", ".join(f"{stage} {duration:.1f}ms" for stage, duration in server_timing.items()
+                                   if duration is not None)
+                print(f"✅ {url}: {result.get('label')} (confidence: {result.get('confidence', 0.0):.3f})"
+                      + (f" [{stages}]" if stages else ""))
             else:
                 results.append({
                     "url": url,
@@ -168,6 +178,31 @@ def test_model_info():
     except Exception as e:
         print(f"❌ Model Info: {e}")
 
+def summarize_server_timing(results):
+    """Per-stage count, mean and max (ms) of the Server-Timing durations in the results"""
+    durations = {}
+    for result in results:
+        for stage, duration in result.get("server_timing", {}).items():
+            if duration is not None:
+                durations.setdefault(stage, []).append(duration)
+    return {
+        stage: {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "max_ms": round(max(values), 3)
+        }
+        for stage, values in durations.items()
+    }
+
+def print_server_timing(summary):
+    """Print where /predict time went, per stage"""
+    print("\n⏱️  /predict Server-Timing by stage")
+    if not summary:
+        print("   (no Server-Timing headers returned)")
+        return
+    for stage, stats in summary.items():
+        print(f"   {stage:<12} mean {stats['mean_ms']:>9.3f}ms  max {stats['max_ms']:>9.3f}ms  ({stats['count']} requests)")
+
 def save_results(ml_results, java_results):
     """Save test results to file"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -181,7 +216,8 @@ def save_results(ml_results, java_results):
             "ml_tests": len(ml_results),
             "java_tests": len(java_results),
             "ml_success": len([r for r in ml_results if r["status"] == "success"]),
-            "java_success": len([r for r in java_results if r["java_status"] == "success"])
+            "java_success": len([r for r in java_results if r["java_status"] == "success"]),
+            "ml_server_timing": summarize_server_timing(ml_results)
         }
     }
     
@@ -235,6 +271,7 @@ def main():
     java_success = len([r for r in java_results if r["java_status"] == "success"])
     
     print(f"ML Microservice Tests: {ml_success}/{len(ml_results)} successful")
+    print_server_timing(results["summary"]["ml_server_timing"])
     print(f"Java Integration Tests: {java_success}/{len(java_results)} successful")
     
     if ml_success == len(ml_results) and java_success == len(java_results):
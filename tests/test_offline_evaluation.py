@@ -0,0 +1,85 @@
+"""
+Unit tests for the offline evaluation engine
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from offline_evaluation import OfflineEvaluator, UrlFeatureDetector, aggregate_detections, detection_result
+from scan_aggregation import OVERRIDE_RECOMMENDATION, RECOMMENDATIONS, WHITELISTED_RECOMMENDATIONS, scan_result
+
+class TestAggregateDetections(unittest.TestCase):
+    """Test cases mirroring the Java overall decision"""
+
+    def test_single_moderate_detection_is_malicious(self):
+        """Test one detection above 0.3 flags a non-whitelisted URL"""
+        results = {'URL Pattern Analysis': detection_result('URL Pattern Analysis', True, "pattern", 0.35)}
+
+        self.assertEqual(aggregate_detections(results), (True, "MALICIOUS"))
+
+    def test_whitelisted_needs_two_detections(self):
+        """Test whitelisted URLs need at least two detections unless one is very confident"""
+        results = {
+            'URL Pattern Analysis': detection_result('URL Pattern Analysis', True, "pattern", 0.5),
+            'TransformerML': detection_result('TransformerML', False, "safe", 0.2),
+        }
+        self.assertEqual(aggregate_detections(results, whitelisted=True), (False, "CLEAN"))
+
+        results['TransformerML'] = detection_result('TransformerML', True, "malicious", 0.9)
+        self.assertEqual(aggregate_detections(results, whitelisted=True), (True, "MALICIOUS"))
+
+    def test_content_issue_is_suspicious(self):
+        """Test an undetected but confident content result is suspicious"""
+        results = {'Content Analysis': detection_result('Content Analysis', False, "content", 0.6)}
+
+        self.assertEqual(aggregate_detections(results), (False, "SUSPICIOUS"))
+
+    def test_recommendation_follows_the_branch(self):
+        """Test whitelisted and override decisions carry their own recommendation texts"""
+        results = {
+            'URL Pattern Analysis': detection_result('URL Pattern Analysis', True, "pattern", 0.5),
+            'Content Analysis': detection_result('Content Analysis', True, "content", 0.6),
+        }
+        whitelisted = scan_result("https://www.google.com", results, whitelisted=True)
+        self.assertEqual(whitelisted['overallStatus'], "MALICIOUS")
+        self.assertEqual(whitelisted['recommendation'], WHITELISTED_RECOMMENDATIONS["MALICIOUS"])
+        self.assertEqual(scan_result("http://x.tk", results)['recommendation'], RECOMMENDATIONS["MALICIOUS"])
+
+        results = {'TransformerML': detection_result('TransformerML', True, "malicious", 0.9)}
+        override = scan_result("https://www.google.com", results, whitelisted=True)
+        self.assertEqual((override['malicious'], override['recommendation']), (True, OVERRIDE_RECOMMENDATION))
+
+
+class TestOfflineEvaluator(unittest.TestCase):
+    """Test cases for chunked in-process evaluation"""
+
+    def test_records_and_stats(self):
+        """Test records match the HTTP tester's shape and stats are updated"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        evaluator = OfflineEvaluator([UrlFeatureDetector()], chunk_size=2)
+        evaluator.output_dir = tmp.name
+        test_cases = [
+            ("https://google.com", 'benign'),
+            ("http://secure-login-verify-account-update.tk/bank/password", 'phishing'),
+            ("https://github.com", 'benign'),
+        ]
+        evaluator.run_chunks(iter(test_cases), len(test_cases))
+
+        evaluator.sink.close()
+        results = list(evaluator.sink)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(evaluator.stats['total_tests'], 3)
+        self.assertEqual(evaluator.stats['by_type']['benign']['total'], 2)
+        self.assertEqual(evaluator.stats['offline']['chunk_size'], 2)
+
+        record = results[1]
+        self.assertTrue(record['expected_malicious'])
+        self.assertEqual(record['detection_methods'], ['Java ML Detection'])
+        self.assertEqual(record['detection_correct'], record['overall_malicious'])
+
+if __name__ == '__main__':
+    unittest.main()
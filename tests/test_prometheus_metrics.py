@@ -0,0 +1,141 @@
+"""
+Unit tests for the Prometheus metrics registry and the stand-in /metrics endpoint
+"""
+import unittest
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from prometheus_metrics import CONTENT_TYPE, Counter, Histogram, MetricsRegistry, _Sharded, process_rss_bytes
+from stand_in_servers import StandInConfig, StandInServer
+
+class TestCounter(unittest.TestCase):
+    """Test sharded counters"""
+
+    def test_concurrent_increments(self):
+        """Test increments from many threads are all counted"""
+        counter = Counter('requests_total', "Requests.", ('endpoint', 'status'))
+
+        def work():
+            for _ in range(1000):
+                counter.inc('/predict', '200')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc('/predict', '500', amount=2)
+        self.assertEqual(counter.value('/predict', '200'), 8000)
+        self.assertEqual(counter.value('/predict', '500'), 2)
+
+    def test_finished_threads_are_folded(self):
+        """Test shards of finished threads are retired without losing counts"""
+        counter = Counter('requests_total', "Requests.")
+        for _ in range(20):
+            thread = threading.Thread(target=counter.inc)
+            thread.start()
+            thread.join()
+        counter.inc()
+        self.assertLessEqual(len(counter._shards), 2)
+        self.assertEqual(counter.value(), 21)
+
+    def test_label_count_checked(self):
+        """Test the wrong number of labels is rejected"""
+        counter = Counter('requests_total', "Requests.", ('endpoint',))
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+class TestHistogram(unittest.TestCase):
+    """Test cumulative histograms"""
+
+    def test_buckets(self):
+        """Test cumulative bucket counts, sum and count"""
+        histogram = Histogram('latency_seconds', "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        buckets, total, count = histogram.snapshot()
+        self.assertEqual(buckets, [2, 3, 4])
+        self.assertAlmostEqual(total, 2.65)
+        self.assertEqual(count, 4)
+
+class TestRegistry(unittest.TestCase):
+    """Test the text exposition format"""
+
+    def test_render(self):
+        """Test HELP/TYPE lines, labels, buckets and gauges"""
+        registry = MetricsRegistry()
+        registry.counter('requests_total', "Requests.", ('endpoint',)).inc('/a"b')
+        registry.histogram('latency_seconds', "Latency.", buckets=(0.5,)).observe(0.25)
+        registry.gauge('loaded', "Loaded.", lambda: 1.0)
+        registry.gauge('missing', "Not available.", lambda: None)
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE requests_total counter', lines)
+        self.assertIn('requests_total{endpoint="/a\\"b"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="0.5"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1', lines)
+        self.assertIn('latency_seconds_sum 0.25', lines)
+        self.assertIn('latency_seconds_count 1', lines)
+        self.assertIn('loaded 1', lines)
+        self.assertFalse(any('missing' in line for line in lines))
+        with self.assertRaises(ValueError):
+            registry.gauge('loaded', "Again.", lambda: 0.0)
+
+    def test_metric_needs_fold(self):
+        """Test a sharded metric type must say how shards are merged"""
+        class Incomplete(_Sharded):
+            type_name = 'untyped'
+
+        with self.assertRaises(TypeError):
+            Incomplete('incomplete', "No fold.")
+
+    def test_process_rss(self):
+        """Test the resident memory gauge reads a plausible size"""
+        self.assertGreater(process_rss_bytes(), 1024 * 1024)
+
+class TestStandInMetrics(unittest.TestCase):
+    """Test /metrics on the stand-in server"""
+
+    def test_metrics_endpoint(self):
+        """Test requests are counted by endpoint and status"""
+        with StandInServer(StandInConfig(seed=1)) as server:
+            session = requests.Session()
+            session.post(server.url + "/predict", json={'url': "http://example.com"})
+            session.post(server.url + "/predict", json={})
+            session.get(server.url + "/no/such/path")
+            response = session.get(server.url + "/metrics")
+            session.close()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+        lines = response.text.splitlines()
+        self.assertIn('ml_http_requests_total{endpoint="/predict",status="200"} 1', lines)
+        self.assertIn('ml_http_requests_total{endpoint="/predict",status="400"} 1', lines)
+        self.assertIn('ml_http_requests_total{endpoint="other",status="404"} 1', lines)
+        self.assertIn('ml_http_request_duration_seconds_count{endpoint="/predict"} 2', lines)
+        self.assertIn('ml_inference_batch_size_count 1', lines)
+        self.assertIn('ml_model_loaded 1', lines)
+        self.assertTrue(any(line.startswith('ml_host_parse_cache_hit_ratio ') for line in lines))
+        self.assertTrue(any(line.startswith('process_resident_memory_bytes ') for line in lines))
+
+    def test_model_load_seconds(self):
+        """Test the load time is that of the cold start, however long after it the scrape comes"""
+        with StandInServer(StandInConfig(seed=1, boot_time=0.2, model_load_time=0.5)) as server:
+            session = requests.Session()
+            session.get(server.url + "/health")
+            before = session.get(server.url + "/metrics").text.splitlines()
+            time.sleep(1.5)
+            after = session.get(server.url + "/metrics").text.splitlines()
+            session.close()
+        self.assertIn('ml_model_loaded 0', before)
+        self.assertFalse(any(line.startswith('ml_model_load_seconds ') for line in before))
+        self.assertIn('ml_model_loaded 1', after)
+        load_seconds, = [float(line.split()[1]) for line in after if line.startswith('ml_model_load_seconds ')]
+        self.assertAlmostEqual(load_seconds, 0.7, places=2)
+
+if __name__ == '__main__':
+    unittest.main()
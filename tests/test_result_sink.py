@@ -0,0 +1,84 @@
+"""
+Unit tests for the streaming result sink
+"""
+import unittest
+import csv
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from result_sink import ResultSink, iter_results, write_csv
+
+def make_result(index, success=True):
+    return {
+        'url': f"http://example{index}.com",
+        'expected_type': 'phishing' if index % 2 else 'benign',
+        'success': success,
+        'overall_malicious': bool(index % 2),
+        'enhanced_content_analysis_found': index % 3 == 0,
+        'detection_methods': ['URL Pattern Analysis'] + (['TransformerML'] if index % 4 == 0 else []),
+        'detection_results': {'URL Pattern Analysis': {'detected': bool(index % 2)}}
+    }
+
+class TestResultSink(unittest.TestCase):
+    """Test cases for streaming, batching and incremental statistics"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, 'results', 'run.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_counts(self):
+        """Test records stream back in order and counts match a full recount"""
+        results = [make_result(index, success=index != 5) for index in range(20)]
+        with ResultSink(self.filename, group_key='expected_type', batch_size=7) as sink:
+            for result in results:
+                sink.write(result)
+
+        self.assertEqual(list(iter_results(self.filename)), results)
+        self.assertEqual(len(sink), 20)
+        successful = [result for result in results if result['success']]
+        self.assertEqual(sink.method_counts['URL Pattern Analysis'], len(successful))
+        self.assertEqual(sink.method_counts['TransformerML'], 5)
+        self.assertEqual(sink.groups['phishing'], {'total': 9, 'malicious': 9, 'enhanced': 3})
+
+    def test_flushes_in_batches(self):
+        """Test full batches reach the file before close"""
+        sink = ResultSink(self.filename, batch_size=3, flush_interval=3600)
+        self.addCleanup(sink.close)
+        for index in range(4):
+            sink.write(make_result(index))
+
+        self.assertEqual(len(list(iter_results(self.filename))), 3)
+        self.assertEqual(len(list(sink)), 4)
+
+    def test_torn_line_skipped(self):
+        """Test a partial last record from a crash is ignored"""
+        with ResultSink(self.filename) as sink:
+            sink.write(make_result(1))
+        with open(self.filename, 'a') as f:
+            f.write('{"url": "http://trunc')
+
+        self.assertEqual(len(list(iter_results(self.filename))), 1)
+
+    def test_write_csv(self):
+        """Test the CSV is built from the stream"""
+        with ResultSink(self.filename) as sink:
+            for index in range(3):
+                sink.write(make_result(index))
+        csv_file = os.path.join(self.tmp.name, 'summary.csv')
+        write_csv(self.filename, csv_file, [('URL', lambda result: result['url']),
+                                            ('Methods', lambda result: len(result['detection_methods']))])
+
+        with open(csv_file, newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['URL', 'Methods'])
+        self.assertEqual(rows[1], ['http://example0.com', '2'])
+        self.assertEqual(len(rows), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for checkpointed, resumable dataset runs
+"""
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from result_sink import iter_results
+from run_checkpoint import RunCheckpoint
+from stand_in_servers import StandInServer
+from test_malicious_phish_dataset import MaliciousPhishTester
+
+TEST_CASES = [
+    {'url': "https://www.google.com", 'type': 'benign'},
+    {'url': "http://malware-test.com", 'type': 'malware'},
+    {'url': "http://secure-login-verify.tk", 'type': 'phishing'},
+    {'url': "https://github.com", 'type': 'benign'},
+    {'url': "http://hacked-site.example/index.php", 'type': 'defacement'},
+    {'url': "http://paypal-secure.example.com/account", 'type': 'phishing'},
+]
+
+class TestRunCheckpoint(unittest.TestCase):
+    """Test cases for interrupting and resuming a run"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = StandInServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def make_tester(self):
+        tester = MaliciousPhishTester(self.server.url)
+        tester.output_dir = self.tmp.name
+        tester.checkpoint_interval = 2
+        return tester
+
+    def test_resume_skips_scored_and_retries_failed(self):
+        """Test a resumed run scores only what is left and merges the statistics"""
+        first = self.make_tester()
+        test_cases = [dict(test_case) for test_case in TEST_CASES]
+        first.start_run(test_cases, {'sample_size': len(test_cases)}, run_id='interrupted')
+        first.run_sequential_test(test_cases[:3])
+        self.server.config.error_rate = 1.0
+        first.run_sequential_test(test_cases[3:4])
+        first.save_checkpoint("interrupted")
+        first.sink.close()
+        self.server.config.error_rate = 0.0
+
+        checkpoint = RunCheckpoint('interrupted', os.path.join(self.tmp.name, '.runs'))
+        self.assertEqual(checkpoint.load_checkpoint()['cursor'], 4)
+        with open(checkpoint.results_file, 'a') as f:
+            f.write('{"url": "torn')
+
+        second = self.make_tester()
+        remaining = second.resume_run('interrupted')
+        self.assertEqual([test_case['index'] for test_case in remaining], [3, 4, 5])
+        self.assertEqual(second.stats['total_tests'], 3)
+
+        second.run_sequential_test(remaining)
+        second.save_checkpoint("complete")
+        second.sink.close()
+
+        results = list(iter_results(checkpoint.results_file))
+        self.assertEqual(sorted(result['sample_index'] for result in results), list(range(6)))
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(second.stats['total_tests'], 6)
+        self.assertEqual(second.stats['by_type']['phishing']['total'], 2)
+        self.assertEqual(second.latency.summary()['overall']['count'], 6)
+        self.assertEqual(checkpoint.load_checkpoint()['status'], "complete")
+        self.assertEqual(checkpoint.load_checkpoint()['cursor'], 6)
+
+    def test_resume_restores_run_settings(self):
+        """Test a resumed run reuses the saved sample description, concurrency and rps"""
+        first = self.make_tester()
+        test_cases = [dict(test_case) for test_case in TEST_CASES]
+        sample = {'filename': "phish.csv", 'seed': 7, 'proportional': False, 'quotas': None,
+                  'rows_by_type': {'benign': 2}}
+        first.start_run(test_cases, {'concurrency': 3, 'rps': 50.0, 'sample': sample}, run_id='settings')
+        first.run_sequential_test(test_cases[:2])
+        first.save_checkpoint("interrupted")
+        first.sink.close()
+
+        second = self.make_tester()
+        calls = []
+        run_load_test = second.run_load_test
+
+        def record_load_test(cases, concurrency, rps):
+            calls.append((len(cases), concurrency, rps))
+            run_load_test(cases, concurrency, rps)
+
+        second.run_load_test = record_load_test
+        second.run_dataset_test(concurrency=1, rps=None, run_id='settings', resume=True)
+
+        self.assertEqual(calls, [(4, 3, 50.0)])
+        self.assertEqual(second.stats['sample'], sample)
+        self.assertEqual(second.stats['total_tests'], 6)
+
+    def test_run_id_not_reused(self):
+        """Test starting a run with an existing ID fails instead of overwriting it"""
+        checkpoint = RunCheckpoint('taken', os.path.join(self.tmp.name, '.runs'))
+        checkpoint.create([{'url': "https://example.com", 'type': 'benign', 'index': 0}], {})
+
+        with self.assertRaises(FileExistsError):
+            checkpoint.create([], {})
+        with open(checkpoint.manifest_file) as f:
+            self.assertEqual(json.load(f)['total'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
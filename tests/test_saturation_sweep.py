@@ -0,0 +1,106 @@
+"""
+Unit tests for the saturation sweep
+"""
+import unittest
+import os
+import sys
+import io
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from saturation_sweep import SaturationSweep, saturation_reasons
+from stand_in_servers import StandInConfig, StandInServer
+from test_malicious_phish_dataset import MaliciousPhishTester
+
+TEST_CASES = [
+    {'url': "https://www.google.com", 'type': 'benign'},
+    {'url': "http://paypal-secure-login.tk/verify", 'type': 'phishing'},
+    {'url': "http://free-download.example.com/keygen.exe", 'type': 'malware'},
+]
+
+def make_step(**overrides):
+    step = {'offered_rps': 10, 'achieved_rps': 10, 'p99': 0.05, 'error_rate': 0.0, 'healthy': True}
+    step.update(overrides)
+    return step
+
+class TestSaturationReasons(unittest.TestCase):
+    """Test cases for the per-step saturation criteria"""
+
+    def test_sustainable_step(self):
+        """Test a step within every limit has no reasons"""
+        self.assertEqual(saturation_reasons(make_step(), baseline_p99=0.05), [])
+
+    def test_each_criterion(self):
+        """Test latency, errors, throughput and health each trip on their own"""
+        self.assertEqual(len(saturation_reasons(make_step(p99=0.2), baseline_p99=0.05)), 1)
+        self.assertEqual(len(saturation_reasons(make_step(p99=0.2), 0.05, max_p99=0.5)), 0)
+        self.assertEqual(len(saturation_reasons(make_step(error_rate=0.05), 0.05)), 1)
+        self.assertEqual(len(saturation_reasons(make_step(achieved_rps=8), 0.05)), 1)
+        self.assertEqual(len(saturation_reasons(make_step(healthy=False), 0.05)), 1)
+
+    def test_latency_floor(self):
+        """Test a tiny baseline p99 is floored before the factor is applied"""
+        self.assertEqual(saturation_reasons(make_step(p99=0.02), baseline_p99=0.001), [])
+
+class TestSaturationSweep(unittest.TestCase):
+    """Test cases for sweeps against a stand-in backend"""
+
+    def sweep(self, config, **kwargs):
+        server = StandInServer(config).start()
+        self.addCleanup(server.stop)
+        tester = MaliciousPhishTester(server.url)
+        return SaturationSweep(tester, TEST_CASES, step_duration=0.5, cooldown=0, **kwargs)
+
+    def test_finds_knee(self):
+        """Test the knee lies below the capacity of a fixed-latency backend"""
+        # 2 workers x 20 ms service time: about 100 req/s of capacity
+        sweep = self.sweep(StandInConfig(latency="fixed:0.02", seed=1), concurrency=2)
+        report = sweep.run(start_rps=20, max_rps=400, growth=2)
+
+        self.assertIn(report['knee_rps'], (20, 40, 80))
+        self.assertIn(report['first_saturated_rps'], (80, 160))
+        self.assertTrue(report['curve'][-1]['saturated'])
+        self.assertEqual([step['offered_rps'] for step in report['curve']],
+                         sorted(step['offered_rps'] for step in report['curve']))
+
+    def test_binary_search_refines(self):
+        """Test bisection measures rates between the last good and first bad step"""
+        sweep = self.sweep(StandInConfig(latency="fixed:0.02", seed=1), concurrency=2)
+        report = sweep.run(start_rps=20, max_rps=400, growth=4, binary_search=True, tolerance=0.3)
+
+        rates = [step['offered_rps'] for step in report['curve']]
+        self.assertGreater(len(rates), 2)
+        self.assertLess(report['first_saturated_rps'] / report['knee_rps'], 1.3 + 1e-9)
+
+    def test_errors_saturate(self):
+        """Test injected 503s are counted and stop the sweep at the first step"""
+        sweep = self.sweep(StandInConfig(error_rate=0.5, error_status=503, seed=2), concurrency=4)
+        report = sweep.run(start_rps=20, max_rps=400)
+
+        self.assertIsNone(report['knee_rps'])
+        step = report['curve'][0]
+        self.assertTrue(step['saturated'])
+        self.assertGreater(step['status_5xx'], 0)
+        self.assertEqual(step['status_5xx'], step['errors'])
+        self.assertTrue(step['healthy'])
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            SaturationSweep.print_report(report, start_option='--rps', max_option=None)
+        self.assertIn("lower --rps", output.getvalue())
+        self.assertNotIn("--start-rps", output.getvalue())
+
+    def test_save(self):
+        """Test the report and curve are written"""
+        sweep = self.sweep(StandInConfig(seed=3), concurrency=2)
+        report = sweep.run(start_rps=10, max_rps=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_filename, csv_filename = SaturationSweep.save(report, tmp, "test")
+            with open(csv_filename) as f:
+                self.assertEqual(len(f.readlines()), 2)
+            self.assertTrue(os.path.exists(json_filename))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for Server-Timing stage timers, header parsing and rolling histograms
+"""
+import unittest
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from server_timing import StageHistograms, StageTimer, format_server_timing, parse_server_timing
+from stand_in_servers import StandInConfig, StandInServer
+
+class TestServerTimingHeader(unittest.TestCase):
+    """Test cases for formatting and parsing the header"""
+
+    def test_round_trip(self):
+        """Test formatted durations parse back unchanged"""
+        durations = {'parse': 0.041, 'inference': 12.5, 'total': 13.0}
+        self.assertEqual(parse_server_timing(format_server_timing(durations)), durations)
+
+    def test_spec_forms(self):
+        """Test desc values, missing durations, duplicates and junk"""
+        header = 'cache;desc="Cache, warm; hit";dur=0.2, db;dur=53, app;dur=47.2, db;dur=1, miss, ;dur=4, bad name;dur=2'
+        self.assertEqual(parse_server_timing(header),
+                         {'cache': 0.2, 'db': 53.0, 'app': 47.2, 'miss': None})
+        self.assertEqual(parse_server_timing('x;dur=abc'), {'x': None})
+        self.assertEqual(parse_server_timing(None), {})
+
+class TestStageTimer(unittest.TestCase):
+    """Test cases for per-stage timing"""
+
+    def test_stages_accumulate(self):
+        """Test repeated stages add up and total covers them"""
+        timer = StageTimer()
+        with timer.stage('inference'):
+            time.sleep(0.01)
+        with timer.stage('inference'):
+            time.sleep(0.01)
+        durations = timer.durations_ms()
+
+        self.assertEqual(list(durations), ['inference', 'total'])
+        self.assertGreaterEqual(durations['inference'], 20)
+        self.assertGreaterEqual(durations['total'], durations['inference'])
+
+class TestStageHistograms(unittest.TestCase):
+    """Test cases for the rolling per-stage histograms"""
+
+    def test_old_slots_expire(self):
+        """Test durations fall out of the summary once older than the window"""
+        histograms = StageHistograms(window=10, buckets=5)
+        histograms.record({'parse': 1.0, 'inference': 20.0}, now=100.0)
+        histograms.record({'inference': 40.0}, now=105.0)
+
+        summary = histograms.summary(now=106.0)['stages']
+        self.assertEqual(summary['inference']['count'], 2)
+        self.assertAlmostEqual(summary['inference']['max'], 0.04, places=4)
+
+        summary = histograms.summary(now=111.0)['stages']
+        self.assertEqual(summary['inference']['count'], 1)
+        self.assertNotIn('parse', summary)
+
+class TestStandInServerTiming(unittest.TestCase):
+    """Test cases for Server-Timing on the stand-in /predict"""
+
+    def test_header_body_and_info(self):
+        """Test the header, the opt-in body field and /info aggregates agree"""
+        server = StandInServer(StandInConfig(latency="fixed:0.02")).start()
+        self.addCleanup(server.stop)
+
+        response = requests.post(f"{server.url}/predict?timing=true", json={'url': "http://malware-test.com"})
+        metrics = parse_server_timing(response.headers['Server-Timing'])
+        self.assertEqual(list(metrics), ['parse', 'validate', 'inference', 'serialize', 'total'])
+        self.assertGreaterEqual(metrics['inference'], 20)
+        self.assertEqual(response.json()['timing']['inference'], metrics['inference'])
+
+        response = requests.post(f"{server.url}/detect", json={'url': "http://malware-test.com"})
+        self.assertIn('Server-Timing', response.headers)
+        self.assertNotIn('timing', response.json())
+
+        stages = requests.get(f"{server.url}/info").json()['stage_timings']['stages']
+        self.assertEqual(stages['total']['count'], 2)
+        self.assertGreaterEqual(stages['inference']['min'], 0.02)
+
+if __name__ == '__main__':
+    unittest.main()
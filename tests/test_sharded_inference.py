@@ -0,0 +1,96 @@
+"""
+Unit tests for the sharded inference runner
+"""
+import unittest
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sharded_inference import ShardedInference, WorkerInitError
+
+class LengthModel:
+    """Deterministic model: long URLs are malicious, URLs containing 'fail' raise"""
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name
+
+    def predict(self, url):
+        if 'fail' in url:
+            raise ValueError(f"cannot score {url}")
+        return ('malicious' if len(url) > 30 else 'safe', os.getpid())
+
+class RendezvousModel(LengthModel):
+    """URLs containing 'meet' wait at a barrier shared by the forked workers"""
+
+    def __init__(self, barrier):
+        super().__init__()
+        self.barrier = barrier
+
+    def predict(self, url):
+        if 'meet' in url:
+            self.barrier.wait(timeout=30)
+        return super().predict(url)
+
+def unloadable_model(model_name=None):
+    """Model factory that fails the way a missing checkpoint does"""
+    raise RuntimeError(f"Failed to load model {model_name}")
+
+class TestShardedInference(unittest.TestCase):
+    """Test cases for ordering, sharding and error handling"""
+
+    URLS = [f"https://example{i}.com/" + "a" * (i % 40) for i in range(200)]
+
+    def test_results_in_input_order(self):
+        """Test results line up with the input across workers and chunks"""
+        with ShardedInference(workers=3, chunk_size=7, model_factory=LengthModel) as runner:
+            predictions = runner.predict(self.URLS)
+
+        self.assertEqual(len(predictions), len(self.URLS))
+        for url, (label, _) in zip(self.URLS, predictions):
+            self.assertEqual(label, 'malicious' if len(url) > 30 else 'safe')
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs the fork start method")
+    def test_chunks_spread_over_workers(self):
+        """Test more than one worker process does the scoring"""
+        # Each chunk blocks until the other is being scored too, which one worker alone cannot do
+        barrier = multiprocessing.get_context('fork').Barrier(2)
+        urls = ["https://meet1.com/", "https://meet2.com/"]
+        with ShardedInference(workers=2, chunk_size=1, start_method='fork',
+                              model_factory=lambda name: RendezvousModel(barrier)) as runner:
+            predictions = runner.predict(urls)
+
+        for prediction in predictions:
+            self.assertNotIsInstance(prediction, RuntimeError)
+        pids = {pid for _, pid in predictions}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(len(pids), 2)
+
+    def test_failures_returned_in_place(self):
+        """Test a failing URL yields an error without losing its neighbours"""
+        urls = ["https://ok.com", "https://fail.com", "https://also-ok.com"]
+        with ShardedInference(workers=2, chunk_size=1, model_factory=LengthModel) as runner:
+            predictions = runner.predict(urls)
+
+        self.assertEqual(predictions[0][0], 'safe')
+        self.assertIsInstance(predictions[1], RuntimeError)
+        self.assertIn("fail.com", str(predictions[1]))
+        self.assertEqual(predictions[2][0], 'safe')
+
+    def test_worker_load_failure_raised(self):
+        """Test a model that cannot load in spawned workers raises instead of hanging"""
+        runner = ShardedInference('missing', workers=2, chunk_size=1, start_method='spawn',
+                                  model_factory=unloadable_model)
+        with self.assertRaisesRegex(WorkerInitError, "Failed to load model missing"):
+            runner.predict(self.URLS[:4])
+        self.assertIsNone(runner.pool)
+
+    def test_threads_split_between_workers(self):
+        """Test the default thread budget divides the cores"""
+        runner = ShardedInference(workers=1, model_factory=LengthModel)
+
+        self.assertEqual(runner.threads_per_worker, os.cpu_count() or 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Unit tests for the local stand-in servers
+"""
+import unittest
+import os
+import random
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from stand_in_servers import LatencyModel, StandInConfig, StandInServer
+from test_malicious_phish_dataset import MaliciousPhishTester
+
+class TestLatencyModel(unittest.TestCase):
+    """Test cases for latency spec parsing and sampling"""
+
+    def test_specs(self):
+        """Test each distribution samples in its expected range"""
+        rng = random.Random(1)
+        self.assertEqual(LatencyModel("none").sample(rng), 0.0)
+        self.assertEqual(LatencyModel("fixed:0.25").sample(rng), 0.25)
+
+        samples = sorted(LatencyModel("lognormal:0.1,0.5").sample(rng) for _ in range(2001))
+        self.assertAlmostEqual(samples[1000], 0.1, delta=0.01)
+
+        samples = [LatencyModel("bimodal:0.01,2.0,0.1").sample(rng) for _ in range(1000)]
+        self.assertEqual(set(samples), {0.01, 2.0})
+        self.assertAlmostEqual(samples.count(2.0) / len(samples), 0.1, delta=0.03)
+
+    def test_invalid_spec(self):
+        """Test malformed specs raise ValueError"""
+        for spec in ("uniform:1", "fixed", "lognormal:0.1"):
+            with self.assertRaises(ValueError):
+                LatencyModel(spec)
+
+class TestStandInServer(unittest.TestCase):
+    """Test cases for the served endpoints"""
+
+    def setUp(self):
+        self.server = StandInServer(StandInConfig(seed=3)).start()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    def test_ml_endpoints(self):
+        """Test /health, /info, /predict and /detect match the microservice schemas"""
+        health = self.session.get(f"{self.server.url}/health").json()
+        for key in ('status', 'service', 'model_loaded'):
+            self.assertIn(key, health)
+        info = self.session.get(f"{self.server.url}/info").json()
+        for key in ('service', 'model_info', 'config'):
+            self.assertIn(key, info)
+
+        prediction = self.session.post(f"{self.server.url}/predict", json={'url': "http://malware-test.com"}).json()
+        self.assertEqual(prediction['prediction'], 'malicious')
+        self.assertEqual(prediction['label'], 'malicious')
+        self.assertTrue(0.0 <= prediction['confidence'] <= 1.0)
+        self.assertIn('model', prediction)
+
+        detection = self.session.post(f"{self.server.url}/detect", json={'url': "https://www.google.com"}).json()
+        self.assertFalse(detection['is_malicious'])
+
+        response = self.session.post(f"{self.server.url}/predict", json={})
+        self.assertEqual(response.status_code, 400)
+
+    def test_scan_endpoint(self):
+        """Test /api/scan is shaped like UrlScanResult"""
+        data = self.session.post(f"{self.server.url}/api/scan", params={'url': "http://phishing-scam.net"}).json()
+
+        self.assertTrue(data['malicious'])
+        self.assertEqual(data['overallStatus'], "MALICIOUS")
+        for result in data['detectionResults'].values():
+            self.assertEqual(set(result), {'method', 'detected', 'details', 'confidence', 'status'})
+
+        data = self.session.post(f"{self.server.url}/api/scan", params={'url': "https://www.google.com"}).json()
+        self.assertFalse(data['malicious'])
+        self.assertEqual(self.session.get(f"{self.server.url}/actuator/health").json()['status'], "UP")
+
+    def test_error_rate_and_padding(self):
+        """Test injected errors follow the seeded rate and padding grows responses"""
+        self.server.config.error_rate = 0.3
+        statuses = [self.session.get(f"{self.server.url}/health").status_code for _ in range(200)]
+        self.assertAlmostEqual(statuses.count(500) / len(statuses), 0.3, delta=0.1)
+
+        self.server.config.error_rate = 0.0
+        self.server.config.padding_bytes = 4096
+        self.assertGreater(len(self.session.get(f"{self.server.url}/health").content), 4096)
+
+    def test_dataset_tester_against_stand_in(self):
+        """Test MaliciousPhishTester runs end to end with no network"""
+        tester = MaliciousPhishTester(self.server.url)
+        result = tester.test_url("http://malware-test.com", 'malware')
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['overall_malicious'])
+        self.assertIn("ML Microservice", result['detection_methods'])
+        self.assertEqual(self.server.request_counts['/api/scan'], 1)
+
+class TestColdStart(unittest.TestCase):
+    """Test cases for the simulated spin-down, boot and model load"""
+
+    def test_boot_model_load_and_spin_down(self):
+        """Test a sleeping server boots, loads its model, then sleeps again when idle"""
+        config = StandInConfig(boot_time=0.2, model_load_time=0.2, idle_timeout=0.3)
+        server = StandInServer(config).start()
+        self.addCleanup(server.stop)
+
+        start_time = time.perf_counter()
+        response = requests.get(f"{server.url}/health")
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.2)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], "loading")
+        self.assertFalse(response.json()['model_loaded'])
+        self.assertFalse(requests.get(f"{server.url}/info").json()['model_info']['loaded'])
+        self.assertEqual(requests.post(f"{server.url}/predict", json={'url': "https://a.com"}).status_code, 503)
+
+        time.sleep(0.25)
+        self.assertTrue(requests.get(f"{server.url}/health").json()['model_loaded'])
+        self.assertTrue(requests.get(f"{server.url}/info").json()['model_info']['loaded'])
+        self.assertEqual(requests.post(f"{server.url}/detect", json={'url': "https://a.com"}).status_code, 200)
+        self.assertEqual(server.cold_starts, 1)
+
+        time.sleep(0.4)
+        start_time = time.perf_counter()
+        requests.get(f"{server.url}/health")
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.2)
+        self.assertEqual(server.cold_starts, 2)
+
+    def test_disabled_by_default(self):
+        """Test the default config never cold starts"""
+        server = StandInServer(StandInConfig()).start()
+        self.addCleanup(server.stop)
+        self.assertTrue(requests.get(f"{server.url}/health").json()['model_loaded'])
+        self.assertEqual(server.cold_starts, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the offline threshold sweep over recorded detection results
+"""
+import unittest
+import os
+import sys
+import json
+import random
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scan_aggregation import aggregate_detections, detection_result
+from threshold_sweep import (CONFIDENCE, CURRENT_THRESHOLDS, MALICIOUS_COUNT, PARAMETERS, RecordedDetections,
+                             build_report, iter_records, sweep, verdicts)
+
+METHODS = {"Content Analysis": 0.3, "URL Pattern Analysis": 0.4, "Java ML Detection": 0.6, "TransformerML": 0.4,
+           "Domain Reputation Analysis": 0.4}
+
+
+def recorded_scans(count, seed=7):
+    """Result records flagged the way the Java services flag them today"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        malicious = rng.random() < 0.5
+        results = {}
+        for method, threshold in METHODS.items():
+            confidence = round(min(1.0, max(0.0, rng.gauss(0.55 if malicious else 0.3, 0.2))), 3)
+            if method == "TransformerML":
+                label = 'malicious' if rng.random() < (0.7 if malicious else 0.3) else 'benign'
+                details = f"ML Model: test (cpu), Label: {label}, Confidence: {confidence:.3f}"
+                results[method] = detection_result(method, label == 'malicious' and confidence > threshold,
+                                                   details, confidence)
+            else:
+                results[method] = detection_result(method, confidence > threshold, "test", confidence)
+        overall_malicious, _ = aggregate_detections(results)
+        records.append({'url': "http://example.com", 'success': True, 'expected_malicious': malicious,
+                        'overall_malicious': overall_malicious, 'detection_results': results})
+    return records
+
+class TestRecordedDetections(unittest.TestCase):
+    """Test loading tester output into arrays"""
+
+    def test_load_jsonl_and_statistics(self):
+        """Test JSONL results and the statistics JSON that points at them load alike"""
+        records = recorded_scans(20)
+        records.append({'success': False, 'expected_malicious': True, 'detection_results': {}})
+        records.append({'success': True, 'expected_type': 'phishing', 'overall_malicious': False,
+                        'detection_results': records[0]['detection_results']})
+        with tempfile.TemporaryDirectory() as tmp:
+            results_file = os.path.join(tmp, "results.jsonl")
+            with open(results_file, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+            statistics_file = os.path.join(tmp, "statistics.json")
+            with open(statistics_file, 'w') as f:
+                json.dump({'statistics': {}, 'results_file': "results.jsonl"}, f)
+            self.assertEqual(len(list(iter_records([statistics_file]))), len(records))
+            data = RecordedDetections.load([results_file])
+        self.assertEqual(len(data), 21)
+        self.assertEqual(data.skipped, 1)
+        self.assertTrue(data.expected[-1])
+        self.assertEqual(data.methods, list(METHODS))
+
+    def test_transformer_label(self):
+        """Test a benign transformer result can never be flagged"""
+        results = {"TransformerML": detection_result("TransformerML", False,
+                                                     "ML Model: m (cpu), Label: benign, Confidence: 0.950", 0.95)}
+        data = RecordedDetections.from_records([{'success': True, 'expected_malicious': False,
+                                                 'detection_results': results}])
+        self.assertFalse(data.eligible[0, 0])
+        self.assertFalse(verdicts(data, {'transformer_ml': 0.1})[0])
+
+    def test_expected_category(self):
+        """Test comprehensive_test.py categories: safe is benign, unlabelled ones are skipped"""
+        results = recorded_scans(1)[0]['detection_results']
+        records = [{'success': True, 'expected_category': category, 'detection_results': results}
+                   for category in ('safe', 'url_shortener', 'suspicious_keywords', 'private_ip')]
+        data = RecordedDetections.from_records(records)
+        self.assertEqual(list(data.expected), [False, True, True])
+        self.assertEqual(data.skipped, 1)
+
+class TestSweep(unittest.TestCase):
+    """Test the vectorized sweep against the per-record aggregation"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.records = recorded_scans(300)
+        cls.data = RecordedDetections.from_records(cls.records)
+
+    def test_current_thresholds_reproduce_service(self):
+        """Test the current thresholds give the verdicts of scan_aggregation"""
+        expected = [aggregate_detections(record['detection_results'])[0] for record in self.records]
+        self.assertEqual(list(verdicts(self.data)), expected)
+        results = sweep(self.data)
+        self.assertEqual(len(results['accuracy']), 1)
+        malicious = np.array(expected)
+        self.assertEqual(results['tp'][0], int((malicious & self.data.expected).sum()))
+        self.assertEqual(results['fp'][0], int((malicious & ~self.data.expected).sum()))
+        for parameter in PARAMETERS:
+            self.assertEqual(results[parameter][0], CURRENT_THRESHOLDS[parameter])
+
+    def test_matches_brute_force(self):
+        """Test every combination against verdicts() one at a time"""
+        grids = {MALICIOUS_COUNT: [1, 2, 3], CONFIDENCE: [0.3, 0.5], 'content_analysis': [0.2, 0.6],
+                 'smile_ml': [0.4, 0.7, 0.9], 'transformer_ml': [0.3, 0.8], 'dynamic_content': [0.1, 0.5]}
+        results = sweep(self.data, grids)
+        self.assertEqual(len(results['accuracy']), 3 * 2 * 2 * 3 * 2 * 2)
+        expected = self.data.expected
+        for index in range(len(results['accuracy'])):
+            thresholds = {parameter: results[parameter][index] for parameter in PARAMETERS}
+            malicious = verdicts(self.data, thresholds)
+            self.assertEqual(results['tp'][index], int((malicious & expected).sum()), thresholds)
+            self.assertEqual(results['fp'][index], int((malicious & ~expected).sum()), thresholds)
+        self.assertTrue(np.allclose(results['fpr'], results['fp'] / (~expected).sum()))
+        self.assertTrue(np.allclose(results['fnr'], results['fn'] / expected.sum()))
+
+    def test_malicious_count_below_one_rejected(self):
+        """Test a malicious count the service cannot mean is refused, not clamped"""
+        for counts in ([0, 1], [1.5]):
+            with self.assertRaises(ValueError):
+                sweep(self.data, {MALICIOUS_COUNT: counts})
+
+    def test_report(self):
+        """Test the best combination is at least as accurate as the current thresholds"""
+        results = sweep(self.data, {'smile_ml': [0.3, 0.6, 0.9], MALICIOUS_COUNT: [1, 2]})
+        report = build_report(self.data, results, top=3, max_fpr=0.5)
+        self.assertEqual(report['reproduced'], 1.0)
+        self.assertEqual(len(report['best']), 3)
+        self.assertGreaterEqual(report['best'][0]['accuracy'], report['current']['accuracy'])
+        if report['best_within_fpr'] is not None:
+            self.assertLessEqual(report['best_within_fpr']['fpr'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
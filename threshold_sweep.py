@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Offline Threshold Sweep for the Malicious URL Detection System
+Loads the per-method detectionResults recorded by the dataset testers
+(JSONL results files, or the statistics JSON that points at one) into NumPy
+arrays and replays ComprehensiveMalwareDetectionService's verdict for every
+combination of the thresholds in docs/detection_thresholds.yml, reporting
+accuracy, false-positive and false-negative rates without re-scanning.
+Ground truth comes from expected_malicious or expected_type (phish
+dataset testers) or expected_category (comprehensive_test.py, mapped as in
+dataset_cache: 'safe' is benign, unlabelled categories such as
+'suspicious_keywords' are skipped and every other category is malicious).
+
+Each swept detector's flag is recomputed as confidence > threshold (the
+transformer also needs its recorded label to be 'malicious'); other
+methods keep their recorded flag.  Per-record flags are packed into
+bitsets, so one combination costs a few word operations per 64 URLs.
+Records carry no whitelist status, so the non-whitelisted decision path is
+replayed.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from dataset_cache import CATEGORY_LABELS
+from offline_evaluation import MALICIOUS_TYPES
+from result_sink import iter_results
+
+# docs/detection_thresholds.yml key -> (detection method, threshold the Java service uses today)
+DETECTOR_THRESHOLDS = {
+    'content_analysis': ("Content Analysis", 0.3),
+    'pattern_analysis': ("URL Pattern Analysis", 0.4),
+    'smile_ml': ("Java ML Detection", 0.6),
+    'transformer_ml': ("TransformerML", 0.4),
+    'dynamic_content': ("Dynamic Content Analysis", 0.4),
+}
+TRANSFORMER_METHOD = "TransformerML"
+
+# comprehensive.malicious_count: flagged methods needed alongside a moderate-confidence detection;
+# comprehensive.confidence: confidence a flagged method needs to count as moderate
+MALICIOUS_COUNT = 'comprehensive.malicious_count'
+CONFIDENCE = 'comprehensive.confidence'
+CURRENT_THRESHOLDS = dict({MALICIOUS_COUNT: 1, CONFIDENCE: 0.3},
+                          **{key: threshold for key, (_, threshold) in DETECTOR_THRESHOLDS.items()})
+PARAMETERS = tuple(CURRENT_THRESHOLDS)
+
+# hasVeryHighConfidenceDetection: a single flagged method above this is always malicious
+OVERRIDE_CONFIDENCE = 0.8
+
+DEFAULT_THRESHOLD_GRID = (0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8)
+DEFAULT_CONFIDENCE_GRID = (0.2, 0.3, 0.4, 0.5)
+DEFAULT_COUNT_GRID = (1, 2, 3)
+
+_LABEL = re.compile(r"Label: (\w+)|: (\w+)$")
+
+
+def _transformer_label_malicious(result: Dict[str, Any]) -> bool:
+    """Whether the recorded transformer label was 'malicious' (parsed from its details)"""
+    match = _LABEL.search(result.get('details') or '')
+    if match is None:
+        return bool(result.get('detected'))
+    return (match.group(1) or match.group(2)).lower() == 'malicious'
+
+
+def _expected_malicious(record: Dict[str, Any]) -> Optional[bool]:
+    if 'expected_malicious' in record:
+        return bool(record['expected_malicious'])
+    if 'expected_type' in record:
+        return record['expected_type'] in MALICIOUS_TYPES
+    if 'expected_category' in record:
+        label = CATEGORY_LABELS.get(record['expected_category'], 'malicious')
+        return None if label == 'unknown' else label == 'malicious'
+    return None
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Result records from JSONL results files, statistics JSON files or JSON lists of records"""
+    for path in paths:
+        if path.endswith('.jsonl'):
+            yield from iter_results(path)
+            continue
+        with open(path, encoding='utf-8') as f:
+            document = json.load(f)
+        if isinstance(document, list):
+            yield from document
+        elif 'results' in document:
+            yield from document['results']
+        elif 'results_file' in document:
+            yield from iter_results(os.path.join(os.path.dirname(path), document['results_file']))
+        else:
+            raise ValueError(f"{path} has no result records")
+
+
+class RecordedDetections:
+    """Per-method detection results of labelled, successful scans as arrays
+
+    confidence, detected and eligible are (records, methods); eligible is
+    False where a method is missing or (the transformer) its label was not
+    malicious, so no threshold can flag it.
+    """
+
+    def __init__(self, methods: List[str], confidence: np.ndarray, detected: np.ndarray, eligible: np.ndarray,
+                 expected: np.ndarray, recorded: np.ndarray, skipped: int = 0):
+        self.methods = methods
+        self.confidence = confidence
+        self.detected = detected
+        self.eligible = eligible
+        self.expected = expected
+        self.recorded = recorded
+        self.skipped = skipped
+
+    def __len__(self) -> int:
+        return len(self.expected)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'RecordedDetections':
+        rows, expected, recorded = [], [], []
+        methods: Dict[str, int] = {}
+        skipped = 0
+        for record in records:
+            label = _expected_malicious(record)
+            results = record.get('detection_results') or {}
+            if not record.get('success') or not results or label is None:
+                skipped += 1
+                continue
+            for method in results:
+                methods.setdefault(method, len(methods))
+            rows.append(results)
+            expected.append(label)
+            recorded.append(bool(record.get('overall_malicious')))
+
+        shape = (len(rows), len(methods))
+        confidence = np.zeros(shape)
+        detected = np.zeros(shape, dtype=bool)
+        eligible = np.zeros(shape, dtype=bool)
+        for row, results in enumerate(rows):
+            for method, result in results.items():
+                column = methods[method]
+                confidence[row, column] = float(result.get('confidence') or 0.0)
+                detected[row, column] = bool(result.get('detected'))
+                eligible[row, column] = method != TRANSFORMER_METHOD or _transformer_label_malicious(result)
+        return cls(list(methods), confidence, detected, eligible, np.array(expected, dtype=bool),
+                   np.array(recorded, dtype=bool), skipped)
+
+    @classmethod
+    def load(cls, paths: Sequence[str]) -> 'RecordedDetections':
+        return cls.from_records(iter_records(paths))
+
+
+def threshold_grid(grids: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """Cartesian product of per-parameter values (missing parameters at their current value), one array each"""
+    values = [list(grids.get(parameter, [CURRENT_THRESHOLDS[parameter]])) for parameter in PARAMETERS]
+    combinations = np.array(list(itertools.product(*values)), dtype=float)
+    return {parameter: combinations[:, index] for index, parameter in enumerate(PARAMETERS)}
+
+
+def default_grids(data: RecordedDetections) -> Dict[str, Sequence[float]]:
+    """Sweep the comprehensive settings and each detector present in the records"""
+    grids: Dict[str, Sequence[float]] = {MALICIOUS_COUNT: DEFAULT_COUNT_GRID, CONFIDENCE: DEFAULT_CONFIDENCE_GRID}
+    for key, (method, _) in DETECTOR_THRESHOLDS.items():
+        if method in data.methods:
+            grids[key] = DEFAULT_THRESHOLD_GRID
+    return grids
+
+
+def verdicts(data: RecordedDetections, thresholds: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Per-record overall verdict (malicious) under one set of thresholds"""
+    thresholds = dict(CURRENT_THRESHOLDS, **(thresholds or {}))
+    flagged = data.detected.copy()
+    for key, (method, _) in DETECTOR_THRESHOLDS.items():
+        if method in data.methods:
+            column = data.methods.index(method)
+            flagged[:, column] = data.eligible[:, column] & (data.confidence[:, column] > thresholds[key])
+    moderate = (flagged & (data.confidence > thresholds[CONFIDENCE])).any(axis=1)
+    enough = flagged.sum(axis=1) >= thresholds[MALICIOUS_COUNT]
+    return (moderate & enough) | (flagged & (data.confidence > OVERRIDE_CONFIDENCE)).any(axis=1)
+
+
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def _pack(mask: np.ndarray) -> np.ndarray:
+    """Boolean (..., records) as a (..., words) uint64 bitset"""
+    packed = np.packbits(mask, axis=-1)
+    padding = -packed.shape[-1] % 8
+    if padding:
+        packed = np.concatenate([packed, np.zeros(packed.shape[:-1] + (padding,), dtype=np.uint8)], axis=-1)
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits along the last axis"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT[np.ascontiguousarray(words).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def _add_method(state, flagged, moderate, high):
+    """Fold one method's flags into (at-least-n-flagged bitsets, any moderate, any high)"""
+    at_least, any_moderate, any_high = state
+    # at_least[j]: j + 1 or more methods flagged; update from the top so each uses the previous counts
+    updated = [at_least[0] | flagged]
+    for j in range(1, len(at_least)):
+        updated.append(at_least[j] | (at_least[j - 1] & flagged))
+    return updated, any_moderate | moderate, any_high | high
+
+
+def _check_counts(counts: Sequence[float]):
+    # A moderate detection is itself a flagged method, so counts below 1 behave like 1; reject them
+    # rather than report a setting under a value it does not have
+    if any(count < 1 or count != int(count) for count in counts):
+        raise ValueError(f"{MALICIOUS_COUNT} values must be whole numbers of at least 1, got {list(counts)}")
+
+
+def sweep(data: RecordedDetections, grids: Optional[Dict[str, Sequence[float]]] = None) -> Dict[str, Any]:
+    """Confusion counts and rates for every combination of the grids (other parameters stay current)
+
+    Returns one array per parameter, in itertools.product order of
+    PARAMETERS, plus tp, fp, tn, fn, accuracy, fpr and fnr.  Per-record
+    flags are bitsets; combinations are walked depth-first over the
+    detectors, so each shared prefix of thresholds is combined only once.
+    """
+    grids = {parameter: list((grids or {}).get(parameter, [CURRENT_THRESHOLDS[parameter]])) for parameter in PARAMETERS}
+    _check_counts(grids[MALICIOUS_COUNT])
+    counts = [int(count) for count in grids[MALICIOUS_COUNT]]
+    keys = list(DETECTOR_THRESHOLDS)
+    swept_methods = {method for method, _ in DETECTOR_THRESHOLDS.values()}
+    positives, negatives = _pack(data.expected), _pack(~data.expected)
+    high_confidence = data.confidence > OVERRIDE_CONFIDENCE
+    empty = np.zeros(positives.shape, dtype=np.uint64)
+
+    shape = tuple(len(grids[parameter]) for parameter in PARAMETERS)
+    tp = np.zeros(shape, dtype=np.int64)
+    fp = np.zeros(shape, dtype=np.int64)
+
+    def descend(level, state, prefix):
+        flagged, moderate, high = options[level]
+        if level < len(keys) - 1:
+            for index in range(len(flagged)):
+                descend(level + 1, _add_method(state, flagged[index], moderate[index], high[index]), prefix + (index,))
+            return
+        # Last detector: all its thresholds at once, as (thresholds, words)
+        at_least, any_moderate, any_high = _add_method(state, flagged, moderate, high)
+        for count_index, count in enumerate(counts):
+            malicious = (any_moderate & at_least[count - 1]) | any_high
+            tp[(count_index, confidence_index) + prefix] = _popcount(malicious & positives)
+            fp[(count_index, confidence_index) + prefix] = _popcount(malicious & negatives)
+
+    for confidence_index, confidence in enumerate(grids[CONFIDENCE]):
+        moderate_confidence = data.confidence > confidence
+        # Methods without a swept threshold keep their recorded flags in every combination
+        state = ([empty] * max(counts), empty, empty)
+        for column, method in enumerate(data.methods):
+            if method not in swept_methods:
+                flagged = data.detected[:, column]
+                state = _add_method(state, _pack(flagged), _pack(flagged & moderate_confidence[:, column]),
+                                    _pack(flagged & high_confidence[:, column]))
+        options = []
+        for key in keys:
+            thresholds = np.array(grids[key], dtype=float)[:, None]
+            method = DETECTOR_THRESHOLDS[key][0]
+            if method in data.methods:
+                column = data.methods.index(method)
+                flagged = data.eligible[:, column] & (data.confidence[:, column] > thresholds)
+                options.append((_pack(flagged), _pack(flagged & moderate_confidence[:, column]),
+                                _pack(flagged & high_confidence[:, column])))
+            else:
+                none = np.zeros((len(thresholds),) + positives.shape, dtype=np.uint64)
+                options.append((none, none, none))
+        descend(0, state, ())
+
+    total_positives, total_negatives = int(data.expected.sum()), int((~data.expected).sum())
+    tp, fp = tp.ravel(), fp.ravel()
+    fn, tn = total_positives - tp, total_negatives - fp
+    results: Dict[str, Any] = threshold_grid(grids)
+    results.update(tp=tp, fp=fp, tn=tn, fn=fn, accuracy=(tp + tn) / max(1, len(data)),
+                   fpr=fp / total_negatives if total_negatives else np.zeros(len(tp)),
+                   fnr=fn / total_positives if total_positives else np.zeros(len(tp)))
+    return results
+
+
+def _row(results: Dict[str, Any], index: int) -> Dict[str, Any]:
+    row = {parameter: float(results[parameter][index]) for parameter in PARAMETERS}
+    row[MALICIOUS_COUNT] = int(row[MALICIOUS_COUNT])
+    for metric in ('tp', 'fp', 'tn', 'fn'):
+        row[metric] = int(results[metric][index])
+    for metric in ('accuracy', 'fpr', 'fnr'):
+        row[metric] = round(float(results[metric][index]), 6)
+    return row
+
+
+def build_report(data: RecordedDetections, results: Dict[str, Any], top: int = 10,
+                 max_fpr: Optional[float] = None) -> Dict[str, Any]:
+    """Current thresholds, best combinations by accuracy and (optionally) lowest FNR within an FPR budget"""
+    order = np.lexsort((results['fpr'], -results['accuracy']))
+    report = {
+        'records': len(data),
+        'skipped_records': data.skipped,
+        'methods': data.methods,
+        'combinations': len(results['accuracy']),
+        'current': _row(sweep(data), 0),
+        # How often replaying the current thresholds gives the verdict /api/scan recorded
+        'reproduced': round(float(np.mean(verdicts(data) == data.recorded)), 6) if len(data) else None,
+        'best': [_row(results, index) for index in order[:top]]
+    }
+    if max_fpr is not None:
+        within = np.flatnonzero(results['fpr'] <= max_fpr)
+        if len(within):
+            best = within[np.lexsort((-results['accuracy'][within], results['fnr'][within]))[0]]
+            report['best_within_fpr'] = dict(_row(results, best), max_fpr=max_fpr)
+        else:
+            report['best_within_fpr'] = None
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    def describe(row):
+        thresholds = ", ".join(f"{parameter.split('.')[-1]}={row[parameter]:g}" for parameter in PARAMETERS)
+        return f"acc {row['accuracy']:.2%} | FPR {row['fpr']:.2%} | FNR {row['fnr']:.2%} | {thresholds}"
+
+    print("\n" + "=" * 60)
+    print("📊 THRESHOLD SWEEP")
+    print("=" * 60)
+    print(f"Records: {report['records']} ({report['skipped_records']} skipped), "
+          f"{report['combinations']} combinations")
+    if report['reproduced'] is not None:
+        print(f"Current thresholds reproduce {report['reproduced']:.2%} of the recorded verdicts")
+    print(f"\nCurrent: {describe(report['current'])}")
+    print("\n🏆 Best by accuracy:")
+    for rank, row in enumerate(report['best'], 1):
+        print(f"  {rank:>2}. {describe(row)}")
+    if 'best_within_fpr' in report:
+        row = report['best_within_fpr']
+        if row is None:
+            print("\n❌ No combination stays within the FPR budget")
+        else:
+            print(f"\n🎯 Lowest FNR with FPR <= {row['max_fpr']:.2%}: {describe(row)}")
+
+
+def save_results(results: Dict[str, Any], report: Dict[str, Any], output_dir: str = ".",
+                 timestamp: Optional[str] = None):
+    """Save the report (JSON) and every combination's metrics (CSV)"""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_filename = os.path.join(output_dir, f"threshold_sweep_{timestamp}.json")
+    csv_filename = os.path.join(output_dir, f"threshold_sweep_{timestamp}.csv")
+    with open(json_filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    columns = list(PARAMETERS) + ['tp', 'fp', 'tn', 'fn', 'accuracy', 'fpr', 'fnr']
+    with open(csv_filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for index in range(len(results['accuracy'])):
+            row = _row(results, index)
+            writer.writerow([row[column] for column in columns])
+    return json_filename, csv_filename
+
+
+def parse_grid(spec: str) -> Sequence[float]:
+    """'0.2,0.4,0.6' or an inclusive range 'START:STOP:STEP'"""
+    if ':' in spec:
+        start, stop, step = (float(value) for value in spec.split(':'))
+        return [round(value, 6) for value in np.arange(start, stop + step / 2, step)]
+    return [float(value) for value in spec.split(',')]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Sweep detection thresholds over recorded /api/scan results")
+    parser.add_argument('results', nargs='+',
+                        help="tester results (.jsonl) or statistics (.json) files labelled with expected_malicious, "
+                             "expected_type or expected_category")
+    parser.add_argument('--grid', action='append', default=[], metavar='PARAMETER=VALUES',
+                        help="values for one parameter, e.g. smile_ml=0.3:0.9:0.05 or "
+                             "comprehensive.malicious_count=1,2 (repeatable; replaces the default grid)")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-fpr', type=float, default=None,
+                        help="also report the lowest-FNR combination with at most this false-positive rate")
+    parser.add_argument('--output-dir', default=".")
+    args = parser.parse_args()
+
+    grids = {}
+    for spec in args.grid:
+        parameter, _, values = spec.partition('=')
+        if parameter not in PARAMETERS:
+            parser.error(f"unknown parameter {parameter!r}; choose from {', '.join(PARAMETERS)}")
+        grids[parameter] = parse_grid(values)
+        if parameter == MALICIOUS_COUNT:
+            try:
+                _check_counts(grids[parameter])
+            except ValueError as e:
+                parser.error(str(e))
+
+    print("🚀 Starting Threshold Sweep")
+    print("=" * 60)
+    start = time.perf_counter()
+    data = RecordedDetections.load(args.results)
+    print(f"📂 Loaded {len(data)} records with {len(data.methods)} methods in {time.perf_counter() - start:.2f}s")
+    if not len(data):
+        print("❌ No labelled, successful scans with detection results. Exiting.")
+        return
+    grids = grids or default_grids(data)
+
+    start = time.perf_counter()
+    results = sweep(data, grids)
+    elapsed = time.perf_counter() - start
+    print(f"⚡ Evaluated {len(results['accuracy'])} combinations in {elapsed:.2f}s")
+
+    report = build_report(data, results, args.top, args.max_fpr)
+    print_report(report)
+    json_filename, csv_filename = save_results(results, report, args.output_dir)
+    print(f"\n💾 Results saved to:")
+    print(f"   Report: {json_filename}")
+    print(f"   CSV:    {csv_filename}")
+
+
+if __name__ == "__main__":
+    main()
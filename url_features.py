@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Vectorized URL Feature Extractor
+NumPy port of SmileMlDetectionService.extractUrlFeatures / calculateMlRiskScore
+that scores a whole batch of URLs at once, so large corpora such as
+malicious_phish.csv can be scored offline in seconds.
+
+URLs are packed into one uint8 buffer with per-URL offsets and every feature
+is computed with array operations over that buffer.  Lengths and character
+statistics are taken over UTF-8 bytes, which matches the Java code (UTF-16
+chars) exactly for ASCII URLs.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Column order of the feature matrix
+FEATURE_NAMES = (
+    'url_length', 'domain_length', 'path_length', 'query_length',
+    'special_chars', 'digit_count', 'suspicious_keywords', 'tld_suspicious',
+    'ip_in_domain', 'subdomain_count', 'entropy', 'complexity'
+)
+FEATURE_INDEX = {name: column for column, name in enumerate(FEATURE_NAMES)}
+
+# Same lists as SmileMlDetectionService
+SPECIAL_CHARACTERS = "!@#$%^&*()_+-=[]{}|;':\",./<>?"
+SUSPICIOUS_KEYWORDS = (
+    "malware", "virus", "trojan", "spyware", "phishing", "scam",
+    "hack", "crack", "keygen", "warez", "download", "free",
+    "login", "bank", "secure", "update", "verify", "account"
+)
+SUSPICIOUS_TLDS = (".xyz", ".top", ".tk", ".ml", ".ga", ".cf")
+# Protocols java.net.URL has handlers for; anything else takes the fallback path
+JAVA_URL_SCHEMES = ("http", "https", "ftp", "file", "jar")
+
+# Java ML risk threshold (docs/detection_thresholds.yml smile_ml.threshold)
+RISK_THRESHOLD = 0.6
+
+DEFAULT_CHUNK_SIZE = 8192
+
+
+def _byte_table(characters: str) -> np.ndarray:
+    table = np.zeros(256, dtype=bool)
+    table[list(characters.encode('ascii'))] = True
+    return table
+
+
+_SPECIAL = _byte_table(SPECIAL_CHARACTERS)
+_DIGIT = _byte_table("0123456789")
+_LETTER = np.zeros(256, dtype=bool)
+_LETTER[ord('a'):ord('z') + 1] = True
+_LETTER[ord('A'):ord('Z') + 1] = True
+_LOWER = np.arange(256, dtype=np.uint8)
+_LOWER[ord('A'):ord('Z') + 1] += 32
+_NOT_FOUND = np.iinfo(np.int64).max
+_PADDING = 32
+
+
+def encode_urls(urls: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack URLs into one uint8 buffer; returns (buffer, offsets) with len(urls) + 1 offsets"""
+    encoded = [url.encode('utf-8') for url in urls]
+    lengths = np.fromiter((len(url) for url in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buffer, offsets
+
+
+class _Batch:
+    """Per-byte bookkeeping shared by the feature computations of one chunk"""
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray):
+        self.buffer = buffer
+        # Zero padding lets pattern matching read past the last URL safely
+        self.lower = np.concatenate([_LOWER[buffer], np.zeros(_PADDING, dtype=np.uint8)])
+        self.starts = offsets[:-1]
+        self.lengths = np.diff(offsets)
+        self.count = len(self.lengths)
+        # Which URL each byte belongs to, and its position inside that URL
+        self.ids = np.repeat(np.arange(self.count), self.lengths)
+        self.positions = np.arange(len(buffer)) - self.starts[self.ids]
+        self._by_byte = None
+
+    def per_url_sum(self, mask: np.ndarray, ids: np.ndarray = None) -> np.ndarray:
+        """Number of True entries of a per-byte mask in each URL (ids overrides the byte -> URL map)"""
+        ids = self.ids if ids is None else ids
+        return np.bincount(ids[np.flatnonzero(mask)], minlength=self.count)
+
+    def per_url_hits(self, indices: np.ndarray) -> np.ndarray:
+        """Number of byte indices (as returned by find) falling in each URL"""
+        return np.bincount(self.ids[indices], minlength=self.count)
+
+    def first(self, mask: np.ndarray, default: np.ndarray) -> np.ndarray:
+        """Position of the first byte matching mask in each URL (default where none)"""
+        hits = np.flatnonzero(mask)
+        result = default.copy()
+        if len(hits):
+            hit_ids = self.ids[hits]
+            keep = np.ones(len(hits), dtype=bool)
+            keep[1:] = hit_ids[1:] != hit_ids[:-1]
+            result[hit_ids[keep]] = self.positions[hits[keep]]
+        return result
+
+    def last(self, mask: np.ndarray, default: np.ndarray) -> np.ndarray:
+        """Position of the last byte matching mask in each URL (default where none)"""
+        hits = np.flatnonzero(mask)
+        result = default.copy()
+        if len(hits):
+            hit_ids = self.ids[hits]
+            keep = np.ones(len(hits), dtype=bool)
+            keep[:-1] = hit_ids[:-1] != hit_ids[1:]
+            result[hit_ids[keep]] = self.positions[hits[keep]]
+        return result
+
+    def positions_of(self, byte: int) -> np.ndarray:
+        """Sorted byte indices holding the given lower-cased byte"""
+        if self._by_byte is None:
+            # One stable (radix) sort buckets every position by its byte, so
+            # each keyword only looks at the positions of its first letter
+            lower = self.lower[:len(self.buffer)]
+            order = np.argsort(lower, kind='stable')
+            bounds = np.searchsorted(lower[order], np.arange(257))
+            self._by_byte = (order, bounds)
+        order, bounds = self._by_byte
+        return order[bounds[byte]:bounds[byte + 1]]
+
+    def find(self, pattern: bytes, candidates: np.ndarray = None) -> np.ndarray:
+        """Byte indices where the (lower-cased) pattern starts and fits inside one URL
+
+        candidates restricts the search to the given start indices.  Patterns
+        may be at most _PADDING bytes long.
+        """
+        if candidates is None:
+            candidates = self.positions_of(pattern[0])
+        else:
+            candidates = candidates[self.lower[candidates] == pattern[0]]
+        for offset, byte in enumerate(pattern[1:], 1):
+            candidates = candidates[self.lower[candidates + offset] == byte]
+        # The whole pattern must lie inside one URL
+        return candidates[self.positions[candidates] + len(pattern) <= self.lengths[self.ids[candidates]]]
+
+
+def _parse(batch: _Batch):
+    """Split each URL the way java.net.URL does.
+
+    Returns (parsed, host_start, host_end, path_start, path_end, query_length)
+    as per-URL position arrays; `parsed` is False where Java would throw and
+    extractUrlFeatures falls back to zeros.
+    """
+    lengths = batch.lengths
+    not_found = np.full(batch.count, _NOT_FOUND)
+    colon = batch.first(batch.buffer == ord(':'), not_found)
+
+    # scheme "://" with a protocol Java knows
+    parsed = np.zeros(batch.count, dtype=bool)
+    url_starts = batch.starts[batch.lengths > 0]
+    for scheme in JAVA_URL_SCHEMES:
+        separator = (scheme + "://").encode('ascii')
+        parsed |= batch.per_url_hits(batch.find(separator, url_starts)) > 0
+    parsed &= colon != _NOT_FOUND
+
+    # '#' ends the spec, then the first '?' starts the query
+    hash_position = np.minimum(batch.first(batch.buffer == ord('#'), not_found), lengths)
+    question = batch.first(batch.buffer == ord('?'), not_found)
+    has_query = question < hash_position
+    limit = np.where(has_query, question, hash_position)
+    query_length = np.where(has_query, hash_position - question - 1, 0)
+
+    authority_start = np.where(parsed, colon + 3, 0)
+    in_spec = batch.positions < limit[batch.ids]
+    after_authority = in_spec & (batch.positions >= authority_start[batch.ids])
+    authority_end = batch.first(after_authority & (batch.buffer == ord('/')), limit)
+    in_authority = after_authority & (batch.positions < authority_end[batch.ids])
+
+    # userinfo ends at the '@'; Java drops the host entirely if there are several
+    at_mask = in_authority & (batch.buffer == ord('@'))
+    at_sign = batch.last(at_mask, authority_start - 1)
+    host_start = np.where(batch.per_url_sum(at_mask) > 1, authority_end, at_sign + 1)
+
+    # the port starts at the first ':' of the host and must be numeric
+    in_host = in_authority & (batch.positions >= host_start[batch.ids])
+    host_end = batch.first(in_host & (batch.buffer == ord(':')), authority_end)
+    in_port = in_host & (batch.positions > host_end[batch.ids])
+    parsed &= batch.per_url_sum(in_port & ~_DIGIT[batch.buffer]) == 0
+
+    return parsed, host_start, host_end, authority_end, limit, query_length
+
+
+def _ip_in_host(batch: _Batch, in_host: np.ndarray) -> np.ndarray:
+    """Vectorized form of host.matches(".*\\d+\\.\\d+\\.\\d+\\.\\d+.*")"""
+    buffer = batch.buffer
+    digit = _DIGIT[buffer] & in_host
+    # A "link" is a dot with a digit directly on both sides
+    previous_digit = np.zeros_like(digit)
+    previous_digit[1:] = digit[:-1]
+    next_digit = np.zeros_like(digit)
+    next_digit[:-1] = digit[1:]
+    links = np.flatnonzero((buffer == ord('.')) & in_host & previous_digit & next_digit)
+    if len(links) < 3:
+        return np.zeros(batch.count, dtype=bool)
+
+    # Consecutive links chain when only digits lie between them; three
+    # chained links spell d+.d+.d+.d+
+    non_digit = np.cumsum(~digit)
+    chained = (batch.ids[links[1:]] == batch.ids[links[:-1]]) & \
+              (non_digit[links[1:] - 1] == non_digit[links[:-1]])
+    triples = chained[1:] & chained[:-1]
+    return batch.per_url_sum(triples, batch.ids[links[1:-1]]) > 0
+
+
+def _extract_chunk(buffer: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    batch = _Batch(buffer, offsets)
+    features = np.zeros((batch.count, len(FEATURE_NAMES)), dtype=np.float64)
+    lengths = batch.lengths
+
+    features[:, FEATURE_INDEX['url_length']] = lengths
+    features[:, FEATURE_INDEX['special_chars']] = batch.per_url_sum(_SPECIAL[buffer])
+    features[:, FEATURE_INDEX['digit_count']] = batch.per_url_sum(_DIGIT[buffer])
+
+    # Number of distinct keywords contained anywhere in the lower-cased URL
+    keyword_count = np.zeros(batch.count, dtype=np.int64)
+    for keyword in SUSPICIOUS_KEYWORDS:
+        keyword_count += batch.per_url_hits(batch.find(keyword.encode('ascii'))) > 0
+    features[:, FEATURE_INDEX['suspicious_keywords']] = keyword_count
+
+    # Host-based features (zero where Java's URL parsing would fail)
+    parsed, host_start, host_end, path_start, path_end, query_length = _parse(batch)
+    host_length = np.maximum(host_end - host_start, 0)
+    in_host = (batch.positions >= host_start[batch.ids]) & (batch.positions < host_end[batch.ids]) & parsed[batch.ids]
+
+    tld_suspicious = np.zeros(batch.count, dtype=bool)
+    for tld in SUSPICIOUS_TLDS:
+        tld_bytes = tld.encode('ascii')
+        # Only the position where the suffix would have to start can match
+        suffix_start = batch.starts + host_end - len(tld_bytes)
+        candidates = suffix_start[parsed & (host_end - host_start >= len(tld_bytes))]
+        tld_suspicious |= batch.per_url_hits(batch.find(tld_bytes, candidates)) > 0
+
+    features[:, FEATURE_INDEX['domain_length']] = np.where(parsed, host_length, 0)
+    features[:, FEATURE_INDEX['path_length']] = np.where(parsed, path_end - path_start, 0)
+    features[:, FEATURE_INDEX['query_length']] = np.where(parsed, query_length, 0)
+    features[:, FEATURE_INDEX['tld_suspicious']] = tld_suspicious & parsed
+    features[:, FEATURE_INDEX['ip_in_domain']] = _ip_in_host(batch, in_host)
+    features[:, FEATURE_INDEX['subdomain_count']] = batch.per_url_sum(in_host & (buffer == ord('.')))
+
+    # Shannon entropy and character diversity from a per-URL byte histogram
+    # H = -sum(c/L * log2(c/L)) over the non-zero byte counts c of each URL
+    histogram = np.bincount(batch.ids * 256 + buffer, minlength=batch.count * 256)
+    present = np.flatnonzero(histogram)
+    counts = histogram[present]
+    rows = present >> 8
+    safe_lengths = np.maximum(lengths, 1)
+    probabilities = counts / safe_lengths[rows]
+    features[:, FEATURE_INDEX['entropy']] = -np.bincount(rows, weights=probabilities * np.log2(probabilities),
+                                                         minlength=batch.count)
+
+    # Transitions between letter/non-letter or digit/non-digit neighbours
+    letter = _LETTER[buffer]
+    digit = _DIGIT[buffer]
+    same_url = batch.ids[1:] == batch.ids[:-1]
+    changes = same_url & ((letter[1:] != letter[:-1]) | (digit[1:] != digit[:-1]))
+    transitions = batch.per_url_sum(changes, batch.ids[:-1]) if len(buffer) else np.zeros(batch.count)
+    diversity = np.bincount(rows, minlength=batch.count) / safe_lengths
+    transition_rate = transitions / np.maximum(1, lengths - 1)
+    features[:, FEATURE_INDEX['complexity']] = diversity * 0.6 + transition_rate * 0.4
+
+    return features
+
+
+def extract_features(urls: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """Return a (len(urls), len(FEATURE_NAMES)) float64 feature matrix"""
+    buffer, offsets = encode_urls(urls)
+    features = np.zeros((len(urls), len(FEATURE_NAMES)), dtype=np.float64)
+    # Chunking bounds the per-URL byte histogram to chunk_size * 256 counters
+    for start in range(0, len(urls), chunk_size):
+        end = min(start + chunk_size, len(urls))
+        chunk_offsets = offsets[start:end + 1] - offsets[start]
+        features[start:end] = _extract_chunk(buffer[offsets[start]:offsets[end]], chunk_offsets)
+    return features
+
+
+def risk_scores(features: np.ndarray) -> np.ndarray:
+    """Vectorized calculateMlRiskScore (without the random jitter or whitelist discount)"""
+    url_length = features[:, FEATURE_INDEX['url_length']]
+    special_chars = features[:, FEATURE_INDEX['special_chars']]
+    keywords = features[:, FEATURE_INDEX['suspicious_keywords']]
+    entropy = features[:, FEATURE_INDEX['entropy']]
+    complexity = features[:, FEATURE_INDEX['complexity']]
+
+    risk = (np.minimum(1.0, url_length / 150.0) * 0.08 +
+            np.minimum(1.0, special_chars / 15.0) * 0.15 +
+            np.minimum(1.0, keywords / 8.0) * 0.25 +
+            np.minimum(1.0, entropy / 5.0) * 0.15 +
+            np.minimum(1.0, complexity / 15.0) * 0.15)
+
+    # DescriptiveStatistics uses the sample standard deviation
+    values = np.stack([url_length, special_chars, keywords, entropy, complexity], axis=1)
+    uncertainty = values.std(axis=1, ddof=1) / (values.mean(axis=1) + 1.0) * 0.05
+    return np.clip(risk + uncertainty, 0.0, 1.0)
+
+
+def feature_dicts(urls: Sequence[str]) -> List[Dict[str, float]]:
+    """Features as one dict per URL, with the risk score, for small batches and reports"""
+    features = extract_features(urls)
+    scores = risk_scores(features)
+    rows = []
+    for url, row, score in zip(urls, features, scores):
+        entry = {'url': url}
+        entry.update({name: float(value) for name, value in zip(FEATURE_NAMES, row)})
+        entry['risk_score'] = float(score)
+        rows.append(entry)
+    return rows
+
+
+def main():
+    """Score a dataset offline and print a per-label summary"""
+    from dataset_cache import DEFAULT_SOURCES, load_dataset
+
+    parser = argparse.ArgumentParser(description="Compute Java-ML URL features for a whole corpus")
+    parser.add_argument('sources', nargs='*', default=list(DEFAULT_SOURCES))
+    args = parser.parse_args()
+
+    with load_dataset(args.sources, verbose=True) as dataset:
+        urls = [dataset.url(index) for index in range(len(dataset))]
+        labels = np.frombuffer(dataset.labels, dtype=np.uint8).copy()
+        label_names = dataset.label_names
+
+    start = time.perf_counter()
+    scores = risk_scores(extract_features(urls))
+    elapsed = time.perf_counter() - start
+    print(f"⚡ Scored {len(urls)} URLs in {elapsed:.2f}s ({len(urls) / max(elapsed, 1e-9):,.0f} URLs/s)")
+
+    print(f"{'Label':<12} | {'Count':>8} | {'Mean risk':>9} | {'Flagged':>8}")
+    print("-" * 48)
+    for code, label in enumerate(label_names):
+        mask = labels == code
+        if mask.any():
+            flagged = (scores[mask] > RISK_THRESHOLD).mean() * 100
+            print(f"{label:<12} | {mask.sum():>8} | {scores[mask].mean():>9.3f} | {flagged:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()